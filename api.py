@@ -4,19 +4,517 @@ CertiFi AI External API
 POST /analyze endpoint for document analysis
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
 import tempfile
+import asyncio
+import copy
+import hashlib
+import json
 import os
+import re
+import shutil
+import time
+import zipfile
 from pathlib import Path
 
+import aiofiles
+
+from config import Config
+from pipeline.executor import PipelineExecutor, ExecutorSaturated
+from pipeline.result_cache import ResultCache
+from pipeline.job_store import JobStore, JobProgress, JobStatus
+from pipeline.callbacks import callback_url_error, post_callback
+from pipeline.metrics import MetricsRegistry
+from pipeline.serialization import dumps_json, encode
 from pipeline.orchestrator import DocumentPipeline
 
 app = FastAPI(title="CertiFi AI API", version="1.0.0")
 
 
+def _ocr_page_workers() -> int:
+    """
+    Page OCR processes per pipeline worker
+
+    Every pipeline worker process starts its own page pool, so the API runs up
+    to PIPELINE_WORKERS x OCR_PAGE_WORKERS OCR processes. The per-worker count
+    is capped so that product stays within the CPU count.
+    """
+    workers = Config.OCR_PAGE_WORKERS
+    if Config.PIPELINE_WORKERS <= 0:
+        return workers
+    cap = max(1, (os.cpu_count() or 1) // Config.PIPELINE_WORKERS)
+    if workers > cap:
+        print(
+            f"⚠️ OCR_PAGE_WORKERS={workers} with PIPELINE_WORKERS={Config.PIPELINE_WORKERS} "
+            f"exceeds {os.cpu_count()} CPUs, using {cap} page workers per pipeline worker"
+        )
+        return cap
+    return workers
+
+# Bounded pool of pre-built pipelines running off the event loop
+executor = PipelineExecutor(
+    workers=Config.PIPELINE_WORKERS,
+    queue_size=Config.PIPELINE_QUEUE_SIZE,
+    pool_size=Config.PIPELINE_POOL_SIZE,
+    llm_provider=Config.LLM_PROVIDER,
+    start_method=Config.PIPELINE_START_METHOD,
+    startup_timeout=Config.PIPELINE_STARTUP_TIMEOUT,
+    pipeline_options={
+        "stage_concurrency": Config.PIPELINE_STAGE_CONCURRENCY,
+        "ocr_page_workers": _ocr_page_workers(),
+        "ocr_engine": Config.OCR_ENGINE,
+        "use_easyocr": Config.USE_EASYOCR,
+        "easyocr_languages": Config.EASYOCR_LANGUAGES,
+        "performance_profile": Config.PERFORMANCE_PROFILE,
+        "tesseract_lang": Config.TESSERACT_LANG,
+        "ocr_language_detection": Config.OCR_LANGUAGE_DETECTION,
+        "classify_early_exit": Config.CLASSIFY_EARLY_EXIT_CONFIDENCE or None,
+        "ocr_cache": {
+            "max_entries": Config.OCR_CACHE_MAX_ENTRIES,
+            "max_bytes": Config.OCR_CACHE_MAX_MB * 1024 * 1024,
+            "ttl_seconds": Config.OCR_CACHE_TTL,
+            "disk_path": Config.OCR_CACHE_PATH,
+            "disk_max_entries": Config.OCR_CACHE_DISK_MAX_ENTRIES,
+        } if Config.OCR_CACHE_ENABLED else None,
+    }
+)
+
+# Content-addressed cache of pipeline results (file digest + tasks + versions)
+result_cache = ResultCache(
+    max_entries=Config.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=Config.RESULT_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=Config.RESULT_CACHE_TTL,
+    disk_path=Config.RESULT_CACHE_PATH,
+    disk_max_entries=Config.RESULT_CACHE_DISK_MAX_ENTRIES
+) if Config.RESULT_CACHE_ENABLED else None
+
+# Settings that change what a pipeline returns, part of every result cache key
+# (worker counts and cache sizing only change how fast)
+_RESULT_KEY_OPTIONS = {
+    "llm_provider": Config.LLM_PROVIDER,
+    **{
+        name: value for name, value in executor.pipeline_options.items()
+        if name not in ("stage_concurrency", "ocr_page_workers", "ocr_cache")
+    },
+}
+
+# Persistent queue of asynchronous jobs (POST /jobs), opened at startup. Its
+# SQLite calls go through asyncio.to_thread from request handlers.
+job_store: Optional[JobStore] = None
+_job_wakeup: Optional[asyncio.Event] = None
+_job_tasks: set = set()
+
+# Pipeline runs in progress, by result cache key (single-flight)
+_in_flight: Dict[str, asyncio.Future] = {}
+
+# Prometheus-style metrics of this API process (GET /metrics)
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    "certifi_stage_duration_seconds", "Time spent in each pipeline stage", ["stage"]
+)
+document_seconds = metrics.histogram(
+    "certifi_document_duration_seconds", "Total pipeline time per analyzed document"
+)
+documents_total = metrics.counter(
+    "certifi_documents_total", "Documents analyzed, by result cache outcome", ["cache"]
+)
+coalesced_waiters = metrics.gauge(
+    "certifi_coalesced_waiters", "Requests waiting on an identical analysis already in progress"
+)
+coalesced_waiters.set(0)
+metrics.gauge(
+    "certifi_coalesced_flights", "Distinct analyses in progress that requests can attach to",
+    callback=lambda: len(_in_flight)
+)
+text_extraction_total = metrics.counter(
+    "certifi_text_extraction_total", "Documents by text extraction method and OCR engine", ["method", "ocr_engine"]
+)
+text_fallbacks_total = metrics.counter(
+    "certifi_text_extraction_fallbacks_total", "Fallbacks taken in the text extraction chain", ["fallback"]
+)
+metrics.gauge(
+    "certifi_executor_in_flight", "Documents admitted to the executor (running or queued)",
+    callback=lambda: executor.in_flight
+)
+metrics.gauge(
+    "certifi_executor_queue_depth", "Admitted documents waiting for a free worker",
+    callback=lambda: executor.queued
+)
+metrics.gauge(
+    "certifi_executor_capacity", "Maximum documents admitted at once",
+    callback=lambda: executor.capacity
+)
+metrics.counter(
+    "certifi_result_cache_lookups_total", "Result cache lookups by outcome", ["result"],
+    callback=lambda: {
+        "memory_hit": result_cache.counters["memory_hits"],
+        "disk_hit": result_cache.counters["disk_hits"],
+        "miss": result_cache.counters["misses"],
+    } if result_cache else {}
+)
+metrics.gauge(
+    "certifi_result_cache_hit_ratio", "Result cache hits over lookups since startup",
+    callback=lambda: result_cache.stats()["hit_ratio"] if result_cache else {}
+)
+metrics.gauge(
+    "certifi_result_cache_entries", "Entries in the in-memory result cache tier",
+    callback=lambda: result_cache.stats()["memory_entries"] if result_cache else {}
+)
+metrics.gauge(
+    "certifi_jobs", "Asynchronous jobs by status", ["status"],
+    callback=lambda: job_store.counts() if job_store else {}
+)
+
+
+@app.on_event("startup")
+def start_executor():
+    """Start and warm pipeline workers before the first request is accepted"""
+    variants = []
+    if Config.PIPELINE_WARMUP:
+        variants = [False, True] if Config.PIPELINE_WARMUP_LLM else [False]
+    report = executor.start(variants)
+    print(f"✓ Pipeline executor ready: {report}")
+
+
+@app.on_event("startup")
+async def start_job_scheduler():
+    """Open the job store, recover jobs and callbacks left by a previous run and start scheduling queued jobs"""
+    global _job_wakeup, job_store
+    job_store = await asyncio.to_thread(JobStore, os.path.join(Config.JOB_DIR, "jobs.db"))
+    _job_wakeup = asyncio.Event()
+    requeued = await asyncio.to_thread(job_store.requeue_orphans)
+    if requeued:
+        print(f"✓ Requeued {requeued} interrupted job(s)")
+    for job_id in await asyncio.to_thread(job_store.pending_callbacks):
+        _spawn(_deliver_callback(job_id))
+    _spawn(_job_scheduler())
+
+
+@app.on_event("shutdown")
+async def stop_job_scheduler():
+    """Stop scheduling; jobs still running go back to the queue"""
+    for task in list(_job_tasks):
+        task.cancel()
+    await asyncio.gather(*_job_tasks, return_exceptions=True)
+    if job_store is not None:
+        await asyncio.to_thread(job_store.requeue_owned, os.getpid())
+
+
+@app.on_event("shutdown")
+def stop_executor():
+    """Stop pipeline workers"""
+    executor.shutdown()
+
+
+def _parse_expected_hash(value: str) -> Optional[str]:
+    """
+    Parse the client-supplied `hash` field ('sha256:<hex>' or bare '<hex>')
+    
+    Returns:
+        Lowercase hex digest, or None if the field is not a SHA-256 digest
+    """
+    value = value.strip().lower()
+    if value.startswith("sha256:"):
+        value = value[len("sha256:"):]
+    if re.fullmatch(r"[0-9a-f]{64}", value):
+        return value
+    return None
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware rejecting oversized upload bodies before they are parsed
+    
+    Starlette spools the whole multipart body before a handler runs, so a
+    size check in the handler comes after the full upload. Bodies declaring
+    a larger Content-Length are refused without reading them; bodies without
+    one (chunked) are counted as they arrive and cut off at the limit.
+    """
+    
+    def __init__(self, app, limits: Dict[str, int]):
+        """
+        Args:
+            app: Wrapped ASGI app
+            limits: Maximum body bytes per POST path
+        """
+        self.app = app
+        self.limits = limits
+    
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._reject(send)
+            return
+        
+        received = 0
+        rejected = False
+        
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request" and not rejected:
+                received += len(message.get("body", b""))
+                if received > limit:
+                    rejected = True
+                    await self._reject(send)
+            if rejected:
+                return {"type": "http.disconnect"}
+            return message
+        
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+    
+    @staticmethod
+    async def _reject(send) -> None:
+        body = dumps_json({"detail": {"error": f"File exceeds maximum size of {Config.MAX_UPLOAD_MB} MB"}})
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# Multipart framing and form fields on top of the file(s)
+_FORM_OVERHEAD_BYTES = 1024 * 1024
+app.add_middleware(UploadSizeLimit, limits={
+    "/analyze": Config.MAX_UPLOAD_MB * 1024 * 1024 + _FORM_OVERHEAD_BYTES,
+    "/jobs": Config.MAX_UPLOAD_MB * 1024 * 1024 + _FORM_OVERHEAD_BYTES,
+    "/analyze/batch": Config.MAX_UPLOAD_MB * 1024 * 1024 * Config.BATCH_MAX_FILES + _FORM_OVERHEAD_BYTES,
+})
+
+
+async def _save_upload(file: UploadFile, expected_hash: Optional[str]) -> tuple:
+    """
+    Copy a spooled upload to a scratch file, hashing it on the fly
+    
+    Oversized request bodies are refused by UploadSizeLimit before they are
+    parsed; the per-file limit is enforced again here. The file is copied in
+    chunks (never fully held in memory) to Config.UPLOAD_DIR, which can point
+    to a tmpfs such as /dev/shm.
+    
+    Args:
+        file: Uploaded file
+        expected_hash: Hex SHA-256 the client declared (None = don't verify)
+    
+    Returns:
+        (scratch file path, hex SHA-256 digest)
+    
+    Raises:
+        HTTPException: 413 if the file exceeds Config.MAX_UPLOAD_MB,
+            400 if the digest does not match expected_hash
+    """
+    max_bytes = Config.MAX_UPLOAD_MB * 1024 * 1024
+    suffix = Path(file.filename or "").suffix
+    fd, tmp_path = tempfile.mkstemp(suffix=suffix, dir=Config.UPLOAD_DIR)
+    os.close(fd)
+    
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as tmp_file:
+            while True:
+                chunk = await file.read(Config.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail={"error": f"File exceeds maximum size of {Config.MAX_UPLOAD_MB} MB"}
+                    )
+                sha256.update(chunk)
+                await tmp_file.write(chunk)
+        
+        digest = sha256.hexdigest()
+        if expected_hash and digest != expected_hash:
+            raise HTTPException(
+                status_code=400,
+                detail={"error": "File hash mismatch", "expected": f"sha256:{expected_hash}", "computed": f"sha256:{digest}"}
+            )
+        return tmp_path, digest
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+# Errors that may not happen on a retry (crashes, unreadable scratch files)
+_TRANSIENT_ERRORS = ("Pipeline error", "Failed to extract text", "Failed to generate file hash")
+
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    """Only cache deterministic outcomes, not failures a retry could fix"""
+    return not any(str(e).startswith(_TRANSIENT_ERRORS) for e in result.get("errors", []))
+
+
+def _link_input(tmp_path: str) -> str:
+    """
+    Give a pipeline run its own name for an input file
+    
+    Hard link next to the file (one metadata call, no data copied), or a
+    copy on filesystems without hard links.
+    
+    Returns:
+        Path the caller owns and must delete
+    """
+    fd, own_path = tempfile.mkstemp(suffix=Path(tmp_path).suffix, dir=os.path.dirname(tmp_path))
+    os.close(fd)
+    try:
+        os.unlink(own_path)
+        os.link(tmp_path, own_path)
+    except OSError:
+        shutil.copyfile(tmp_path, own_path)
+    return own_path
+
+
+async def _run_analysis(
+    tmp_path: str,
+    file_digest: str,
+    tasks: List[str],
+    ai_version: str,
+    wait: bool = False,
+    progress_callback: Optional[JobProgress] = None
+) -> tuple:
+    """
+    Analyze a saved upload, serving identical resubmissions from the result cache
+    
+    Concurrent requests for the same (digest, tasks, ai_version) are coalesced:
+    the first one runs the pipeline, the others attach to it and share its result.
+    The run works on its own link to the file, so it is unaffected by the
+    request that started it being cancelled and deleting tmp_path.
+    
+    Args:
+        tmp_path: Scratch file holding the upload
+        file_digest: Hex SHA-256 of the file
+        tasks: Requested tasks
+        ai_version: Client AI version (part of the cache key)
+        wait: Wait for a worker slot instead of failing when saturated
+        progress_callback: Optional stage callback forwarded to the pipeline
+    
+    Returns:
+        (pipeline result, "hit", "coalesced" or "miss")
+    
+    Raises:
+        ExecutorSaturated: If no worker slot is available and wait is False
+    """
+    cache_key = ResultCache.make_key(file_digest, tasks, ai_version, pipeline_options=_RESULT_KEY_OPTIONS)
+    while True:
+        result = await _cache_get(cache_key)
+        if result is not None:
+            documents_total.inc(cache="hit")
+            return result, "hit"
+        
+        flight = _in_flight.get(cache_key)
+        if flight is None:
+            break
+        coalesced_waiters.inc()
+        try:
+            result = await asyncio.shield(flight)
+        except ExecutorSaturated:
+            if not wait:
+                raise
+            continue  # The run we attached to was rejected; start (or join) another one
+        finally:
+            coalesced_waiters.dec()
+        documents_total.inc(cache="coalesced")
+        return copy.deepcopy(result), "coalesced"
+    
+    async def compute() -> Dict[str, Any]:
+        try:
+            result = await executor.run(
+                flight_path,
+                use_llm="llm" in tasks or "vision" in tasks,
+                requested_tasks=tasks,
+                file_digest=file_digest,
+                progress_callback=progress_callback,
+                wait=wait
+            )
+            documents_total.inc(cache="miss")
+            _observe_result(result)
+            if result_cache and _is_cacheable(result):
+                await _cache_set(cache_key, result)
+            return result
+        finally:
+            _in_flight.pop(cache_key, None)
+            _remove_file(flight_path)
+    
+    # Run as its own task, on its own link to the file, so attached requests
+    # still get the result if this request is cancelled (e.g. the client
+    # disconnects) and deletes tmp_path. Linked without yielding to the loop,
+    # so no other request can start the same run meanwhile.
+    flight_path = _link_input(tmp_path)
+    flight = asyncio.ensure_future(compute())
+    flight.add_done_callback(lambda task: task.cancelled() or task.exception())
+    _in_flight[cache_key] = flight
+    return await asyncio.shield(flight), "miss"
+
+
+def _remove_file(path: str) -> None:
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+async def _cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """Result cache lookup (SQLite disk tier queried off the event loop)"""
+    if result_cache is None:
+        return None
+    if result_cache.disk_path is None:
+        return result_cache.get(key)
+    return await asyncio.get_running_loop().run_in_executor(None, result_cache.get, key)
+
+
+async def _cache_set(key: str, result: Dict[str, Any]) -> None:
+    """Result cache store (SQLite disk tier written off the event loop)"""
+    if result_cache.disk_path is None:
+        result_cache.set(key, result)
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, result_cache.set, key, result)
+
+
+def _observe_result(result: Dict[str, Any]) -> None:
+    """Record stage timings and the text extraction path of a pipeline run"""
+    metadata = result.get("metadata") or {}
+    timings = metadata.get("stage_timings") or {}
+    for stage, seconds in timings.items():
+        stage_seconds.observe(seconds, stage=stage)
+    if "pipeline_seconds" in metadata:
+        document_seconds.observe(metadata["pipeline_seconds"])
+    
+    text_stats = metadata.get("text_extraction") or {}
+    if text_stats.get("method"):
+        text_extraction_total.inc(
+            method=text_stats["method"],
+            ocr_engine=text_stats.get("ocr_engine", "none")
+        )
+    for fallback in text_stats.get("fallbacks", []):
+        text_fallbacks_total.inc(fallback=fallback)
+
+
+def _service_unavailable(retry_after: int) -> HTTPException:
+    """503 response telling the client when to retry"""
+    return HTTPException(
+        status_code=503,
+        detail={"error": "Server busy, too many documents in progress", "retry_after": retry_after},
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
 class AnalyzeRequest(BaseModel):
     """Request payload for /analyze endpoint"""
     document_id: str = Field(..., description="Unique document identifier")
@@ -60,8 +558,9 @@ class AnalyzeResponse(BaseModel):
     anomalies: List[str] = Field(default_factory=list)
 
 
-@app.post("/analyze")
+@app.post("/analyze", responses={200: {"model": AnalyzeResponse}})
 async def analyze_document(
+    request: Request,
     document_id: str = Form(...),
     hash: str = Form(...),  # Nome del campo form, non conflitto con Python built-in qui
     requested_tasks: str = Form(default="classify,extract,claims"),
@@ -83,74 +582,41 @@ async def analyze_document(
     
     Returns:
         Analysis result with document family, type, holder, claims, compliance score, and anomalies
+        (JSON, or MessagePack if the client sends `Accept: application/msgpack`)
     """
+    # Reject early (before reading the upload) if no worker slot is available
+    if executor.saturated:
+        raise _service_unavailable(executor.retry_after())
+    
     try:
         # Parse requested tasks
         tasks = [t.strip() for t in requested_tasks.split(",")]
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        # Validate the declared hash before accepting any bytes
+        expected_hash = _parse_expected_hash(hash)
+        if expected_hash is None and Config.VERIFY_UPLOAD_HASH:
+            raise HTTPException(
+                status_code=400,
+                detail={"error": "Invalid hash, expected 'sha256:<64 hex chars>'"}
+            )
+        
+        # Stream upload to a scratch file, computing its SHA-256 during the copy
+        tmp_path, file_digest = await _save_upload(
+            file, expected_hash if Config.VERIFY_UPLOAD_HASH else None
+        )
         
         try:
-            # Initialize pipeline
-            pipeline = DocumentPipeline(use_llm="llm" in tasks or "vision" in tasks)
-            
-            # Process document with requested tasks
-            result = pipeline.process(
-                file_path=tmp_path,
-                certification_profile=None,
-                requested_tasks=tasks
-            )
-            
-            # Build response based on requested tasks
-            # Map document_subtype to document_type (e.g., "engagement_letter" from subtype)
-            document_subtype = result.get("document_subtype")
-            if document_subtype:
-                document_type = document_subtype
-            else:
-                # Fallback to family if no subtype
-                document_type = result.get("document_family", "unknown")
-            
-            response_data = {
-                "document_family": result.get("document_family", "unknown"),
-                "document_type": document_type,
-            }
-            
-            # Extract holder information if requested (already extracted by pipeline)
-            if "holder" in tasks and result.get("holder"):
-                response_data["holder"] = result["holder"]
-            
-            # Extract claims if requested (already extracted by pipeline)
-            if "claims" in tasks:
-                claims_info = _extract_claims(result)
-                # Always include claims_info (even if empty/None fields) so client can see what was extracted
-                response_data["claims"] = claims_info
-            
-            # Calculate compliance score if requested (already calculated by pipeline)
-            if "compliance_score" in tasks and result.get("compliance_score") is not None:
-                response_data["compliance_score"] = result["compliance_score"]
-            
-            # Detect anomalies (always included, already detected by pipeline)
-            if result.get("anomalies"):
-                response_data["anomalies"] = result["anomalies"]
-            else:
-                response_data["anomalies"] = []
-            
-            # Validazione flessibile della risposta
+            # Serve from the result cache, or process on a pipeline worker
             try:
-                return AnalyzeResponse(**response_data)
-            except Exception as validation_error:
-                # Se la validazione fallisce, restituisci comunque i dati con campi opzionali
-                return JSONResponse(
-                    status_code=200,
-                    content={
-                        **response_data,
-                        "_validation_warning": str(validation_error)
-                    }
-                )
+                result, cache_status = await _run_analysis(tmp_path, file_digest, tasks, ai_version)
+            except ExecutorSaturated as e:
+                raise _service_unavailable(e.retry_after)
+            
+            # Build response based on requested tasks (already in AnalyzeResponse shape,
+            # encoded directly: pipeline output is trusted, no model re-validation)
+            response_data = _build_response_data(result, tasks)
+            body, media_type = encode(response_data, request.headers.get("accept", ""))
+            return Response(content=body, media_type=media_type, headers={"X-Cache": cache_status})
             
         finally:
             # Clean up temporary file
@@ -168,6 +634,409 @@ async def analyze_document(
         raise HTTPException(status_code=500, detail=error_detail)
 
 
+@app.post("/analyze/batch")
+async def analyze_batch(
+    files: List[UploadFile] = File(...),
+    document_ids: List[str] = Form(default=[]),
+    hashes: List[str] = Form(default=[]),
+    requested_tasks: str = Form(default="classify,extract,claims"),
+    ai_version: str = Form(default="v1.0")
+):
+    """
+    Analyze many documents in one request, streaming results as NDJSON
+    
+    One JSON line is emitted per document as soon as it finishes (completion
+    order, not submission order). Documents fan out across the pipeline workers.
+    
+    Args:
+        files: Document files (PDF, images, or .zip archives of documents)
+        document_ids: One per file, in the same order (defaults to the filename)
+        hashes: One 'sha256:<hex>' per file, in the same order (optional)
+        requested_tasks: Comma-separated list of tasks, applied to every document
+        ai_version: AI version identifier
+    
+    Returns:
+        application/x-ndjson stream of {index, document_id, status, cache, result | error},
+        index being the document's submission position (zip archives counting
+        as their members, in archive order)
+    """
+    if executor.saturated:
+        raise _service_unavailable(executor.retry_after())
+    if len(files) > Config.BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": f"Too many files, maximum is {Config.BATCH_MAX_FILES} per batch"}
+        )
+    
+    tasks = [t.strip() for t in requested_tasks.split(",")]
+    
+    # Save every upload before streaming starts; per-file failures become error lines
+    documents = []  # (index, document_id, tmp_path, digest)
+    failures = []  # (index, document_id, error message)
+    next_index = 0
+    for i, file in enumerate(files):
+        document_id = document_ids[i] if i < len(document_ids) else (file.filename or f"document_{i}")
+        expected_hash = _parse_expected_hash(hashes[i]) if i < len(hashes) else None
+        try:
+            tmp_path, digest = await _save_upload(
+                file, expected_hash if Config.VERIFY_UPLOAD_HASH else None
+            )
+        except HTTPException as e:
+            failures.append((next_index, document_id, _error_message(e.detail)))
+            next_index += 1
+            continue
+        
+        if Path(file.filename or "").suffix.lower() == ".zip":
+            try:
+                members, member_failures = await asyncio.to_thread(_expand_zip, tmp_path, document_id)
+                documents.extend((next_index + position, *member) for position, *member in members)
+                failures.extend((next_index + position, *failure) for position, *failure in member_failures)
+                next_index += len(members) + len(member_failures)
+            finally:
+                os.unlink(tmp_path)
+        else:
+            documents.append((next_index, document_id, tmp_path, digest))
+            next_index += 1
+    
+    if len(documents) + len(failures) > Config.BATCH_MAX_FILES:
+        for _, _, tmp_path, _ in documents:
+            os.unlink(tmp_path)
+        raise HTTPException(
+            status_code=400,
+            detail={"error": f"Too many documents, maximum is {Config.BATCH_MAX_FILES} per batch"}
+        )
+    
+    # Each document waits for a worker slot instead of failing the batch;
+    # a per-batch limit keeps one batch from filling the whole queue
+    batch_slots = asyncio.Semaphore(max(1, Config.BATCH_MAX_CONCURRENCY))
+    
+    async def analyze_one(index: int, document_id: str, tmp_path: str, digest: str) -> Dict[str, Any]:
+        line = {"index": index, "document_id": document_id, "hash": f"sha256:{digest}"}
+        try:
+            async with batch_slots:
+                result, cache_status = await _run_analysis(tmp_path, digest, tasks, ai_version, wait=True)
+            line.update(status="ok", cache=cache_status, result=_build_response_data(result, tasks))
+        except Exception as e:
+            line.update(status="error", error=str(e))
+        return line
+    
+    async def stream():
+        pending = [
+            asyncio.create_task(analyze_one(index, document_id, tmp_path, digest))
+            for index, document_id, tmp_path, digest in documents
+        ]
+        try:
+            for index, document_id, error in failures:
+                yield dumps_json({"index": index, "document_id": document_id, "status": "error", "error": error}) + b"\n"
+            for finished in asyncio.as_completed(pending):
+                yield dumps_json(await finished) + b"\n"
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for _, _, tmp_path, _ in documents:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    document_id: str = Form(...),
+    hash: str = Form(...),
+    requested_tasks: str = Form(default="classify,extract,claims"),
+    ai_version: str = Form(default="v1.0"),
+    callback_url: Optional[str] = Form(default=None),
+    file: UploadFile = File(...)
+):
+    """
+    Submit a document for asynchronous analysis
+    
+    Returns immediately with a job id. Poll GET /jobs/{job_id} for status and
+    per-stage progress, or pass callback_url to be notified (POST, JSON) when
+    the job finishes. Jobs are persisted and survive a server restart.
+    
+    Args:
+        document_id: Unique document identifier
+        hash: SHA256 hash of the document ('sha256:<hex>')
+        requested_tasks: Comma-separated list of tasks
+        ai_version: AI version identifier
+        callback_url: Optional http(s) URL notified on completion (public
+                      addresses only, see pipeline/callbacks.py)
+        file: Document file (PDF, image, etc.)
+    
+    Returns:
+        Job id, status and status URL
+    """
+    tasks = [t.strip() for t in requested_tasks.split(",")]
+    
+    if callback_url:
+        error = await asyncio.to_thread(
+            callback_url_error, callback_url, Config.CALLBACK_ALLOWED_HOSTS, Config.CALLBACK_ALLOW_PRIVATE
+        )
+        if error:
+            raise HTTPException(status_code=400, detail={"error": error})
+    
+    expected_hash = _parse_expected_hash(hash)
+    if expected_hash is None and Config.VERIFY_UPLOAD_HASH:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "Invalid hash, expected 'sha256:<64 hex chars>'"}
+        )
+    
+    tmp_path, file_digest = await _save_upload(
+        file, expected_hash if Config.VERIFY_UPLOAD_HASH else None
+    )
+    
+    # Keep the upload next to the job database so it survives a restart
+    job_path = os.path.join(Config.JOB_DIR, f"{file_digest}_{os.path.basename(tmp_path)}")
+    await asyncio.to_thread(shutil.move, tmp_path, job_path)
+    
+    job_id = await asyncio.to_thread(
+        job_store.create,
+        document_id=document_id,
+        file_path=job_path,
+        file_digest=file_digest,
+        requested_tasks=tasks,
+        ai_version=ai_version,
+        callback_url=callback_url
+    )
+    if _job_wakeup is not None:
+        _job_wakeup.set()
+    
+    return {"job_id": job_id, "status": JobStatus.QUEUED, "status_url": f"/jobs/{job_id}"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get status, progress and (when done) result of an asynchronous job
+    
+    Returns:
+        Job status; `result` has the same shape as the /analyze response
+    """
+    job = await asyncio.to_thread(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"error": f"Job {job_id} not found"})
+    
+    response = {
+        "job_id": job["id"],
+        "document_id": job["document_id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
+    if job["status"] == JobStatus.DONE:
+        response["result"] = job["result"]
+    if job["error"]:
+        response["error"] = job["error"]
+    if job["callback_url"]:
+        response["callback"] = {
+            "url": job["callback_url"],
+            "status": job["callback_status"],
+            "attempts": job["callback_attempts"],
+        }
+    return response
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Start a background task and keep a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return task
+
+
+async def _job_scheduler():
+    """Claim queued jobs and run them, at most Config.JOB_MAX_CONCURRENCY at a time"""
+    slots = asyncio.Semaphore(max(1, Config.JOB_MAX_CONCURRENCY))
+    last_prune = 0.0
+    while True:
+        for job_id in await asyncio.to_thread(job_store.queued_ids):
+            await slots.acquire()
+            if await asyncio.to_thread(job_store.claim, job_id, os.getpid()):
+                _spawn(_run_job(job_id, slots))
+            else:
+                slots.release()  # Claimed by another API process
+        
+        if time.time() - last_prune > 3600:
+            await asyncio.to_thread(job_store.prune, Config.JOB_RETENTION)
+            last_prune = time.time()
+        
+        _job_wakeup.clear()
+        try:
+            await asyncio.wait_for(_job_wakeup.wait(), timeout=Config.JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _run_job(job_id: str, slots: asyncio.Semaphore):
+    """Run one claimed job on a pipeline worker and record its outcome"""
+    job = await asyncio.to_thread(job_store.get, job_id)
+    tasks = job["requested_tasks"]
+    try:
+        progress = JobProgress(job_store.path, job_id, DocumentPipeline.STAGES)
+        result, _ = await _run_analysis(
+            job["file_path"], job["file_digest"], tasks, job["ai_version"],
+            wait=True, progress_callback=progress
+        )
+        await asyncio.to_thread(job_store.finish, job_id, _build_response_data(result, tasks))
+    except asyncio.CancelledError:
+        raise  # Shutdown: the job is requeued and its file kept
+    except Exception as e:
+        await asyncio.to_thread(job_store.fail, job_id, str(e))
+    finally:
+        slots.release()
+    
+    if os.path.exists(job["file_path"]):
+        os.unlink(job["file_path"])
+    if job["callback_url"]:
+        await _deliver_callback(job_id)
+
+
+async def _deliver_callback(job_id: str):
+    """
+    POST the finished job to its callback URL, retrying with backoff (redirects not followed)
+    
+    Each attempt is recorded in the job store, so a delivery interrupted by a
+    restart is resumed at startup with the attempts it has left (see
+    start_job_scheduler). Delivery is at least once: a restart between a
+    successful POST and its record sends the callback again.
+    """
+    job = await asyncio.to_thread(job_store.get, job_id)
+    payload = dumps_json({
+        "job_id": job["id"],
+        "document_id": job["document_id"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+    })
+    
+    retries = max(1, Config.CALLBACK_RETRIES)
+    attempts = job["callback_attempts"] or 0
+    while attempts < retries:
+        if attempts:
+            await asyncio.sleep(2 ** (attempts - 1))  # Also before the first attempt resumed after a restart
+        attempts += 1
+        try:
+            status = await asyncio.to_thread(
+                post_callback, job["callback_url"], payload, Config.CALLBACK_TIMEOUT, Config.CALLBACK_ALLOW_PRIVATE
+            )
+            await asyncio.to_thread(job_store.set_callback_status, job_id, f"delivered ({status})", attempts)
+            return
+        except Exception as e:
+            outcome = "retrying" if attempts < retries else "failed"
+            await asyncio.to_thread(job_store.set_callback_status, job_id, f"{outcome}: {e}", attempts)
+
+
+def _expand_zip(zip_path: str, zip_document_id: str) -> tuple:
+    """
+    Extract the documents of a .zip upload to scratch files, hashing each one
+    
+    Members are named '<zip document_id>/<member path>'. Directories and
+    members over Config.MAX_UPLOAD_MB (uncompressed) are skipped/reported.
+    
+    Returns:
+        (list of (position, document_id, tmp_path, digest), list of (position, document_id, error)),
+        position being the member's rank among the archive's documents
+    """
+    max_bytes = Config.MAX_UPLOAD_MB * 1024 * 1024
+    documents, failures = [], []
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile as e:
+        return [], [(0, zip_document_id, f"Invalid zip archive: {e}")]
+    
+    with archive:
+        for member in archive.infolist():
+            if member.is_dir():
+                continue
+            document_id = f"{zip_document_id}/{member.filename}"
+            position = len(documents) + len(failures)
+            if position >= Config.BATCH_MAX_FILES:
+                failures.append((position, document_id, "Too many documents in batch"))
+                break
+            fd, tmp_path = tempfile.mkstemp(suffix=Path(member.filename).suffix, dir=Config.UPLOAD_DIR)
+            sha256 = hashlib.sha256()
+            size = 0
+            try:
+                with os.fdopen(fd, "wb") as out, archive.open(member) as src:
+                    for chunk in iter(lambda: src.read(Config.UPLOAD_CHUNK_SIZE), b""):
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise ValueError(f"File exceeds maximum size of {Config.MAX_UPLOAD_MB} MB")
+                        sha256.update(chunk)
+                        out.write(chunk)
+                documents.append((position, document_id, tmp_path, sha256.hexdigest()))
+            except Exception as e:
+                os.unlink(tmp_path)
+                failures.append((position, document_id, str(e)))
+    
+    return documents, failures
+
+
+def _error_message(detail: Any) -> str:
+    """Error text of an HTTPException detail ({'error': ...} dicts or plain strings)"""
+    if isinstance(detail, dict) and "error" in detail:
+        return str(detail["error"])
+    return str(detail)
+
+
+def _build_response_data(result: Dict[str, Any], tasks: List[str]) -> Dict[str, Any]:
+    """
+    Build the /analyze response payload from a pipeline result, based on requested tasks
+    
+    Produces exactly the AnalyzeResponse shape (every field present, optional
+    ones as None) so it can be encoded without going through the model.
+    """
+    # Map document_subtype to document_type (e.g., "engagement_letter" from subtype)
+    document_subtype = result.get("document_subtype")
+    if document_subtype:
+        document_type = document_subtype
+    else:
+        # Fallback to family if no subtype
+        document_type = result.get("document_family", "unknown")
+    
+    response_data = {
+        "document_family": result.get("document_family", "unknown"),
+        "document_type": document_type,
+        "holder": None,
+        "claims": None,
+        "compliance_score": None,
+    }
+    
+    # Extract holder information if requested (already extracted by pipeline)
+    if "holder" in tasks and result.get("holder"):
+        holder = result["holder"]
+        response_data["holder"] = {
+            "type": holder.get("type"),
+            "ref": holder.get("ref"),
+            "confidence": float(holder.get("confidence", 0.0)),
+        }
+    
+    # Extract claims if requested (already extracted by pipeline)
+    if "claims" in tasks:
+        claims_info = _extract_claims(result)
+        # Always include claims_info (even if empty/None fields) so client can see what was extracted
+        response_data["claims"] = claims_info
+    
+    # Calculate compliance score if requested (already calculated by pipeline)
+    if "compliance_score" in tasks and result.get("compliance_score") is not None:
+        response_data["compliance_score"] = float(result["compliance_score"])
+    
+    # Detect anomalies (always included, already detected by pipeline)
+    if result.get("anomalies"):
+        response_data["anomalies"] = result["anomalies"]
+    else:
+        response_data["anomalies"] = []
+    
+    return response_data
+
+
 def _extract_holder(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Extract holder information from pipeline result"""
     claim = result.get("claim", {})
@@ -223,19 +1092,24 @@ def _extract_claims(result: Dict[str, Any]) -> Dict[str, Any]:
     # Extract claims_info from claim dict (even if empty)
     claims_info = {
         "is_contractor": claim.get("role") == "contractor" if claim.get("role") else None,
-        "amount": claim.get("amount"),
+        "amount": _optional_float(claim.get("amount")),
         "currency": claim.get("currency"),
         "subject": claim.get("subject"),
         "entity": claim.get("entity"),
         "start_date": claim.get("start_date").isoformat() if claim.get("start_date") else None,
         "end_date": claim.get("end_date").isoformat() if claim.get("end_date") else None,
         "secondary_currency": claim.get("secondary_currency"),
-        "secondary_amount": claim.get("secondary_amount"),
+        "secondary_amount": _optional_float(claim.get("secondary_amount")),
     }
     
     return claims_info
 
 
+def _optional_float(value: Any) -> Optional[float]:
+    """Amounts are floats in the response (Decimal/int from extraction), None stays None"""
+    return float(value) if value is not None else None
+
+
 def _calculate_compliance_score(result: Dict[str, Any]) -> float:
     """Calculate compliance score from pipeline result"""
     # Base score from certification readiness
@@ -297,6 +1171,25 @@ def _detect_anomalies(result: Dict[str, Any]) -> List[str]:
     return anomalies
 
 
+@app.get("/pipeline/plan")
+async def get_pipeline_plan(requested_tasks: str = "classify,extract,claims"):
+    """
+    Show which pipeline stages run for a set of tasks, per document family
+    
+    Args:
+        requested_tasks: Comma-separated list of tasks, as for /analyze
+    """
+    tasks = [t.strip() for t in requested_tasks.split(",")]
+    return DocumentPipeline.describe_plan(tasks)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of this process' metrics"""
+    content = await asyncio.to_thread(metrics.render)  # Gauges query the job store
+    return Response(content=content, media_type=MetricsRegistry.CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
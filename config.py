@@ -18,8 +18,17 @@ class Config:
     ANTHROPIC_API_KEY: Optional[str] = os.getenv("ANTHROPIC_API_KEY")
     
     # OCR Settings
-    TESSERACT_LANG: str = os.getenv("TESSERACT_LANG", "ita+eng")
+    TESSERACT_LANG: str = os.getenv("TESSERACT_LANG", "ita+eng")  # Languages documents may be in (each document is OCR'd with those it needs)
+    OCR_LANGUAGE_DETECTION: Optional[bool] = (
+        {"true": True, "false": False}.get(os.getenv("OCR_LANGUAGE_DETECTION", "").lower())
+    )  # Narrow OCR languages per document; unset = per performance profile
     TESSERACT_CMD: Optional[str] = os.getenv("TESSERACT_CMD")  # Custom path if needed
+    OCR_PAGE_WORKERS: int = int(os.getenv("OCR_PAGE_WORKERS", "2"))  # Scanned pages OCR'd in parallel per document (1 = sequential)
+    OCR_ENGINE: str = os.getenv("OCR_ENGINE", "auto")  # auto | tesserocr (in-process) | pytesseract (tesseract binary)
+    USE_EASYOCR: bool = os.getenv("USE_EASYOCR", "false").lower() == "true"  # OCR scans with EasyOCR (Tesseract as fallback)
+    PERFORMANCE_PROFILE: str = os.getenv("PERFORMANCE_PROFILE", "balanced")  # fast | balanced | accurate (OCR resolution, see pipeline/profiles.py)
+    CLASSIFY_EARLY_EXIT_CONFIDENCE: float = float(os.getenv("CLASSIFY_EARLY_EXIT_CONFIDENCE", "0.85"))  # Classify-only requests stop reading pages at this family confidence (0 = read everything)
+    EASYOCR_LANGUAGES: list = [lang.strip() for lang in os.getenv("EASYOCR_LANGUAGES", "en,ar").split(",") if lang.strip()]
     
     # Processing Settings
     MIN_TEXT_LENGTH: int = int(os.getenv("MIN_TEXT_LENGTH", "10"))
@@ -29,6 +38,56 @@ class Config:
     SAVE_RAW_TEXT: bool = os.getenv("SAVE_RAW_TEXT", "true").lower() == "true"
     SAVE_METADATA: bool = os.getenv("SAVE_METADATA", "true").lower() == "true"
     
+    # API Runtime Settings
+    PIPELINE_POOL_SIZE: int = int(os.getenv("PIPELINE_POOL_SIZE", "1"))  # Pipelines per variant
+    PIPELINE_WARMUP: bool = os.getenv("PIPELINE_WARMUP", "true").lower() == "true"
+    PIPELINE_WARMUP_LLM: bool = os.getenv("PIPELINE_WARMUP_LLM", "false").lower() == "true"  # Also build use_llm=True variant
+    PIPELINE_WORKERS: int = int(os.getenv("PIPELINE_WORKERS", str(os.cpu_count() or 1)))  # 0 = run in API process threads
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))  # Documents waiting for a worker before 503
+    PIPELINE_START_METHOD: str = os.getenv("PIPELINE_START_METHOD", "spawn")  # multiprocessing start method
+    PIPELINE_STARTUP_TIMEOUT: float = float(os.getenv("PIPELINE_STARTUP_TIMEOUT", "300"))  # Seconds workers get to warm up before startup fails
+    PIPELINE_STAGE_CONCURRENCY: int = int(os.getenv("PIPELINE_STAGE_CONCURRENCY", "4"))  # Independent stages run at once per document (1 = sequential)
+    
+    # Upload Settings
+    UPLOAD_DIR: Optional[str] = os.getenv("UPLOAD_DIR")  # Scratch directory (e.g. /dev/shm); None = system temp
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    MAX_UPLOAD_MB: int = int(os.getenv("MAX_UPLOAD_MB", "50"))
+    VERIFY_UPLOAD_HASH: bool = os.getenv("VERIFY_UPLOAD_HASH", "true").lower() == "true"  # Reject uploads whose SHA-256 differs from `hash`
+    
+    # Batch Settings
+    BATCH_MAX_FILES: int = int(os.getenv("BATCH_MAX_FILES", "100"))  # Documents per /analyze/batch (zip members included)
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", str(os.cpu_count() or 1)))  # Documents of one batch in flight
+    
+    # Job Settings (POST /jobs)
+    JOB_DIR: str = os.getenv(
+        "JOB_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "jobs")
+    )  # Job database and pending uploads (default: data/jobs next to this file, whatever the working directory)
+    JOB_MAX_CONCURRENCY: int = int(os.getenv("JOB_MAX_CONCURRENCY", str(os.cpu_count() or 1)))  # Jobs in flight per API process
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "2.0"))  # Seconds between queue scans
+    JOB_RETENTION: int = int(os.getenv("JOB_RETENTION", str(7 * 24 * 3600)))  # Seconds finished jobs are kept
+    CALLBACK_TIMEOUT: float = float(os.getenv("CALLBACK_TIMEOUT", "10"))
+    CALLBACK_RETRIES: int = int(os.getenv("CALLBACK_RETRIES", "3"))
+    CALLBACK_ALLOWED_HOSTS: list = [
+        host.strip() for host in os.getenv("CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+    ]  # Hosts callback_url may target ('.example.com' = any subdomain); empty = any public host
+    CALLBACK_ALLOW_PRIVATE: bool = os.getenv("CALLBACK_ALLOW_PRIVATE", "false").lower() == "true"  # Allow private/loopback callback targets (internal deployments only)
+    
+    # Result Cache Settings
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))  # Memory tier
+    RESULT_CACHE_MAX_MB: int = int(os.getenv("RESULT_CACHE_MAX_MB", "64"))  # Memory tier
+    RESULT_CACHE_TTL: int = int(os.getenv("RESULT_CACHE_TTL", str(24 * 3600)))  # Seconds, 0 = no expiry
+    RESULT_CACHE_PATH: Optional[str] = os.getenv("RESULT_CACHE_PATH")  # SQLite file shared by workers; None = memory only
+    RESULT_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_DISK_MAX_ENTRIES", "10000"))
+    
+    # OCR Page Cache Settings (per-page OCR text, keyed by the preprocessed page raster)
+    OCR_CACHE_ENABLED: bool = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+    OCR_CACHE_MAX_ENTRIES: int = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "2048"))  # Memory tier, per process
+    OCR_CACHE_MAX_MB: int = int(os.getenv("OCR_CACHE_MAX_MB", "32"))  # Memory tier, per process
+    OCR_CACHE_TTL: int = int(os.getenv("OCR_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds, 0 = no expiry
+    OCR_CACHE_PATH: Optional[str] = os.getenv("OCR_CACHE_PATH", os.getenv("RESULT_CACHE_PATH"))  # SQLite spill file; None = memory only
+    OCR_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("OCR_CACHE_DISK_MAX_ENTRIES", "50000"))
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate configuration"""
@@ -2,4 +2,4 @@
 CertiFi AI Pipeline - Modular document processing system
 """
 
-__version__ = "0.1.0"
+__version__ = "0.2.3"
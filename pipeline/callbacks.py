@@ -0,0 +1,131 @@
+"""
+Job Callbacks - Delivery of finished jobs to client-supplied URLs
+
+callback_url comes from the client, so delivering to it makes the server
+issue requests on the client's behalf. To keep that from reaching internal
+services (metadata endpoints, admin ports, the host itself):
+
+- only http(s) URLs, optionally restricted to an allowlist of hosts
+- private, loopback, link-local and reserved addresses are refused, checked
+  on the connected socket so DNS answers changing after validation do not help
+- redirects are not followed (a public URL could redirect inside)
+"""
+
+from typing import Optional, Sequence
+from urllib.parse import urlsplit
+import http.client
+import ipaddress
+import socket
+import urllib.request
+
+
+class CallbackRefused(Exception):
+    """Raised when a callback would reach a forbidden address"""
+
+
+def callback_url_error(
+    url: str,
+    allowed_hosts: Sequence[str] = (),
+    allow_private: bool = False
+) -> Optional[str]:
+    """
+    Check a callback URL before accepting a job
+
+    Args:
+        url: Client-supplied callback URL
+        allowed_hosts: Hosts URLs may target ('hooks.example.com', or
+                       '.example.com' for any subdomain); empty = any host
+        allow_private: Accept hosts resolving to private/loopback addresses
+
+    Returns:
+        Error message, or None if the URL is acceptable
+    """
+    try:
+        parts = urlsplit(url)
+        parts.port  # Raises on a malformed port
+    except ValueError:
+        return "callback_url is not a valid URL"
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return "callback_url must be an http(s) URL"
+    host = parts.hostname.lower()
+    if allowed_hosts and not _host_allowed(host, allowed_hosts):
+        return f"callback_url host '{host}' is not allowed"
+    if allow_private:
+        return None
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parts.port or 443, proto=socket.IPPROTO_TCP)}
+    except socket.gaierror:
+        return f"callback_url host '{host}' does not resolve"
+    if any(not _public_address(address) for address in addresses):
+        return "callback_url must not target a private or loopback address"
+    return None
+
+
+def post_callback(url: str, payload: bytes, timeout: float, allow_private: bool = False) -> int:
+    """
+    POST a JSON payload to a callback URL (no redirects)
+
+    Returns:
+        HTTP status
+
+    Raises:
+        CallbackRefused: If the connection reached a forbidden address
+        urllib.error.URLError / HTTPError: On network errors and non-2xx statuses (3xx included)
+    """
+    handlers = [_NoRedirect()]
+    if not allow_private:
+        handlers += [_PublicHTTPHandler(), _PublicHTTPSHandler()]
+    opener = urllib.request.build_opener(*handlers)
+    request = urllib.request.Request(url, data=payload, method="POST", headers={"Content-Type": "application/json"})
+    with opener.open(request, timeout=timeout) as response:
+        return response.status
+
+
+def _host_allowed(host: str, allowed_hosts: Sequence[str]) -> bool:
+    for allowed in allowed_hosts:
+        allowed = allowed.lower()
+        if host == allowed or (allowed.startswith('.') and host.endswith(allowed)):
+            return True
+    return False
+
+
+def _public_address(address: str) -> bool:
+    """True for globally routable unicast addresses"""
+    ip = ipaddress.ip_address(address.split('%')[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _check_peer(sock: socket.socket) -> None:
+    address = sock.getpeername()[0]
+    if not _public_address(address):
+        sock.close()
+        raise CallbackRefused(f"callback connection to non-public address {address} refused")
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def connect(self):
+        super().connect()
+        _check_peer(self.sock)
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self):
+        super().connect()
+        _check_peer(self.sock)
+
+
+class _PublicHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None  # The 3xx is raised as an HTTPError
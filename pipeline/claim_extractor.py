@@ -70,6 +70,21 @@ class ClaimExtractor:
         """Initialize with optional NER support"""
         self.use_ner = SPACY_AVAILABLE and nlp is not None
     
+    def warm_up(self) -> str:
+        """
+        Run the spaCy model once so its lazy components are initialized
+        
+        Returns:
+            'ready', 'unavailable' or an error message
+        """
+        if not self.use_ner:
+            return 'unavailable'
+        try:
+            nlp("Warm-up: ACME LLC engages Mario Rossi as contractor.")
+            return 'ready'
+        except Exception as e:
+            return f"warm-up failed: {e}"
+    
     def extract(
         self,
         text: str,
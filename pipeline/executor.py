@@ -0,0 +1,315 @@
+"""
+Pipeline Executor - Runs DocumentPipeline.process() off the event loop
+
+The pipeline is fully synchronous and CPU-bound (Tesseract, Camelot, OpenCV,
+regex), so it is executed in a pool of worker processes. Admission is bounded:
+when every worker is busy and the waiting queue is full, new documents are
+rejected with a retry hint instead of piling up.
+"""
+
+from typing import Dict, Any, Optional, List, Iterable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import atexit
+import math
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+
+from .pipeline_pool import PipelinePool
+
+# Pipeline pool of the current process (one per worker process, or the API
+# process itself when running in thread mode)
+_worker_pool: Optional[PipelinePool] = None
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the executor cannot admit another document"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Pipeline executor saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _init_worker(
+    pool_size: int,
+    llm_provider: str,
+    warm_variants: List[bool],
+    ready: Optional[Any] = None,
+    pipeline_options: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Build (and warm) the pipeline pool of a worker process
+
+    Reports (pid, None) on `ready` once warm, or (pid, traceback) if warm-up
+    failed, so start() can surface the error instead of waiting forever.
+    """
+    global _worker_pool
+    atexit.register(_close_worker_pool)
+    try:
+        _worker_pool = PipelinePool(size=pool_size, llm_provider=llm_provider, pipeline_options=pipeline_options)
+        if warm_variants:
+            _worker_pool.warm_up(warm_variants)
+    except Exception:
+        if ready is not None:
+            ready.put((os.getpid(), traceback.format_exc()))
+        raise
+    if ready is not None:
+        ready.put((os.getpid(), None))
+
+
+def _close_worker_pool() -> None:
+    """Close the pipelines of a worker process as it exits"""
+    if _worker_pool is not None:
+        _worker_pool.close()
+
+
+def _ping() -> int:
+    """No-op task used to spawn worker processes at startup"""
+    return os.getpid()
+
+
+def run_pipeline(
+    file_path: str,
+    use_llm: bool = False,
+    requested_tasks: Optional[list] = None,
+    certification_profile: Optional[Any] = None,
+    file_digest: Optional[str] = None,
+    progress_callback: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Process one document with a pipeline leased from this process' pool
+
+    Module-level so it can be pickled and sent to worker processes.
+    """
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = PipelinePool()
+    with _worker_pool.lease(use_llm) as pipeline:
+        return pipeline.process(
+            file_path=file_path,
+            certification_profile=certification_profile,
+            requested_tasks=requested_tasks,
+            file_digest=file_digest,
+            progress_callback=progress_callback
+        )
+
+
+class PipelineExecutor:
+    """
+    Bounded execution layer between the API and the pipeline
+
+    - workers > 0: documents run in a process pool (one pipeline per process)
+    - workers == 0: documents run in a thread pool inside the API process
+      (useful for development and debugging)
+
+    At most `workers + queue_size` documents are admitted at once.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        queue_size: int = 8,
+        pool_size: int = 1,
+        llm_provider: str = "openai",
+        start_method: str = "spawn",
+        pipeline_options: Optional[Dict[str, Any]] = None,
+        startup_timeout: float = 300.0
+    ):
+        """
+        Initialize executor (worker processes are started by start())
+
+        Args:
+            workers: Number of worker processes (0 = thread mode)
+            queue_size: Documents allowed to wait for a free worker
+            pool_size: Pipelines per variant in thread mode
+            llm_provider: LLM provider passed to every pipeline
+            start_method: multiprocessing start method for workers
+            pipeline_options: Extra DocumentPipeline arguments (e.g. stage_concurrency)
+            startup_timeout: Seconds start() waits for the workers to be warm
+        """
+        self.workers = max(0, workers)
+        self.queue_size = max(0, queue_size)
+        self.pool_size = max(1, pool_size)
+        self.llm_provider = llm_provider
+        self.start_method = start_method
+        self.pipeline_options = dict(pipeline_options or {})
+        self.startup_timeout = startup_timeout
+        self.capacity = max(1, self.workers or self.pool_size) + self.queue_size
+
+        self._executor: Optional[Executor] = None
+        self._slot_freed: Optional[asyncio.Condition] = None
+        self.in_flight = 0
+        self._avg_seconds = 5.0  # Moving average of processing time (for Retry-After)
+
+    def start(self, warm_variants: Iterable[bool] = (False,)) -> Dict[str, Any]:
+        """
+        Start the workers and wait until they are warm
+
+        Args:
+            warm_variants: `use_llm` pipeline variants to build at startup
+
+        Returns:
+            Startup report
+
+        Raises:
+            RuntimeError: If a worker fails to warm up, dies, or is not warm
+                          within startup_timeout
+        """
+        warm_variants = list(warm_variants)
+        start = time.perf_counter()
+
+        if self.workers > 0:
+            mp_context = multiprocessing.get_context(self.start_method)
+            ready = mp_context.Queue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(1, self.llm_provider, warm_variants, ready, self.pipeline_options)
+            )
+            # Force every worker to spawn now, then wait until each one is warm
+            pings = [self._executor.submit(_ping) for _ in range(self.workers)]
+            try:
+                pids = self._wait_ready(ready, pings, start + self.startup_timeout)
+            except Exception:
+                # Hung workers would never exit on their own
+                for process in list(getattr(self._executor, '_processes', {}).values()):
+                    process.terminate()
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                raise
+            mode = 'process'
+        else:
+            _init_worker(self.pool_size, self.llm_provider, warm_variants, pipeline_options=self.pipeline_options)
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='pipeline')
+            pids = {os.getpid()}
+            mode = 'thread'
+
+        return {
+            'mode': mode,
+            'workers': len(pids),
+            'capacity': self.capacity,
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+
+    def _wait_ready(self, ready: Any, pings: List[Any], deadline: float) -> set:
+        """Collect the warm-up report of every worker (see _init_worker)"""
+        pids = set()
+        while len(pids) < self.workers:
+            try:
+                pid, error = ready.get(timeout=max(0.1, min(1.0, deadline - time.perf_counter())))
+            except queue.Empty:
+                # A worker killed during warm-up never reports: its ping fails instead
+                for ping in pings:
+                    if ping.done() and ping.exception() is not None:
+                        raise RuntimeError(f"Pipeline worker died during warm-up: {ping.exception()!r}")
+                if time.perf_counter() >= deadline:
+                    raise RuntimeError(
+                        f"Pipeline workers not warm after {self.startup_timeout}s "
+                        f"({len(pids)}/{self.workers} ready)"
+                    )
+                continue
+            if error is not None:
+                raise RuntimeError(f"Pipeline worker {pid} failed to warm up:\n{error}")
+            pids.add(pid)
+        for ping in pings:
+            ping.result(timeout=max(0.1, deadline - time.perf_counter()))
+        return pids
+
+    def shutdown(self) -> None:
+        """Stop the workers (waits for running documents)"""
+        global _worker_pool
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self.workers == 0 and _worker_pool is not None:
+            # Thread mode: the pipelines live in this process
+            _worker_pool.close()
+            _worker_pool = None
+
+    @property
+    def saturated(self) -> bool:
+        """True if a new document would be rejected right now"""
+        return self.in_flight >= self.capacity
+
+    @property
+    def queued(self) -> int:
+        """Documents admitted but still waiting for a worker"""
+        return max(0, self.in_flight - max(1, self.workers or self.pool_size))
+
+    def retry_after(self) -> int:
+        """Estimate (seconds) until a slot frees up"""
+        parallelism = max(1, self.workers or self.pool_size)
+        waves = (self.queued + 1) / parallelism
+        return max(1, math.ceil(self._avg_seconds * waves))
+
+    async def run(
+        self,
+        file_path: str,
+        use_llm: bool = False,
+        requested_tasks: Optional[list] = None,
+        certification_profile: Optional[Any] = None,
+        file_digest: Optional[str] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        wait: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Process a document without blocking the event loop
+
+        Args:
+            progress_callback: Stage callback (must be picklable in process mode)
+            wait: If True, wait for a free slot instead of raising when saturated
+
+        Raises:
+            ExecutorSaturated: If workers and queue are full (and wait is False)
+        """
+        if self._executor is None:
+            raise RuntimeError("PipelineExecutor not started")
+        await self._admit(wait)
+
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                run_pipeline,
+                file_path,
+                use_llm,
+                requested_tasks,
+                certification_profile,
+                file_digest,
+                progress_callback
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+            await self._release()
+
+    async def _admit(self, wait: bool) -> None:
+        """Take an admission slot (optionally waiting for one)"""
+        if not self.saturated:
+            self.in_flight += 1
+            return
+        if not wait:
+            raise ExecutorSaturated(self.retry_after())
+        if self._slot_freed is None:
+            self._slot_freed = asyncio.Condition()
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: not self.saturated)
+            self.in_flight += 1
+
+    async def _release(self) -> None:
+        """
+        Give back an admission slot and wake the waiters
+
+        Every waiter re-checks for a free slot: a single notify() can go to a
+        waiter cancelled before it resumes, which would leave the slot unused
+        while the others keep waiting.
+        """
+        self.in_flight -= 1
+        if self._slot_freed is not None:
+            async with self._slot_freed:
+                self._slot_freed.notify_all()
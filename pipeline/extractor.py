@@ -4,7 +4,7 @@ Uses regex rules first, LLM as fallback
 """
 
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from decimal import Decimal
 from datetime import datetime
 from dateutil import parser
@@ -28,13 +28,20 @@ class InformationExtractor:
         self.llm_provider = llm_provider
         self.mrz_parser = MRZParser()
     
-    def extract(self, text: str, document_type: str) -> BaseDocumentSchema:
+    def extract(
+        self,
+        text: str,
+        document_type: str,
+        page_models: Optional[List[Any]] = None
+    ) -> BaseDocumentSchema:
         """
         Extract information based on document type
         
         Args:
             text: Document text
             document_type: Type of document
+            page_models: Optional PageModel of each page (from TextExtractor.extract);
+                         ID documents then look for the MRZ where it is printed first
             
         Returns:
             Extracted data as Pydantic schema
@@ -44,7 +51,7 @@ class InformationExtractor:
         elif document_type == 'diploma':
             return self._extract_diploma(text)
         elif document_type == 'id':
-            return self._extract_id(text)
+            return self._extract_id(text, page_models)
         elif document_type == 'driving_license':
             return self._extract_driving_license(text)
         else:
@@ -214,7 +221,7 @@ class InformationExtractor:
             raw_text=text
         )
     
-    def _extract_id(self, text: str) -> IDDocumentSchema:
+    def _extract_id(self, text: str, page_models: Optional[List[Any]] = None) -> IDDocumentSchema:
         """
         Extract ID document data - MRZ is source of truth
         
@@ -230,8 +237,10 @@ class InformationExtractor:
         trusted_source = None
         missing_fields = []
         
-        # STEP 1: Try MRZ first (source of truth)
-        mrz_result = self.mrz_parser.parse(text)
+        # STEP 1: Try MRZ first (source of truth), in the MRZ region of the pages if known
+        mrz_result = self.mrz_parser.parse_page_models(page_models or [])
+        if not mrz_result['found']:
+            mrz_result = self.mrz_parser.parse(text)
         
         if mrz_result['found'] and mrz_result['confidence'] > 0.8:
             trusted_source = 'mrz'
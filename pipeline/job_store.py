@@ -0,0 +1,271 @@
+"""
+Job Store - Persistent local queue for asynchronous analysis jobs
+
+Long scans (OCR + Camelot + Unstructured on many pages) can take minutes, so
+clients submit a job, get an id back immediately and poll (or get called
+back). Jobs live in a SQLite file, so a restart does not lose them: queued
+jobs stay queued and jobs that were running in a dead process are requeued.
+
+Completion callbacks are persisted too: callback_status is 'pending' until
+the first attempt, 'retrying: <error>' while attempts remain, then
+'delivered (<http status>)' or 'failed: <error>'. callback_attempts counts
+the attempts made, so deliveries interrupted by a restart resume where
+they stopped.
+"""
+
+from typing import Dict, Any, Optional, List
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class JobStatus:
+    """Job lifecycle states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobStore:
+    """
+    SQLite-backed job queue shared by the API and the pipeline workers
+
+    Each process opens its own connection; WAL mode lets workers report
+    progress while the API reads job status.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize store (creates the database file and table if needed)
+
+        Args:
+            path: SQLite file path
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10.0, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, document_id TEXT, "
+            "file_path TEXT, file_digest TEXT, requested_tasks TEXT, ai_version TEXT, "
+            "callback_url TEXT, callback_status TEXT, callback_attempts INTEGER DEFAULT 0, "
+            "stage TEXT, progress REAL DEFAULT 0, "
+            "result TEXT, error TEXT, owner_pid INTEGER, "
+            "created_at REAL, started_at REAL, finished_at REAL, updated_at REAL)"
+        )
+        columns = {row['name'] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if 'callback_attempts' not in columns:  # Job files created before callbacks were persisted
+            self._db.execute("ALTER TABLE jobs ADD COLUMN callback_attempts INTEGER DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._db.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            self._db.commit()
+            return cursor
+
+    def create(
+        self,
+        document_id: str,
+        file_path: str,
+        file_digest: str,
+        requested_tasks: List[str],
+        ai_version: str,
+        callback_url: Optional[str] = None
+    ) -> str:
+        """
+        Enqueue a new job
+
+        Returns:
+            Job id
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, status, document_id, file_path, file_digest, requested_tasks, "
+            "ai_version, callback_url, callback_status, stage, progress, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)",
+            (
+                job_id, JobStatus.QUEUED, document_id, file_path, file_digest,
+                json.dumps(requested_tasks), ai_version, callback_url,
+                'pending' if callback_url else None, JobStatus.QUEUED, now, now
+            )
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job as a dict (result and tasks decoded), or None"""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['requested_tasks'] = json.loads(job['requested_tasks'] or '[]')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def queued_ids(self, limit: int = 100) -> List[str]:
+        """Oldest queued jobs first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT ?",
+                (JobStatus.QUEUED, limit)
+            ).fetchall()
+        return [row['id'] for row in rows]
+
+    def claim(self, job_id: str, owner_pid: int) -> bool:
+        """
+        Atomically move a queued job to running
+
+        Returns:
+            False if another process claimed it first
+        """
+        now = time.time()
+        cursor = self._execute(
+            "UPDATE jobs SET status = ?, owner_pid = ?, started_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = ?",
+            (JobStatus.RUNNING, owner_pid, now, now, job_id, JobStatus.QUEUED)
+        )
+        return cursor.rowcount == 1
+
+    def update_progress(self, job_id: str, stage: str, progress: float) -> None:
+        """Record the stage a running job has reached"""
+        self._execute(
+            "UPDATE jobs SET stage = ?, progress = ?, updated_at = ? WHERE id = ?",
+            (stage, round(progress, 3), time.time(), job_id)
+        )
+
+    def finish(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job done and store its result"""
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = ?, stage = ?, progress = 1, result = ?, "
+            "finished_at = ?, updated_at = ? WHERE id = ?",
+            (JobStatus.DONE, JobStatus.DONE, json.dumps(result, default=str), now, now, job_id)
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job failed"""
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? WHERE id = ?",
+            (JobStatus.FAILED, error, now, now, job_id)
+        )
+
+    def set_callback_status(self, job_id: str, callback_status: str, attempts: Optional[int] = None) -> None:
+        """
+        Record the outcome of a completion callback attempt
+
+        Args:
+            job_id: Job id
+            callback_status: 'delivered (<status>)', 'retrying: <error>' or 'failed: <error>'
+            attempts: Attempts made so far (unchanged if None)
+        """
+        self._execute(
+            "UPDATE jobs SET callback_status = ?, callback_attempts = COALESCE(?, callback_attempts), "
+            "updated_at = ? WHERE id = ?",
+            (callback_status, attempts, time.time(), job_id)
+        )
+
+    def pending_callbacks(self) -> List[str]:
+        """Finished jobs whose callback was neither delivered nor given up on"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) "
+                "AND (callback_status = 'pending' OR callback_status LIKE 'retrying:%')",
+                (JobStatus.DONE, JobStatus.FAILED)
+            ).fetchall()
+        return [row['id'] for row in rows]
+
+    def requeue_orphans(self) -> int:
+        """
+        Requeue running jobs whose owner process no longer exists
+
+        Returns:
+            Number of requeued jobs
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, owner_pid FROM jobs WHERE status = ?", (JobStatus.RUNNING,)
+            ).fetchall()
+        orphans = [row['id'] for row in rows if not _pid_alive(row['owner_pid'])]
+        for job_id in orphans:
+            self.requeue(job_id)
+        return len(orphans)
+
+    def requeue_owned(self, owner_pid: int) -> None:
+        """Requeue the running jobs of a process that is shutting down"""
+        self._execute(
+            "UPDATE jobs SET status = ?, stage = ?, progress = 0, owner_pid = NULL, updated_at = ? "
+            "WHERE status = ? AND owner_pid = ?",
+            (JobStatus.QUEUED, JobStatus.QUEUED, time.time(), JobStatus.RUNNING, owner_pid)
+        )
+
+    def requeue(self, job_id: str) -> None:
+        """Put a job back in the queue"""
+        self._execute(
+            "UPDATE jobs SET status = ?, stage = ?, progress = 0, owner_pid = NULL, updated_at = ? WHERE id = ?",
+            (JobStatus.QUEUED, JobStatus.QUEUED, time.time(), job_id)
+        )
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the retention period"""
+        cursor = self._execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (JobStatus.DONE, JobStatus.FAILED, time.time() - older_than_seconds)
+        )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+
+class JobProgress:
+    """
+    Picklable progress callback for DocumentPipeline.process()
+
+    Sent to the worker process with the job; opens its own connection to the
+    job store on first use and records each stage the pipeline enters.
+    """
+
+    def __init__(self, store_path: str, job_id: str, stages: List[str]):
+        self.store_path = store_path
+        self.job_id = job_id
+        self.stages = list(stages)
+        self._store: Optional[JobStore] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_store'] = None  # Connections are not picklable
+        return state
+
+    def __call__(self, stage: str) -> None:
+        if self._store is None:
+            self._store = JobStore(self.store_path)
+        position = self.stages.index(stage) if stage in self.stages else 0
+        self._store.update_progress(self.job_id, stage, position / max(1, len(self.stages)))
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    """True if a process with this pid exists on this host"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,93 @@
+"""
+Language Detection - Picks the OCR languages a document actually needs
+
+Tesseract and EasyOCR are configured with every language documents may be
+in ('ita+eng', ['en', 'ar']), but each extra language model slows
+recognition and adds confusions. Before OCR, a sample of the document (its
+text layer when it has one, else a quick OCR of a low resolution crop of
+the first scanned page) is checked for:
+
+- script: Arabic letters call for the Arabic-script models
+- language: for Latin-script candidates, which one's common function
+  words ('the', 'and' / 'il', 'della'...) the sample uses
+
+and the candidates with no evidence are dropped. When the sample is too
+short to tell, every candidate is kept.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import re
+
+# Frequent function words per Latin-script language (Tesseract codes)
+STOPWORDS: Dict[str, frozenset] = {
+    'eng': frozenset('the and of to in is for that with on this by be are as or shall any from'.split()),
+    'ita': frozenset('il lo gli le di che per con del della dei delle nel nella sono una non alla dal come'.split()),
+    'fra': frozenset('le les des du et est une pour dans que qui sur par au aux ce cette sont'.split()),
+    'deu': frozenset('der die das und ist nicht ein eine zu den mit von für auf dem des sich im'.split()),
+    'spa': frozenset('el los las de y que en del por con para una es al se lo como'.split()),
+    'por': frozenset('os as de e que em do da dos das para com um uma não por se'.split()),
+}
+
+# Languages written in Arabic script (Tesseract and EasyOCR codes)
+ARABIC_SCRIPT = frozenset(['ara', 'fas', 'urd', 'ar', 'fa', 'ur'])
+
+# EasyOCR code -> Tesseract code, to score EasyOCR candidates
+EASYOCR_TO_TESSERACT = {
+    'en': 'eng', 'it': 'ita', 'fr': 'fra', 'de': 'deu', 'es': 'spa', 'pt': 'por',
+    'ar': 'ara', 'fa': 'fas', 'ur': 'urd',
+}
+
+THRESHOLDS = {
+    'min_letters': 80,           # Shorter samples are inconclusive
+    'script_min_share': 0.05,    # Share of letters for a script to count as present
+    'min_stopword_hits': 5,      # Function words needed to tell Latin languages apart
+    'secondary_share': 0.25,     # A second Latin language is kept at this share of the first's hits
+}
+
+_ARABIC_LETTER = re.compile(r'[؀-ۿݐ-ݿࢠ-ࣿ]')
+_LATIN_LETTER = re.compile(r'[A-Za-zÀ-ɏ]')
+_LATIN_WORD = re.compile(r'[a-zÀ-ɏ]+')
+
+
+def select_languages(text: str, candidates: Sequence[str]) -> Optional[List[str]]:
+    """
+    Candidates a text sample shows evidence of
+
+    Args:
+        text: Sample of the document's text
+        candidates: Configured languages, Tesseract ('eng') or EasyOCR ('en') codes
+
+    Returns:
+        The needed subset of `candidates` (in their order), or None when the
+        sample cannot tell (too short, or no candidate matches)
+    """
+    letters = len(re.findall(r'[^\W\d_]', text))
+    if letters < THRESHOLDS['min_letters']:
+        return None
+
+    codes = {candidate: EASYOCR_TO_TESSERACT.get(candidate, candidate) for candidate in candidates}
+    chosen = set()
+
+    # Script
+    if len(_ARABIC_LETTER.findall(text)) / letters >= THRESHOLDS['script_min_share']:
+        chosen.update(c for c, code in codes.items() if code in ARABIC_SCRIPT)
+
+    # Latin-script languages, by function words
+    latin = [c for c, code in codes.items() if code in STOPWORDS]
+    undecided = False
+    if latin and len(_LATIN_LETTER.findall(text)) / letters >= THRESHOLDS['script_min_share']:
+        words = _LATIN_WORD.findall(text.lower())
+        hits = {c: sum(1 for word in words if word in STOPWORDS[codes[c]]) for c in latin}
+        top = max(hits.values())
+        if top < THRESHOLDS['min_stopword_hits']:
+            chosen.update(latin)  # Latin text, but not enough of it to tell which language
+            undecided = True
+        else:
+            chosen.update(c for c in latin if hits[c] >= top * THRESHOLDS['secondary_share'])
+
+    # Languages this module knows nothing about are never dropped
+    chosen.update(c for c, code in codes.items() if code not in STOPWORDS and code not in ARABIC_SCRIPT)
+
+    if not chosen or (undecided and len(chosen) == len(codes)):
+        return None
+    return [c for c in candidates if c in chosen]
@@ -7,6 +7,8 @@ Part of the pipeline: OCR → Layout → Vision → LLM → Normalizer → JSON
 from typing import Dict, Any, List, Optional
 import re
 
+import numpy as np
+
 
 class LayoutAnalyzer:
     """
@@ -18,13 +20,23 @@ class LayoutAnalyzer:
     - Layout patterns (MRZ, form fields, etc.)
     """
     
-    def analyze(self, text: str, file_path: Optional[str] = None) -> Dict[str, Any]:
+    # OCR'd words below this confidence (0-100) are counted as unreliable
+    LOW_WORD_CONFIDENCE = 60
+    
+    def analyze(
+        self,
+        text: str,
+        file_path: Optional[str] = None,
+        page_models: Optional[List[Any]] = None
+    ) -> Dict[str, Any]:
         """
         Analyze document layout
         
         Args:
             text: Extracted text from document
             file_path: Optional file path for image-based analysis
+            page_models: Optional PageModel of each page (from TextExtractor.extract);
+                         adds the text blocks of each page and word confidence
             
         Returns:
             Layout analysis result
@@ -52,13 +64,27 @@ class LayoutAnalyzer:
         # Calculate confidence
         confidence = self._calculate_layout_confidence(sections, structured_fields, layout_type)
         
-        return {
+        analysis = {
             "has_structure": len(structured_fields) > 0 or len(sections) > 1,
             "sections": sections,
             "structured_fields": structured_fields,
             "layout_type": layout_type,
             "confidence": confidence
         }
+        if page_models:
+            analysis.update(self._page_geometry(page_models))
+        return analysis
+    
+    def _page_geometry(self, page_models: List[Any]) -> Dict[str, Any]:
+        """Text blocks of each page and word confidence, from the extraction's page models"""
+        confidences = [model.confidences for model in page_models if len(model)]
+        confidences = np.concatenate(confidences) if confidences else np.zeros(0, dtype=np.float32)
+        return {
+            "pages": [model.summary() for model in page_models],
+            "word_count": int(confidences.size),
+            "mean_word_confidence": round(float(confidences.mean()), 1) if confidences.size else None,
+            "low_confidence_words": int((confidences < self.LOW_WORD_CONFIDENCE).sum())
+        }
     
     def _detect_sections(self, lines: List[str]) -> List[Dict[str, Any]]:
         """Detect document sections (header, body, footer)"""
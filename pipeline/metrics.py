@@ -0,0 +1,287 @@
+"""
+Metrics - Minimal Prometheus-style instrumentation
+
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format (version 0.0.4), so GET /metrics can be scraped without adding a
+client library. Metrics are per process: every API worker exposes its own.
+"""
+
+from typing import Dict, Any, Optional, List, Tuple, Callable, Iterable
+import math
+import threading
+import time
+
+# Default latency buckets (seconds): OCR'd scans take tens of seconds,
+# regex stages take milliseconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames: Iterable[str], labelvalues: Iterable[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """
+    Base class: a named metric family with optional labels
+
+    Values are either recorded explicitly, or computed at scrape time by a
+    callback returning a number (unlabelled) or {label value(s): number}.
+    """
+
+    type_name = 'untyped'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], Any]] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._callback = callback
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _add(self, amount: float, labels: Dict[str, Any]) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _collect(self) -> List[Tuple[Tuple[str, ...], float]]:
+        if self._callback is None:
+            with self._lock:
+                return sorted(self._values.items())
+        try:
+            observed = self._callback()
+        except Exception:
+            return []  # A failing collector must not break the whole scrape
+        if not isinstance(observed, dict):
+            observed = {(): observed}
+        values = []
+        for key, value in observed.items():
+            key = key if isinstance(key, tuple) else (key,)
+            values.append((tuple(str(k) for k in key), float(value)))
+        return sorted(values)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._collect()
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Increase the counter of a label set"""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._add(amount, labels)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        """Set the value of a label set"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self._add(-amount, labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    type_name = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        bounds = sorted(float(b) for b in buckets)
+        if not bounds or bounds[-1] != math.inf:
+            bounds.append(math.inf)
+        self.buckets = tuple(bounds)
+        self._series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation"""
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            series_items = sorted((key, dict(s, counts=list(s['counts']))) for key, s in self._series.items())
+        for key, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], Any]] = None
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames, callback))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], Any]] = None
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Text exposition of every registered metric"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class StageTimer:
+    """
+    Times consecutive pipeline stages
+
+    Each enter() closes the running stage and opens the next one, and
+    notifies the progress callback. Stages run concurrently are reported
+    with notify() and record() instead. finish() closes the last stage and
+    returns {stage: seconds}. Used inside DocumentPipeline.process(), so
+    timings travel back with the (picklable) result from worker processes.
+    """
+
+    def __init__(self, progress_callback: Optional[Callable[[str], None]] = None):
+        self.progress_callback = progress_callback
+        self.timings: Dict[str, float] = {}
+        self._stage: Optional[str] = None
+        self._started = 0.0
+        self._created = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds since the timer was created"""
+        return time.perf_counter() - self._created
+
+    def enter(self, stage: str) -> None:
+        """Start a stage (ends the previous one)"""
+        self.close()
+        self._stage = stage
+        self._started = time.perf_counter()
+        self.notify(stage)
+
+    def notify(self, stage: str) -> None:
+        """Report a stage start to the progress callback"""
+        if self.progress_callback is not None:
+            try:
+                self.progress_callback(stage)
+            except Exception:
+                pass  # Progress reporting must never break processing
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add the duration of a stage timed elsewhere"""
+        self.timings[stage] = round(self.timings.get(stage, 0.0) + seconds, 6)
+
+    def close(self) -> None:
+        """End the running sequential stage, if any"""
+        if self._stage is not None:
+            elapsed = time.perf_counter() - self._started
+            self.timings[self._stage] = round(self.timings.get(self._stage, 0.0) + elapsed, 6)
+            self._stage = None
+
+    def finish(self) -> Dict[str, float]:
+        """End the running stage and return the timings"""
+        self.close()
+        return dict(self.timings)
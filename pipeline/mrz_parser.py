@@ -4,13 +4,16 @@ MRZ is the most reliable source of truth for ID documents
 """
 
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Sequence
 from datetime import datetime
 
 
 class MRZParser:
     """Parse MRZ from ID documents (TD1, TD2, TD3 formats)"""
     
+    # Where passports and ID cards print the MRZ, in page fractions (x0, y0, x1, y1)
+    MRZ_REGION = (0, 0.75, 1, 1)
+    
     def __init__(self):
         # TD3 format (passport-like, 2 lines of 44 chars)
         self.td3_pattern = re.compile(
@@ -213,6 +216,33 @@ class MRZParser:
         
         return data
     
+    def parse_page_models(self, page_models: Sequence[Any]) -> Dict[str, Any]:
+        """
+        Parse a TD3/TD1 MRZ from the words in MRZ_REGION of each page
+        
+        Reading only the bottom of the page keeps body lines that look like
+        MRZ (codes, reference numbers) out of it. OCR splits MRZ lines at
+        long '<' runs, so the words of a line are joined without spaces.
+        
+        Args:
+            page_models: PageModel of each page (pipeline.page_model)
+            
+        Returns:
+            Parsed MRZ data of the first page holding one (see parse), or
+            found=False: the caller then falls back to parse(text), which
+            covers cards scanned anywhere on a larger page
+        """
+        for model in page_models:
+            lines = [line['text'].replace(' ', '') for line in model.region(*self.MRZ_REGION).lines()]
+            result = self.parse('\n'.join(lines))
+            if result['found'] and result.get('format') in ('TD3', 'TD1'):
+                return result
+        return {
+            'found': False,
+            'data': {},
+            'confidence': 0.0
+        }
+    
     def parse(self, text: str) -> Dict[str, Any]:
         """
         Auto-detect and parse MRZ from text
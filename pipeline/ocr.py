@@ -4,182 +4,771 @@ Handles PDF (text + scanned) and image files
 """
 
 import os
-from typing import Optional, Union
+import copy
+from typing import Optional, Union, Dict, Any, List, Sequence, Tuple, Iterator, Callable
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+import multiprocessing
+import threading
 import pdfplumber
 import fitz  # PyMuPDF
-import pytesseract
 from PIL import Image
 import numpy as np
 import cv2
 from .preprocessing import DocumentPreprocessor
+from .ocr_engines import get_engine, get_easyocr_reader, EASYOCR_AVAILABLE
+from .page_planner import PagePlanner
+from .page_model import PageModel
+from .language_detection import select_languages
+from .ocr_cache import get_ocr_cache, raster_key, source_fingerprints
+from .profiles import get_profile, render_zoom, image_scale, resize_image, estimate_glyph_height
 
-# Try to import EasyOCR (optional, better OCR)
-try:
-    import easyocr
-    EASYOCR_AVAILABLE = True
-except ImportError:
-    EASYOCR_AVAILABLE = False
-    easyocr = None
+# Share of the page a single embedded image must cover to be OCR'd directly
+EMBEDDED_IMAGE_MIN_COVERAGE = 0.9
+
+# Scanned pages rendered and sent to EasyOCR together (bounds page memory)
+EASYOCR_PAGE_BATCH = 4
+
+# Text layer pages of one PDF read per page pool task when the PDF is long
+# enough to split over page_workers processes
+TEXT_LAYER_RANGE_PAGES = 32
+
+# Resolution and band (top, bottom, as page fractions) of the first scanned
+# page OCR'd with every configured language to choose a document's languages
+LANGUAGE_SAMPLE_DPI = 100
+LANGUAGE_SAMPLE_BAND = (0.2, 0.7)
+
+# Process pool shared by every TextExtractor of this process for page-level
+# OCR of scanned PDFs (created on first use)
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_workers = 1
+_page_pool_warm: Tuple[str, Tuple[str, ...]] = ('auto', ())
+_page_pool_lock = threading.Lock()
+_page_preprocessor: Optional[DocumentPreprocessor] = None
+
+# Scratch arrays of the thread OCR'ing pages (reused from page to page)
+_page_buffers = threading.local()
 
 
 class TextExtractor:
     """Extracts text from various document formats"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        page_workers: int = 1,
+        ocr_engine: str = 'auto',
+        use_easyocr: bool = False,
+        easyocr_languages: Sequence[str] = ('en', 'ar'),
+        performance_profile: str = 'balanced',
+        ocr_cache: Optional[Dict[str, Any]] = None,
+        tesseract_lang: str = 'ita+eng',
+        language_detection: Optional[bool] = None
+    ):
+        """
+        Initialize extractor
+        
+        Args:
+            page_workers: Pages of one scanned PDF OCR'd in parallel
+                          (worker processes; 1 = one page at a time, in-process)
+            ocr_engine: Tesseract backend: 'tesserocr' (in-process), 'pytesseract'
+                        (one tesseract process per page) or 'auto' (tesserocr if
+                        installed, else pytesseract)
+            use_easyocr: OCR with EasyOCR by default (Tesseract stays the fallback)
+            easyocr_languages: EasyOCR language codes (English + Arabic for UAE documents)
+            performance_profile: Resolution policy of OCR'd pages ('fast', 'balanced',
+                                 'accurate'; see profiles.PERFORMANCE_PROFILES)
+            ocr_cache: Page OCR cache options (ResultCache arguments: max_entries,
+                       max_bytes, ttl_seconds, disk_path, disk_max_entries);
+                       None = no cache (duplicate pages of a document are still OCR'd once)
+            tesseract_lang: Tesseract languages documents may be in (e.g. 'ita+eng')
+            language_detection: OCR each document with only the languages (of
+                                tesseract_lang, or easyocr_languages) it shows
+                                evidence of; None = the performance profile's setting
+        """
         self.preprocessor = DocumentPreprocessor()
+        self.page_planner = PagePlanner()
+        self.tesseract_lang = tesseract_lang
+        self.page_workers = max(1, page_workers)
+        self.ocr_engine = ocr_engine
+        self.use_easyocr = use_easyocr
+        self.easyocr_languages = tuple(easyocr_languages)
+        self.profile = get_profile(performance_profile)
+        self.ocr_cache = ocr_cache
+        if language_detection is None:
+            language_detection = self.profile.get('language_detection', False)
+        self.language_detection = language_detection
+    
+    @property
+    def engine(self):
+        """Tesseract engine of this process for the configured backend and languages"""
+        return get_engine(self.ocr_engine, self.tesseract_lang)
+    
+    def warm_up(self) -> str:
+        """
+        Check the Tesseract install and load its language data once
+        
+        Returns:
+            'ready' or a description of what is missing
+        """
+        try:
+            engine = self.engine
+            installed = set(engine.get_languages())
+            missing = [lang for lang in self.tesseract_lang.split('+') if lang not in installed]
+            if missing:
+                return f"missing tesseract languages: {', '.join(missing)}"
+            # OCR a blank image so the traineddata files are read (and, with
+            # tesserocr, kept loaded in this thread's engine handle), for the
+            # single languages detection may narrow documents to as well
+            # (page workers do the same when they start, see _init_page_worker)
+            _warm_engines(self.ocr_engine, self._warm_languages())
+            return 'ready'
+        except Exception as e:
+            return f"tesseract unavailable: {e}"
+    
+    def _warm_languages(self) -> List[str]:
+        """Tesseract language strings documents may be OCR'd with (configured, and each one detection may pick)"""
+        languages = [self.tesseract_lang]
+        if self.language_detection and '+' in self.tesseract_lang:
+            languages.extend(self.tesseract_lang.split('+'))
+        return languages
+    
+    def _page_pool_warm(self) -> Tuple[str, List[str]]:
+        """Engine and languages page workers load when they start (see _get_page_pool)"""
+        return self.ocr_engine, self._warm_languages()
+    
+    def warm_up_easyocr(self) -> str:
+        """
+        Load the EasyOCR models once and run them on a blank page
+        
+        Builds the reader of the configured languages and, with language
+        detection, the reader of each narrower list detection may pick, so no
+        reader is built cold at request time. EasyOCR pages are recognized in
+        the pipeline process (page workers only run Tesseract), so this is
+        the one place readers are loaded.
+        
+        Returns:
+            'ready', 'disabled', 'unavailable' or an error message
+        """
+        if not self.use_easyocr:
+            return 'disabled'
+        if not EASYOCR_AVAILABLE:
+            return 'unavailable'
+        try:
+            blank = np.full((32, 64), 255, dtype=np.uint8)
+            for languages in self._easyocr_language_sets():
+                get_easyocr_reader(languages).readtext(blank)
+            return 'ready'
+        except Exception as e:
+            return f"easyocr unavailable: {e}"
+    
+    def _easyocr_language_sets(self) -> List[Tuple[str, ...]]:
+        """EasyOCR language lists documents may be OCR'd with (configured, and each one detection may pick)"""
+        sets = [self.easyocr_languages]
+        if self.language_detection and len(self.easyocr_languages) > 1:
+            for lang in self.easyocr_languages:
+                narrowed = self._easyocr_narrowed([lang])
+                if narrowed not in sets:
+                    sets.append(narrowed)
+        return sets
     
-    def extract_from_pdf(self, file_path: str) -> str:
+    def _easyocr_narrowed(self, chosen: List[str]) -> Tuple[str, ...]:
+        """EasyOCR languages for the candidates detection chose"""
+        # English is compatible with every EasyOCR model: keep it for digits and codes
+        if 'en' in self.easyocr_languages and 'en' not in chosen:
+            chosen = ['en'] + chosen
+        return tuple(lang for lang in self.easyocr_languages if lang in chosen)
+    
+    def _document_languages(
+        self,
+        use_easyocr: bool,
+        stats: Dict[str, Any],
+        text: str = '',
+        sample: Optional[Callable[[], np.ndarray]] = None
+    ) -> Dict[str, Any]:
+        """
+        Choose the OCR languages of one document
+        
+        The text already read from the document (its text layer) decides when
+        it is long enough; otherwise a low resolution band of the first scanned
+        page is OCR'd with every configured language and decides.
+        
+        EasyOCR lists are narrowed the same way; the reader of every list
+        detection may pick is built at warm-up (see warm_up_easyocr).
+        
+        Args:
+            use_easyocr: The document is OCR'd with EasyOCR (else Tesseract)
+            stats: Stats dict (ocr_languages and ocr_language_source are recorded)
+            text: Text already read from the document
+            sample: Returns a grayscale sample of the first page to OCR
+            
+        Returns:
+            {'tesseract': language string, 'easyocr': language codes,
+             'source': 'configured', 'text_layer' or 'ocr_sample'}
         """
-        Extract text from PDF (handles both text-based and scanned PDFs)
+        languages = self._configured_languages()
+        use_easyocr = use_easyocr and EASYOCR_AVAILABLE
+        candidates = list(self.easyocr_languages) if use_easyocr else self.tesseract_lang.split('+')
+        
+        if self.language_detection and len(candidates) > 1:
+            chosen, source = select_languages(text, candidates), 'text_layer'
+            if chosen is None and sample is not None:
+                try:
+                    gray = sample()
+                    if use_easyocr:
+                        sample_text = get_easyocr_reader(self.easyocr_languages).readtext(gray)
+                    else:
+                        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+                        sample_text = self.engine.image_to_string(binary, dpi=LANGUAGE_SAMPLE_DPI)
+                    chosen, source = select_languages(sample_text, candidates), 'ocr_sample'
+                except Exception as e:
+                    print(f"Language detection failed: {e}")
+            if chosen:
+                if use_easyocr:
+                    languages['easyocr'] = self._easyocr_narrowed(chosen)
+                else:
+                    languages['tesseract'] = '+'.join(chosen)
+                languages['source'] = source
+        
+        stats['ocr_languages'] = '+'.join(languages['easyocr']) if use_easyocr else languages['tesseract']
+        stats['ocr_language_source'] = languages['source']
+        return languages
+    
+    def _configured_languages(self) -> Dict[str, Any]:
+        """Every configured language (see _document_languages)"""
+        return {'tesseract': self.tesseract_lang, 'easyocr': self.easyocr_languages, 'source': 'configured'}
+    
+    def extract_from_pdf(
+        self,
+        file_path: str,
+        stats: Optional[Dict[str, Any]] = None,
+        page_models: Optional[List[PageModel]] = None
+    ) -> str:
+        """
+        Extract text from PDF (handles text-based, scanned and mixed PDFs)
+        
+        Each page is planned on its own (see PagePlanner): text layer pages
+        are read with PyMuPDF (pdfplumber for pages whose text looks degraded),
+        scanned pages are OCR'd and blank pages skipped. Page texts are merged
+        in order.
         
         Args:
             file_path: Path to PDF file
+            stats: Optional dict filled with the method used, the fallbacks taken
+                   and the action chosen for each page
+            page_models: Optional list filled with the PageModel of each page
+                         with text, in page order (OCR'd pages then come from
+                         word-level OCR, in the same pass)
             
         Returns:
             Extracted text
         """
-        text_parts = []
+        stats = _init_stats(stats)
+        models: Optional[Dict[int, PageModel]] = {} if page_models is not None else None
         
-        # Try pdfplumber first (better for text-based PDFs)
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
+            plan = self.page_planner.plan(file_path)
         except Exception as e:
-            print(f"pdfplumber failed: {e}")
+            print(f"Page planning failed: {e}")
+            texts = self._text_layer_pages(file_path, None, stats, models)
+            if models is not None:
+                page_models.extend(models[page_num] for page_num in sorted(models))
+            return "\n\n".join(t for t in texts.values() if t.strip())
         
-        # If no text found, try PyMuPDF
-        if not text_parts:
-            try:
-                doc = fitz.open(file_path)
-                for page in doc:
-                    text = page.get_text()
-                    if text.strip():
-                        text_parts.append(text)
-                doc.close()
-            except Exception as e:
-                print(f"PyMuPDF failed: {e}")
+        stats['page_actions'] = [entry['action'] for entry in plan]
+        text_pages = [entry['page'] for entry in plan if entry['action'] == 'text']
+        ocr_pages = [entry['page'] for entry in plan if entry['action'] == 'ocr']
+        
+        page_texts: Dict[int, str] = {}
+        if text_pages:
+            page_texts.update(self._text_layer_pages(file_path, text_pages, stats, models))
+        if ocr_pages:
+            stats['fallbacks'].append('pymupdf->ocr')
+            languages = self._document_languages(
+                self.use_easyocr, stats,
+                text="\n".join(page_texts.values()),
+                sample=lambda: _pdf_language_sample(file_path, ocr_pages[0], self.profile)
+            )
+            texts = self._ocr_pdf_pages(
+                file_path, ocr_pages, use_easyocr=self.use_easyocr, stats=stats, models=models,
+                languages=languages
+            )
+            page_texts.update(zip(ocr_pages, texts))
+        
+        if text_pages and ocr_pages:
+            stats['method'] = 'mixed'
+        elif ocr_pages:
+            stats['method'] = 'ocr'
+        elif not text_pages:
+            stats['method'] = 'empty'
+        
+        if models is not None:
+            page_models.extend(
+                models[page_num] for page_num in sorted(models)
+                if page_num in page_texts and page_texts[page_num].strip()
+            )
+        return "\n\n".join(
+            page_texts[page_num] for page_num in sorted(page_texts) if page_texts[page_num].strip()
+        )
+    
+    def _text_layer_pages(
+        self,
+        file_path: str,
+        pages: Optional[List[int]],
+        stats: Dict[str, Any],
+        models: Optional[Dict[int, PageModel]] = None
+    ) -> Dict[int, str]:
+        """
+        Read the embedded text of some pages
+        
+        Uses PyMuPDF (many times faster), and pdfplumber for the pages where
+        PyMuPDF's text looks degraded (see _degraded_text): pdfplumber orders
+        characters by position, which repairs scrambled content streams. Long
+        PDFs are split into page ranges read in parallel on the page pool, each
+        worker opening the PDF itself.
         
-        # If still no text, it's likely a scanned PDF - use OCR
-        if not text_parts or all(not t.strip() for t in text_parts):
-            return self._ocr_pdf(file_path)
+        Args:
+            file_path: Path to PDF file
+            pages: Page numbers (0-based); None = every page
+            stats: Stats dict (method, fallbacks, pdfplumber_pages and
+                   text_layer_workers are recorded)
+            models: Optional dict filled with {page number: PageModel}, built
+                    in the same read as the text, by the reader that produced it
+            
+        Returns:
+            {page number: text}
+        """
+        readers: Dict[int, Tuple[str, str, Optional[PageModel]]] = {}
+        with_models = models is not None
+        try:
+            if pages is None:
+                doc = fitz.open(file_path)
+                try:
+                    pages = list(range(len(doc)))
+                finally:
+                    doc.close()
+            ranges = [
+                pages[start:start + TEXT_LAYER_RANGE_PAGES]
+                for start in range(0, len(pages), TEXT_LAYER_RANGE_PAGES)
+            ]
+            workers = min(self.page_workers, len(ranges))
+            stats['text_layer_workers'] = max(1, workers)
+            if workers > 1:
+                pool = _get_page_pool(self.page_workers, self._page_pool_warm())
+                futures = [
+                    pool.submit(_text_layer_range, file_path, page_range, with_models) for page_range in ranges
+                ]
+                try:
+                    for future in futures:
+                        readers.update(future.result())
+                finally:
+                    for future in futures:
+                        future.cancel()
+            else:
+                readers = _text_layer_range(file_path, pages, with_models)
+        except Exception as e:
+            # PyMuPDF cannot read the file: let pdfplumber try every page
+            print(f"PyMuPDF failed: {e}")
+            pdf = _open_pdfplumber(file_path)
+            if pdf is not None:
+                try:
+                    for page_num in (range(len(pdf.pages)) if pages is None else pages):
+                        readers[page_num] = (
+                            _pdfplumber_page_text(pdf, page_num), 'pdfplumber',
+                            _pdfplumber_page_model(pdf, page_num) if with_models else None
+                        )
+                finally:
+                    pdf.close()
         
-        return "\n\n".join(text_parts)
+        pdfplumber_pages = sum(1 for _, reader, _ in readers.values() if reader == 'pdfplumber')
+        stats['method'] = 'pdfplumber' if readers and pdfplumber_pages == len(readers) else 'pymupdf'
+        if pdfplumber_pages:
+            stats['fallbacks'].append('pymupdf->pdfplumber')
+            stats['pdfplumber_pages'] = pdfplumber_pages
+        if with_models:
+            models.update(
+                (page_num, model) for page_num, (_, _, model) in readers.items() if model is not None
+            )
+        return {page_num: text for page_num, (text, _, _) in readers.items()}
     
-    def _ocr_pdf(self, file_path: str, use_easyocr: bool = False) -> str:
+    def _ocr_pdf(
+        self,
+        file_path: str,
+        use_easyocr: bool = False,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         OCR a scanned PDF by converting pages to images
         
         Args:
             file_path: Path to PDF file
             use_easyocr: Use EasyOCR instead of Tesseract (better accuracy, slower)
+            stats: Optional dict filled with the OCR engine used and the fallbacks taken
             
         Returns:
             OCR'd text
         """
-        text_parts = []
+        stats = _init_stats(stats)
+        texts = self._ocr_pdf_pages(file_path, None, use_easyocr=use_easyocr, stats=stats)
+        return "\n\n".join(t for t in texts if t.strip())
+    
+    def _ocr_pdf_pages(
+        self,
+        file_path: str,
+        pages: Optional[List[int]],
+        use_easyocr: bool = False,
+        stats: Optional[Dict[str, Any]] = None,
+        models: Optional[Dict[int, PageModel]] = None,
+        languages: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        OCR some pages of a PDF
+        
+        Pages identical in the PDF source are OCR'd once; pages whose
+        preprocessed raster was already OCR'd (in this document, or in
+        another one while in the OCR cache) are not OCR'd again.
+        
+        Args:
+            file_path: Path to PDF file
+            pages: Page numbers (0-based); None = every page
+            use_easyocr: Use EasyOCR instead of Tesseract (better accuracy, slower)
+            stats: Optional dict filled with the OCR engine used and the fallbacks taken
+            models: Optional dict filled with {page number: PageModel}; pages are
+                    then OCR'd at word level (boxes and confidences kept)
+            languages: OCR languages (see _document_languages); None = chosen
+                       from a sample of the first page
+            
+        Returns:
+            Page texts, in the order of `pages`
+        """
+        stats = _init_stats(stats)
+        stats['method'] = 'ocr'
+        doc = fitz.open(file_path)
+        try:
+            if pages is None:
+                pages = list(range(len(doc)))
+            leaders = _duplicate_pages(doc, pages)
+        finally:
+            doc.close()
+        if languages is None:
+            languages = self._document_languages(
+                use_easyocr, stats, sample=lambda: _pdf_language_sample(file_path, pages[0], self.profile)
+            ) if pages else self._configured_languages()
+        unique_pages = [page_num for page_num in pages if leaders[page_num] == page_num]
+        stats['ocr_pages'] = len(pages)
+        stats['performance_profile'] = self.profile['name']
+        stats['ocr_duplicate_pages'] = len(pages) - len(unique_pages)
+        if self.ocr_cache is not None:
+            stats['ocr_cache'] = {'hits': 0, 'misses': 0}
         
+        texts = self._ocr_unique_pages(file_path, unique_pages, use_easyocr, stats, models, languages)
+        page_texts = dict(zip(unique_pages, texts))
+        if models is not None:
+            for page_num in pages:
+                if leaders[page_num] != page_num and leaders[page_num] in models:
+                    models[page_num] = _page_model_copy(models[leaders[page_num]], page_num)
+        return [page_texts.get(leaders[page_num], '') for page_num in pages]
+    
+    def _ocr_unique_pages(
+        self,
+        file_path: str,
+        pages: List[int],
+        use_easyocr: bool,
+        stats: Dict[str, Any],
+        models: Optional[Dict[int, PageModel]] = None,
+        languages: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """OCR pages with EasyOCR or Tesseract; returns texts in the order of `pages` (models filled if given)"""
+        languages = languages or self._configured_languages()
         # Use EasyOCR if available and requested (better for multi-language)
         if use_easyocr and EASYOCR_AVAILABLE:
             try:
-                # Initialize EasyOCR reader (English + Arabic for UAE documents)
-                # Specify languages explicitly to avoid warning
-                reader = easyocr.Reader(['en', 'ar'], gpu=False, verbose=False)
-                
-                doc = fitz.open(file_path)
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    # Convert page to image
-                    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    img_array = np.array(img)
-                    
-                    # EasyOCR
-                    results = reader.readtext(img_array, detail=0)
-                    page_text = '\n'.join(results)
-                    if page_text.strip():
-                        text_parts.append(page_text)
-                
-                doc.close()
-                return "\n\n".join(text_parts)
+                texts = self._easyocr_pages(file_path, pages, stats, models, languages)
+                stats['ocr_engine'] = 'easyocr'
+                return texts
             except Exception as e:
                 print(f"EasyOCR failed: {e}, falling back to Tesseract")
+                stats['fallbacks'].append('easyocr->tesseract')
+                for key in ('ocr_page_sources', 'ocr_megapixels'):
+                    stats.pop(key, None)
+                if self.ocr_cache is not None:
+                    stats['ocr_cache'] = {'hits': 0, 'misses': 0}
+                stats['ocr_languages'] = languages['tesseract']
         
         # Fallback to Tesseract
+        stats['ocr_engine'] = 'tesseract'
+        texts = [''] * len(pages)
+        lang = languages['tesseract']
         try:
-            doc = fitz.open(file_path)
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                # Convert page to image
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2x zoom for better quality
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                
-                # Preprocess image
-                img_array = np.array(img)
-                gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-                preprocessed = self.preprocessor.preprocess_image_from_array(gray)
-                
-                if preprocessed is not None:
-                    img = Image.fromarray(preprocessed)
-                
-                # OCR with Tesseract
-                page_text = pytesseract.image_to_string(img, lang='ita+eng')
-                if page_text.strip():
-                    text_parts.append(page_text)
-            
-            doc.close()
+            stats['tesseract_backend'] = get_engine(self.ocr_engine, lang).name
+            workers = min(self.page_workers, len(pages))
+            stats['ocr_page_workers'] = workers
+            if workers <= 1:
+                results = []
+                done_keys = set()
+                for page_num in pages:
+                    try:
+                        result = _ocr_page(
+                            file_path, page_num, lang, self.preprocessor, self.ocr_engine,
+                            self.profile, self.ocr_cache, done_keys, models is not None
+                        )
+                    except Exception as e:
+                        result = _failed_page(page_num, e)
+                    done_keys.add(result['key'])
+                    results.append(result)
+            else:
+                results = self._ocr_pages_parallel(file_path, pages, workers, models is not None, lang)
+            texts = _resolve_duplicates(results)
+            if models is not None:
+                models.update(_resolve_models(pages, results))
+            for result in results:
+                _record_ocr_page(stats, result)
         except Exception as e:
             print(f"OCR PDF failed: {e}")
         
-        return "\n\n".join(text_parts)
+        return texts
+    
+    def _easyocr_pages(
+        self,
+        file_path: str,
+        pages: List[int],
+        stats: Dict[str, Any],
+        models: Optional[Dict[int, PageModel]] = None,
+        languages: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        OCR pages with the shared EasyOCR reader, in batches
+        
+        Args:
+            models: Optional dict filled with {page number: PageModel} (detections kept)
+            languages: OCR languages (see _document_languages); None = configured
+        
+        Returns:
+            Page texts, in the order of `pages`
+        """
+        # Shared reader of this process (models loaded once, see warm_up_easyocr)
+        easyocr_languages = (languages or self._configured_languages())['easyocr']
+        reader = get_easyocr_reader(easyocr_languages)
+        cache = get_ocr_cache(self.ocr_cache)
+        lang = '+'.join(easyocr_languages)
+        detail = models is not None
+        backend = 'easyocr+words' if detail else 'easyocr'
+        results = []
+        
+        doc = fitz.open(file_path)
+        try:
+            for start in range(0, len(pages), EASYOCR_PAGE_BATCH):
+                # Convert a batch of pages to images
+                batch = []
+                images = []
+                for page_num in pages[start:start + EASYOCR_PAGE_BATCH]:
+                    gray, dpi, source = _page_raster(doc, page_num, self.profile)
+                    result = {
+                        'text': None,
+                        'source': source,
+                        'dpi': dpi,
+                        'pixels': gray.size,
+                        'key': raster_key(gray, backend, lang, dpi),
+                        'cache': None,
+                    }
+                    if any(done['key'] == result['key'] for done in results + batch):
+                        result['cache'] = 'duplicate'
+                    elif cache is not None:
+                        _set_page_output(result, cache.get(result['key']), page_num)
+                        result['cache'] = 'miss' if result['text'] is None else 'hit'
+                    if result['text'] is None and result['cache'] != 'duplicate':
+                        images.append(gray)
+                        result['page'] = page_num
+                        result['scale'] = 72 / dpi
+                    batch.append(result)
+                
+                # EasyOCR (batched inference over the pages)
+                pending = [result for result in batch if result['text'] is None and result['cache'] != 'duplicate']
+                for result, image, output in zip(pending, images, reader.readtext_pages(images, detail=detail)):
+                    if detail:
+                        output = PageModel.from_easyocr(
+                            output, result['page'], image.shape[1], image.shape[0],
+                            scale=result['scale'], unit='pt'
+                        )
+                    _set_page_output(result, output, result['page'])
+                    if cache is not None:
+                        cache.set(result['key'], output)
+                results.extend(batch)
+        finally:
+            doc.close()
+        
+        texts = _resolve_duplicates(results)
+        if models is not None:
+            models.update(_resolve_models(pages, results))
+        for result in results:
+            _record_ocr_page(stats, result)
+        return texts
+    
+    def _ocr_pages_parallel(
+        self,
+        file_path: str,
+        pages: List[int],
+        workers: int,
+        page_model: bool = False,
+        lang: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        OCR pages on the shared page pool, at most `workers` at a time for this document
+        
+        Pages are submitted as earlier ones finish, so a long scan never holds
+        more than its share of the pool and other documents get their turn.
+        Each page is told which rasters this document already OCR'd. A page
+        that fails (or whose worker dies) gets an empty text, not the others.
+        
+        Returns:
+            _ocr_page results, in the order of `pages`
+        """
+        pool = _get_page_pool(self.page_workers, self._page_pool_warm())
+        results: List[Dict[str, Any]] = [None] * len(pages)
+        done_keys = set()
+        next_index = 0
+        running = {}
+        try:
+            while next_index < len(pages) or running:
+                while next_index < len(pages) and len(running) < workers:
+                    future = pool.submit(
+                        _ocr_page, file_path, pages[next_index], lang or self.tesseract_lang, None, self.ocr_engine,
+                        self.profile, self.ocr_cache, frozenset(done_keys), page_model
+                    )
+                    running[future] = next_index
+                    next_index += 1
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = _failed_page(pages[index], e)
+                        if isinstance(e, BrokenProcessPool):
+                            pool = _reset_page_pool(pool)
+                    results[index] = result
+                    done_keys.add(result['key'])
+        finally:
+            for future in running:
+                future.cancel()
+        return results
     
-    def extract_from_image(self, file_path: str, use_easyocr: bool = False) -> str:
+    def extract_from_image(
+        self,
+        file_path: str,
+        use_easyocr: Optional[bool] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        page_models: Optional[List[PageModel]] = None
+    ) -> str:
         """
         Extract text from image file using OCR
         
         Args:
             file_path: Path to image file
-            use_easyocr: Use EasyOCR instead of Tesseract (better accuracy, slower)
+            use_easyocr: Use EasyOCR instead of Tesseract (better accuracy, slower);
+                         None = the extractor's default
+            stats: Optional dict filled with the OCR engine used and the fallbacks taken
+            page_models: Optional list the image's PageModel is appended to
+                         (coordinates in pixels of the original image)
             
         Returns:
             Extracted text
         """
+        stats = _init_stats(stats)
+        stats['method'] = 'image_ocr'
         # Use EasyOCR if available and requested
+        if use_easyocr is None:
+            use_easyocr = self.use_easyocr
+        languages = self._document_languages(use_easyocr, stats, sample=lambda: _image_language_sample(file_path))
         if use_easyocr and EASYOCR_AVAILABLE:
             try:
-                # Specify languages explicitly to avoid warning
-                reader = easyocr.Reader(['en', 'ar'], gpu=False, verbose=False)
-                results = reader.readtext(file_path, detail=0)
-                return '\n'.join(results)
+                reader = get_easyocr_reader(languages['easyocr'])
+                if page_models is None:
+                    text = reader.readtext(file_path)
+                else:
+                    width, height = Image.open(file_path).size
+                    model = PageModel.from_easyocr(reader.readtext(file_path, detail=True), 0, width, height)
+                    page_models.append(model)
+                    text = model.text()
+                stats['ocr_engine'] = 'easyocr'
+                return text
             except Exception as e:
                 print(f"EasyOCR failed: {e}, falling back to Tesseract")
+                stats['fallbacks'].append('easyocr->tesseract')
+                stats['ocr_languages'] = languages['tesseract']
         
         # Fallback to Tesseract
+        stats['ocr_engine'] = 'tesseract'
         try:
-            # Preprocess image
-            preprocessed = self.preprocessor.preprocess_image(file_path)
+            engine = get_engine(self.ocr_engine, languages['tesseract'])
+            stats['tesseract_backend'] = engine.name
+            stats['performance_profile'] = self.profile['name']
+            gray = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
+                gray = np.asarray(Image.open(file_path).convert('L'))
             
-            if preprocessed is not None:
-                img = Image.fromarray(preprocessed)
-            else:
-                img = Image.open(file_path)
+            # Scale to the profile's glyph height (the physical size of a photo is unknown)
+            scale = image_scale(
+                gray.shape[1], gray.shape[0], self.profile, glyph_height=estimate_glyph_height(gray)
+            )
+            gray = resize_image(gray, scale)
+            stats['ocr_megapixels'] = round(gray.size / 1e6, 2)
+            
+            # Preprocess image
+            quality = self.preprocessor.select_denoise_tier(
+                gray, max_tier=self.profile.get('max_denoise_tier')
+            )
+            stats['denoise_tiers'] = {quality['tier']: 1}
+            preprocessed = self.preprocessor.preprocess_image_from_array(gray, tier=quality['tier'])
+            if preprocessed is None:
+                preprocessed = gray
             
-            # OCR with Tesseract
-            text = pytesseract.image_to_string(img, lang='ita+eng')
-            return text
+            # OCR with Tesseract (at word level when a page model is wanted,
+            # boxes brought back to the original image's pixels)
+            if page_models is None:
+                return engine.image_to_string(preprocessed)
+            model = PageModel.from_ocr_words(
+                engine.image_to_data(preprocessed), 0, preprocessed.shape[1], preprocessed.shape[0],
+                scale=1 / scale, source='tesseract'
+            )
+            page_models.append(model)
+            return model.text()
         except Exception as e:
             print(f"OCR image failed: {e}")
             return ""
     
-    def extract(self, file_path: Union[str, Path]) -> str:
+    def extract(
+        self,
+        file_path: Union[str, Path],
+        stats: Optional[Dict[str, Any]] = None,
+        page_models: Optional[List[PageModel]] = None
+    ) -> str:
         """
         Main extraction method - auto-detects file type
         
         Args:
             file_path: Path to document file
+            stats: Optional dict filled with the extraction path taken:
+                   method ('pymupdf', 'pdfplumber', 'ocr', 'mixed', 'empty',
+                   'image_ocr'), page_actions (PDF: 'text', 'ocr' or 'skip' per page),
+                   pdfplumber_pages (text layer pages PyMuPDF read badly, read
+                   with pdfplumber), text_layer_workers (processes reading the
+                   text layer),
+                   ocr_engine ('tesseract', 'easyocr'), tesseract_backend
+                   ('tesserocr', 'pytesseract'), ocr_page_sources (OCR'd pages
+                   per raster source: embedded_image, render), performance_profile,
+                   ocr_megapixels (pixels OCR'd), denoise_tiers (OCR'd pages per
+                   denoise tier: none, median, nlmeans), ocr_duplicate_pages (pages
+                   repeating another page of the document, not OCR'd), ocr_failed_pages
+                   (pages whose OCR raised; they contribute no text), ocr_cache
+                   (page cache hits/misses), ocr_languages (languages OCR ran with),
+                   ocr_language_source ('configured', 'text_layer' or 'ocr_sample':
+                   what chose them) and fallbacks
+                   (e.g. ['pymupdf->pdfplumber', 'pymupdf->ocr'])
+            page_models: Optional list filled with a PageModel (words, boxes,
+                         line/block ids, confidences) per page with text, so
+                         later stages need not OCR or rasterize again
             
         Returns:
             Extracted and preprocessed text
@@ -188,11 +777,715 @@ class TextExtractor:
         ext = os.path.splitext(file_path)[1].lower()
         
         if ext == '.pdf':
-            text = self.extract_from_pdf(file_path)
+            text = self.extract_from_pdf(file_path, stats=stats, page_models=page_models)
         elif ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff']:
-            text = self.extract_from_image(file_path)
+            text = self.extract_from_image(file_path, stats=stats, page_models=page_models)
         else:
             raise ValueError(f"Unsupported file type: {ext}")
         
         # Preprocess extracted text
         return self.preprocessor.process(text)
+    
+    def iter_pages(
+        self,
+        file_path: Union[str, Path],
+        stats: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Extract a document page by page, yielding each page as soon as it is read
+        
+        PDF pages are planned one at a time (see PagePlanner) and yielded in
+        page order; with page_workers > 1, up to that many upcoming scanned
+        pages are OCR'd ahead of the consumer on the page pool. Closing the
+        generator early (e.g. once the document is classified) cancels the
+        OCR not yet started, so the pages after that point cost nothing.
+        
+        EasyOCR pages are not batched here: each is OCR'd alone, in this
+        thread, when the consumer reaches it (see _stream_ocr_page). extract()
+        batches them by EASYOCR_PAGE_BATCH instead.
+        
+        Args:
+            file_path: Path to document file
+            stats: Optional dict filled as by extract(), for the pages consumed
+                   so far, plus pages_read
+            
+        Yields:
+            (page number, raw page text) for every page with text; image
+            files are a single page 0. Join the texts and run
+            preprocessor.process() to get what extract() returns.
+        """
+        file_path = str(file_path)
+        stats = _init_stats(stats)
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff']:
+            text = self.extract_from_image(file_path, stats=stats)
+            stats['pages_read'] = 1
+            if text.strip():
+                yield 0, text
+            return
+        if ext != '.pdf':
+            raise ValueError(f"Unsupported file type: {ext}")
+        
+        stats['method'] = 'empty'
+        stats['page_actions'] = []
+        stats['pages_read'] = 0
+        doc = fitz.open(file_path)
+        plumber = _LazyPdfplumber(file_path)
+        pending = deque()           # Planned pages not yet yielded: (page, action, future or leader page)
+        leaders: Dict[str, int] = {}
+        ocr_texts: Dict[int, str] = {}
+        key_texts: Dict[str, str] = {}
+        read_texts: List[str] = []
+        languages = None            # Chosen on the first scanned page
+        language_stats: Dict[str, Any] = {}
+        workers = self.page_workers
+        pool = _get_page_pool(workers, self._page_pool_warm()) if workers > 1 else None
+        next_page = 0
+        try:
+            while next_page < len(doc) or pending:
+                # Plan (and start OCR of) up to `workers` pages ahead
+                while next_page < len(doc) and len(pending) < workers:
+                    page_num = next_page
+                    next_page += 1
+                    entry = self.page_planner.plan_page(doc[page_num])
+                    stats['page_actions'].append(entry['action'])
+                    if entry['action'] != 'ocr':
+                        pending.append((page_num, entry['action'], None))
+                        continue
+                    if languages is None:
+                        # Text read so far, and the text layer of text pages planned ahead
+                        known_text = read_texts + [
+                            doc[planned].get_text() for planned, planned_action, _ in pending
+                            if planned_action == 'text'
+                        ]
+                        languages = self._document_languages(
+                            self.use_easyocr, language_stats, text="\n".join(known_text),
+                            sample=lambda: _pdf_language_sample(file_path, page_num, self.profile)
+                        )
+                    fingerprint = source_fingerprints(doc, [page_num])[page_num]
+                    leader = leaders.setdefault(fingerprint, page_num)
+                    if leader != page_num:
+                        pending.append((page_num, 'duplicate', leader))
+                    elif pool is not None and not (self.use_easyocr and EASYOCR_AVAILABLE):
+                        task = (
+                            _ocr_page, file_path, page_num, languages['tesseract'], None, self.ocr_engine,
+                            self.profile, self.ocr_cache, frozenset(key_texts)
+                        )
+                        try:
+                            future = pool.submit(*task)
+                        except BrokenProcessPool:
+                            pool = _reset_page_pool(pool)
+                            future = pool.submit(*task)
+                        pending.append((page_num, 'ocr', future))
+                    else:
+                        pending.append((page_num, 'ocr', None))
+                
+                page_num, action, value = pending.popleft()
+                if action in ('ocr', 'duplicate'):
+                    if 'ocr_pages' not in stats:
+                        self._start_streamed_ocr(stats, languages, language_stats)
+                    stats['ocr_pages'] += 1
+                if action == 'skip':
+                    text = ''
+                elif action == 'text':
+                    text = self._stream_text_page(plumber, doc, page_num, stats)
+                elif action == 'duplicate':
+                    text = ocr_texts.get(value, '')
+                    stats['ocr_duplicate_pages'] += 1
+                else:
+                    text = self._stream_ocr_page(file_path, page_num, value, key_texts, stats, languages)
+                    ocr_texts[page_num] = text
+                stats['pages_read'] += 1
+                if text.strip():
+                    read_texts.append(text)
+                    yield page_num, text
+        finally:
+            for _, action, value in pending:
+                if value is not None and action == 'ocr':
+                    value.cancel()
+            plumber.close()
+            doc.close()
+            # Report the pages consumed, not those planned ahead
+            del stats['page_actions'][stats['pages_read']:]
+            actions = set(stats['page_actions'])
+            if 'text' in actions and 'ocr' in actions:
+                stats['method'] = 'mixed'
+            elif 'ocr' in actions:
+                stats['method'] = 'ocr'
+    
+    def _start_streamed_ocr(
+        self,
+        stats: Dict[str, Any],
+        languages: Dict[str, Any],
+        language_stats: Dict[str, Any]
+    ) -> None:
+        """Set up the OCR stats of a streamed PDF on its first scanned page"""
+        stats['fallbacks'].append('pymupdf->ocr')
+        stats.update(language_stats)
+        stats['ocr_pages'] = 0
+        stats['ocr_duplicate_pages'] = 0
+        stats['performance_profile'] = self.profile['name']
+        if self.ocr_cache is not None:
+            stats['ocr_cache'] = {'hits': 0, 'misses': 0}
+        if self.use_easyocr and EASYOCR_AVAILABLE:
+            stats['ocr_engine'] = 'easyocr'
+        else:
+            stats['ocr_engine'] = 'tesseract'
+            stats['tesseract_backend'] = get_engine(self.ocr_engine, languages['tesseract']).name
+            stats['ocr_page_workers'] = self.page_workers
+    
+    def _stream_text_page(
+        self,
+        plumber: "_LazyPdfplumber",
+        doc: "fitz.Document",
+        page_num: int,
+        stats: Dict[str, Any]
+    ) -> str:
+        """Embedded text of one page: PyMuPDF, or pdfplumber when PyMuPDF's text looks degraded"""
+        text, reader, _ = _native_page_text(doc[page_num], plumber)
+        if stats['method'] == 'empty':
+            stats['method'] = 'pymupdf'
+        if reader == 'pdfplumber':
+            if 'pymupdf->pdfplumber' not in stats['fallbacks']:
+                stats['fallbacks'].append('pymupdf->pdfplumber')
+            stats['pdfplumber_pages'] = stats.get('pdfplumber_pages', 0) + 1
+        return text
+    
+    def _stream_ocr_page(
+        self,
+        file_path: str,
+        page_num: int,
+        future,
+        key_texts: Dict[str, str],
+        stats: Dict[str, Any],
+        languages: Dict[str, Any]
+    ) -> str:
+        """
+        Text of one streamed scanned page: from its page pool future, or OCR'd now
+        
+        With EasyOCR the page is OCR'd now, as a batch of one: reading ahead
+        would spend inference on pages an early exit may never need, so the
+        batched inference of _easyocr_pages only pays off in extract().
+        
+        Args:
+            future: Page pool future of the page (None = OCR in this thread)
+            key_texts: {raster key: text} of the pages OCR'd so far (updated)
+            languages: OCR languages of the document (see _document_languages)
+        """
+        if stats['ocr_engine'] == 'easyocr':
+            try:
+                return self._easyocr_pages(file_path, [page_num], stats, languages=languages)[0]
+            except Exception as e:
+                print(f"EasyOCR failed: {e}, falling back to Tesseract")
+                stats['fallbacks'].append('easyocr->tesseract')
+                stats['ocr_engine'] = 'tesseract'
+                stats['tesseract_backend'] = get_engine(self.ocr_engine, languages['tesseract']).name
+                stats['ocr_languages'] = languages['tesseract']
+        try:
+            if future is not None:
+                result = future.result()
+            else:
+                result = _ocr_page(
+                    file_path, page_num, languages['tesseract'], self.preprocessor, self.ocr_engine,
+                    self.profile, self.ocr_cache, set(key_texts)
+                )
+        except Exception as e:
+            _record_ocr_page(stats, _failed_page(page_num, e))
+            return ''
+        if result['cache'] == 'duplicate':
+            result['text'] = key_texts.get(result['key'], '')
+        else:
+            key_texts[result['key']] = result['text']
+        _record_ocr_page(stats, result)
+        return result['text']
+
+
+def _ocr_page(
+    file_path: str,
+    page_num: int,
+    lang: str,
+    preprocessor: Optional[DocumentPreprocessor] = None,
+    engine: str = 'auto',
+    profile: Optional[Dict[str, Any]] = None,
+    cache_options: Optional[Dict[str, Any]] = None,
+    known_keys: Optional[set] = None,
+    page_model: bool = False
+) -> Dict[str, Any]:
+    """
+    Rasterize, preprocess and OCR one PDF page
+    
+    Module-level so it can run in page pool workers (which open the PDF
+    themselves and keep their own engine and OCR cache, resolved from
+    their name and options).
+    
+    Args:
+        known_keys: Raster keys already OCR'd in this document; a page
+                    matching one is not OCR'd (text None, cache 'duplicate')
+        page_model: OCR at word level and return the page's PageModel (in
+                    points) under 'model'; the text is derived from it
+    
+    Returns:
+        {'text', 'source' ('embedded_image' or 'render'), 'dpi', 'pixels',
+         'denoise_tier' ('none', 'median' or 'nlmeans'), 'key' (raster key),
+         'cache' ('hit', 'miss', 'duplicate' or None when caching is off)}
+    """
+    global _page_preprocessor
+    if preprocessor is None:
+        if _page_preprocessor is None:
+            _page_preprocessor = DocumentPreprocessor()
+        preprocessor = _page_preprocessor
+    
+    doc = fitz.open(file_path)
+    try:
+        profile = profile or get_profile()
+        gray, dpi, source = _page_raster(doc, page_num, profile)
+    finally:
+        doc.close()
+    
+    # Preprocess image (into this thread's reusable page buffer), denoising
+    # only as much as the page's noise level calls for
+    quality = preprocessor.select_denoise_tier(gray, max_tier=profile.get('max_denoise_tier'))
+    preprocessed = preprocessor.preprocess_image_from_array(
+        gray, out=_work_buffer(gray.shape), tier=quality['tier']
+    )
+    
+    if preprocessed is None:
+        preprocessed = gray
+    
+    ocr_engine = get_engine(engine, lang)
+    result = {
+        'text': None,
+        'source': source,
+        'dpi': dpi,
+        'pixels': gray.size,
+        'denoise_tier': quality['tier'],
+        'key': raster_key(preprocessed, ocr_engine.name + ('+words' if page_model else ''), lang, dpi),
+        'cache': None,
+    }
+    if known_keys and result['key'] in known_keys:
+        result['cache'] = 'duplicate'
+        return result
+    
+    cache = get_ocr_cache(cache_options)
+    if cache is not None:
+        _set_page_output(result, cache.get(result['key']), page_num)
+        result['cache'] = 'miss' if result['text'] is None else 'hit'
+    
+    # OCR with Tesseract
+    if result['text'] is None:
+        if page_model:
+            output = PageModel.from_ocr_words(
+                ocr_engine.image_to_data(preprocessed, dpi=dpi), page_num,
+                preprocessed.shape[1], preprocessed.shape[0], scale=72 / dpi, unit='pt'
+            )
+        else:
+            output = ocr_engine.image_to_string(preprocessed, dpi=dpi)
+        _set_page_output(result, output, page_num)
+        if cache is not None:
+            cache.set(result['key'], output)
+    return result
+
+
+def _page_raster(
+    doc: "fitz.Document",
+    page_num: int,
+    profile: Dict[str, Any]
+) -> Tuple[np.ndarray, int, str]:
+    """
+    Grayscale image of a PDF page for OCR, at the profile's resolution
+    
+    Scanned pages holding a single full-page image use that image (resampled
+    only when its native resolution is far from the profile's target dpi);
+    other pages are rendered at the target dpi. The profile's pixel cap
+    applies to both. Rendered pages are returned as a view of the grayscale
+    pixmap (no copy).
+    
+    Returns:
+        (grayscale array, dpi, source: 'embedded_image' or 'render')
+    """
+    page = doc[page_num]
+    embedded = _embedded_page_image(doc, page)
+    if embedded is not None:
+        gray, dpi = embedded
+        scale = image_scale(gray.shape[1], gray.shape[0], profile, dpi=dpi)
+        return resize_image(gray, scale), int(round(dpi * scale)), 'embedded_image'
+    
+    # Render page straight to grayscale
+    zoom = render_zoom(page.rect.width, page.rect.height, profile)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+    return _pixmap_array(pix), int(round(72 * zoom)), 'render'
+
+
+def _embedded_page_image(doc: "fitz.Document", page: "fitz.Page") -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Decode the image of a single-image scanned page straight to grayscale
+    
+    Only pages showing exactly one upright, opaque image over (nearly) the
+    whole page and nothing else qualify; anything else (text or vector
+    content drawn over the scan, several images, masks, rotated or inverted
+    placement) returns None and is rendered, so the overlay is OCR'd too.
+    
+    Returns:
+        (grayscale array at native resolution, dpi) or None
+    """
+    if page.rotation:
+        return None
+    infos = page.get_image_info(xrefs=True)
+    if len(infos) != 1:
+        return None
+    info = infos[0]
+    xref = info.get('xref')
+    if not xref or info.get('has-mask'):
+        return None  # Inline image or transparency
+    a, b, c, d = info['transform'][:4]
+    if b or c or a <= 0 or d <= 0:
+        return None  # Rotated or flipped placement
+    bbox = fitz.Rect(info['bbox']) & page.rect
+    if bbox.is_empty or abs(bbox) < EMBEDDED_IMAGE_MIN_COVERAGE * abs(page.rect):
+        return None
+    if doc.xref_get_key(xref, 'ImageMask')[1] == 'true' or doc.xref_get_key(xref, 'Decode')[0] != 'null':
+        return None  # Stencil masks and remapped (e.g. inverted) samples
+    if page.get_text('text').strip() or page.get_drawings():
+        return None  # Text layer or vector overlay (stamps, filled-in fields)
+    
+    gray = None
+    raw = doc.extract_image(xref)
+    if raw and raw.get('ext') in ('jpeg', 'jpg', 'png'):
+        # libjpeg decodes the luminance channel only, no RGB buffer
+        gray = cv2.imdecode(np.frombuffer(raw['image'], dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        # Other encodings (JBIG2, CCITT, JPX, Flate...): let MuPDF decode them
+        pix = fitz.Pixmap(doc, xref)
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)
+        if pix.n != 1:
+            pix = fitz.Pixmap(fitz.csGRAY, pix)
+        gray = _pixmap_array(pix)
+    
+    dpi = int(round(gray.shape[1] * 72 / bbox.width))
+    return gray, dpi
+
+
+def _pdf_language_sample(file_path: str, page_num: int, profile: Dict[str, Any]) -> np.ndarray:
+    """Low resolution band of a PDF page, for language detection"""
+    sample_profile = {**profile, 'target_dpi': LANGUAGE_SAMPLE_DPI, 'max_upscale': 1.0}
+    doc = fitz.open(file_path)
+    try:
+        gray, _, _ = _page_raster(doc, page_num, sample_profile)
+    finally:
+        doc.close()
+    return _language_band(gray)
+
+
+def _image_language_sample(file_path: str) -> np.ndarray:
+    """Band of an image file decoded at half resolution, for language detection"""
+    gray = cv2.imread(file_path, cv2.IMREAD_REDUCED_GRAYSCALE_2)
+    if gray is None:
+        image = Image.open(file_path).convert('L')
+        image.thumbnail((image.width // 2 or 1, image.height // 2 or 1))
+        gray = np.asarray(image)
+    return _language_band(gray)
+
+
+def _language_band(gray: np.ndarray) -> np.ndarray:
+    """Horizontal band of a page (LANGUAGE_SAMPLE_BAND), as a contiguous copy"""
+    top, bottom = LANGUAGE_SAMPLE_BAND
+    return np.ascontiguousarray(gray[int(gray.shape[0] * top):int(gray.shape[0] * bottom)])
+
+
+def _init_page_worker(ocr_engine: str = 'auto', languages: Sequence[str] = ()) -> None:
+    """
+    Start a page worker: Tesseract single-threaded (page workers already run
+    in parallel) and the engines of `languages` loaded before the first page
+    """
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    try:
+        _warm_engines(ocr_engine, languages)
+    except Exception as e:
+        print(f"⚠️  Page worker warm-up failed: {e}")
+
+
+def _warm_engines(ocr_engine: str, languages: Sequence[str]) -> None:
+    """OCR a blank image with this process' engine of each language string (loads the traineddata)"""
+    blank = np.full((32, 64), 255, dtype=np.uint8)
+    for lang in languages:
+        get_engine(ocr_engine, lang).image_to_string(blank)
+
+
+def _get_page_pool(workers: int, warm: Tuple[str, Sequence[str]] = ('auto', ())) -> ProcessPoolExecutor:
+    """
+    Return the process-wide page pool, creating it on first use
+    
+    Args:
+        workers: Worker processes
+        warm: (OCR engine, Tesseract language strings) each worker loads when it starts
+    """
+    global _page_pool, _page_pool_workers, _page_pool_warm
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool_workers = workers
+            _page_pool_warm = (warm[0], tuple(warm[1]))
+            _page_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_page_worker,
+                initargs=_page_pool_warm
+            )
+        return _page_pool
+
+
+def _reset_page_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """
+    Replace a page pool broken by a dead worker (e.g. killed for memory)
+    
+    A broken pool rejects every later submission, so without this one bad
+    page would disable parallel OCR for the life of the process.
+    """
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            _page_pool = None
+    return _get_page_pool(_page_pool_workers, _page_pool_warm)
+
+
+class _PixmapBuffer:
+    """Exposes a pixmap's samples to numpy and keeps the pixmap alive while viewed"""
+    
+    def __init__(self, pix: "fitz.Pixmap"):
+        self.pix = pix
+        self.__array_interface__ = {
+            'shape': (pix.height, pix.width) if pix.n == 1 else (pix.height, pix.width, pix.n),
+            'strides': (pix.stride, pix.n) if pix.n == 1 else (pix.stride, pix.n, 1),
+            'typestr': '|u1',
+            'data': (pix.samples_ptr, True),  # Read-only
+            'version': 3,
+        }
+
+
+def _pixmap_array(pix: "fitz.Pixmap") -> np.ndarray:
+    """Zero-copy uint8 array view of a pixmap's samples"""
+    return np.asarray(_PixmapBuffer(pix))
+
+
+def _work_buffer(shape: Tuple[int, ...]) -> np.ndarray:
+    """This thread's scratch page array, reallocated only when the page size changes"""
+    buffer = getattr(_page_buffers, 'work', None)
+    if buffer is None or buffer.shape != shape:
+        buffer = np.empty(shape, dtype=np.uint8)
+        _page_buffers.work = buffer
+    return buffer
+
+
+def _duplicate_pages(doc: "fitz.Document", pages: List[int]) -> Dict[int, int]:
+    """Map every page to the first of `pages` with the same source fingerprint"""
+    first: Dict[str, int] = {}
+    leaders = {}
+    for page_num, fingerprint in source_fingerprints(doc, pages).items():
+        leaders[page_num] = first.setdefault(fingerprint, page_num)
+    return leaders
+
+
+def _resolve_duplicates(results: List[Dict[str, Any]]) -> List[str]:
+    """Texts of page results, duplicates taking the text of the page they repeat"""
+    by_key = {result['key']: result['text'] for result in results if result['cache'] != 'duplicate'}
+    return [
+        by_key.get(result['key'], '') if result['cache'] == 'duplicate' else result['text']
+        for result in results
+    ]
+
+
+def _set_page_output(result: Dict[str, Any], output: Union[str, PageModel, None], page_num: int) -> None:
+    """Store an OCR output (text, or page model and its text) in a page result"""
+    if isinstance(output, PageModel):
+        output.page = page_num  # Cached models may come from another document
+        result['model'] = output
+        result['text'] = output.text()
+    else:
+        result['text'] = output
+
+
+def _resolve_models(pages: List[int], results: List[Dict[str, Any]]) -> Dict[int, PageModel]:
+    """Page models of page results, duplicates getting a copy of the model of the page they repeat"""
+    by_key = {result['key']: result['model'] for result in results if result.get('model') is not None}
+    models = {}
+    for page_num, result in zip(pages, results):
+        model = by_key.get(result['key'])
+        if model is not None:
+            models[page_num] = model if result.get('model') is model else _page_model_copy(model, page_num)
+    return models
+
+
+def _page_model_copy(model: PageModel, page_num: int) -> PageModel:
+    """Shallow copy of a page model (arrays shared) for another page"""
+    duplicate = copy.copy(model)
+    duplicate.page = page_num
+    return duplicate
+
+
+def _failed_page(page_num: int, error: Exception) -> Dict[str, Any]:
+    """_ocr_page result of a page whose OCR raised: empty text, counted in ocr_failed_pages"""
+    print(f"OCR page {page_num + 1} failed: {error}")
+    return {'text': '', 'key': f'failed:{page_num}', 'cache': None, 'error': str(error)}
+
+
+def _record_ocr_page(stats: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Count an OCR'd page by raster source, denoise tier and cache outcome, and add up its pixels"""
+    if 'error' in result:
+        stats['ocr_failed_pages'] = stats.get('ocr_failed_pages', 0) + 1
+        return
+    sources = stats.setdefault('ocr_page_sources', {})
+    sources[result['source']] = sources.get(result['source'], 0) + 1
+    stats['ocr_megapixels'] = round(stats.get('ocr_megapixels', 0.0) + result['pixels'] / 1e6, 2)
+    if 'denoise_tier' in result:
+        tiers = stats.setdefault('denoise_tiers', {})
+        tiers[result['denoise_tier']] = tiers.get(result['denoise_tier'], 0) + 1
+    outcome = result.get('cache')
+    if outcome == 'duplicate':
+        stats['ocr_duplicate_pages'] = stats.get('ocr_duplicate_pages', 0) + 1
+    elif outcome is not None:
+        cache_stats = stats.setdefault('ocr_cache', {'hits': 0, 'misses': 0})
+        cache_stats['hits' if outcome == 'hit' else 'misses'] += 1
+
+
+def _open_pdfplumber(file_path: str):
+    """Open a PDF with pdfplumber (None if it cannot be parsed)"""
+    try:
+        return pdfplumber.open(file_path)
+    except Exception as e:
+        print(f"pdfplumber failed: {e}")
+        return None
+
+
+def _pdfplumber_page_text(pdf, page_num: int) -> str:
+    """Text of one page read by pdfplumber ('' if it fails)"""
+    try:
+        return pdf.pages[page_num].extract_text() or ''
+    except Exception as e:
+        print(f"pdfplumber failed on page {page_num + 1}: {e}")
+        return ''
+
+
+def _pdfplumber_page_model(pdf, page_num: int) -> Optional[PageModel]:
+    """Page model of the words pdfplumber reads on one page (None if it fails)"""
+    try:
+        return PageModel.from_pdfplumber(pdf.pages[page_num], page_num)
+    except Exception as e:
+        print(f"pdfplumber failed on page {page_num + 1}: {e}")
+        return None
+
+
+class _LazyPdfplumber:
+    """A PDF opened with pdfplumber on first need (most documents never need it)"""
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._pdf = None
+        self._opened = False
+    
+    def get(self):
+        """The open pdfplumber PDF, or None if it cannot be parsed"""
+        if not self._opened:
+            self._pdf = _open_pdfplumber(self.file_path)
+            self._opened = True
+        return self._pdf
+    
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+
+def _text_layer_range(
+    file_path: str,
+    pages: List[int],
+    with_models: bool = False
+) -> Dict[int, Tuple[str, str, Optional[PageModel]]]:
+    """
+    Read the embedded text of a range of pages (see TextExtractor._text_layer_pages)
+    
+    Module-level so it can run in page pool workers, which open the PDF themselves.
+    
+    Returns:
+        {page number: (text, reader: 'pymupdf' or 'pdfplumber', PageModel or None)}
+    """
+    texts = {}
+    doc = fitz.open(file_path)
+    plumber = _LazyPdfplumber(file_path)
+    try:
+        for page_num in pages:
+            texts[page_num] = _native_page_text(doc[page_num], plumber, with_models)
+    finally:
+        plumber.close()
+        doc.close()
+    return texts
+
+
+def _native_page_text(
+    page: "fitz.Page",
+    plumber: _LazyPdfplumber,
+    with_model: bool = False
+) -> Tuple[str, str, Optional[PageModel]]:
+    """
+    Embedded text of one page: PyMuPDF, or pdfplumber when PyMuPDF's text looks degraded
+    
+    The page model, when asked for, comes from the same read as the text:
+    PyMuPDF's blocks and words share one TextPage, and pages repaired by
+    pdfplumber get the words pdfplumber read.
+    
+    Returns:
+        (text, reader: 'pymupdf' or 'pdfplumber', PageModel or None)
+    """
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_BLOCKS)
+    blocks = [block for block in page.get_text('blocks', textpage=textpage) if block[6] == 0]  # Text blocks, in stream order
+    text = '\n'.join(block[4] for block in blocks)
+    if _degraded_text(blocks, text) is not None:
+        pdf = plumber.get()
+        if pdf is not None:
+            repaired = _pdfplumber_page_text(pdf, page.number)
+            if repaired.strip():
+                return repaired, 'pdfplumber', _pdfplumber_page_model(pdf, page.number) if with_model else None
+    return text, 'pymupdf', PageModel.from_pymupdf(page, textpage) if with_model else None
+
+
+def _degraded_text(blocks: List[tuple], text: str) -> Optional[str]:
+    """
+    Why PyMuPDF's text of a page looks unusable, if it does
+    
+    - empty: nothing extracted
+    - unmapped_glyphs: characters without a Unicode mapping (U+FFFD)
+    - fragmented: most lines hold one or two characters (text drawn glyph by glyph)
+    - reading_order: the content stream jumps back up the page within a
+      column at most block transitions (blocks drawn out of order)
+    
+    Args:
+        blocks: PyMuPDF text blocks (x0, y0, x1, y1, text, block_no, type), in stream order
+        text: Their text
+    
+    Returns:
+        Reason, or None when the text looks fine
+    """
+    if not text.strip():
+        return 'empty'
+    if text.count('\ufffd') > 0.01 * len(text):
+        return 'unmapped_glyphs'
+    lines = [line for line in text.split('\n') if line.strip()]
+    if len(lines) >= 20 and sum(1 for line in lines if len(line.strip()) <= 2) > 0.5 * len(lines):
+        return 'fragmented'
+    if len(blocks) >= 4:
+        backward = 0
+        for previous, current in zip(blocks, blocks[1:]):
+            same_column = current[0] < previous[2] and previous[0] < current[2]
+            if same_column and current[1] < previous[1] - 2:
+                backward += 1
+        if backward > 0.3 * (len(blocks) - 1):
+            return 'reading_order'
+    return None
+
+
+def _init_stats(stats: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the caller's stats dict (or a throwaway one) with the fallback list set up"""
+    if stats is None:
+        stats = {}
+    stats.setdefault('fallbacks', [])
+    return stats
@@ -0,0 +1,112 @@
+"""
+OCR Cache - Page-level OCR reuse within and across documents
+
+The same pages come back over and over (an issuer's boilerplate terms in
+every contract, scans holding two copies of one page). OCR results are
+cached by a fingerprint of the preprocessed page raster plus everything
+else that shapes the output (engine backend, languages, dpi, pipeline
+version), in a ResultCache under its own namespace: per-process LRU memory
+tier, optionally spilling to the shared SQLite file.
+
+Within a document, duplicates are found before any OCR:
+- byte-identical pages (same content stream, resources and image pixels)
+  by a source fingerprint computed without rasterizing
+- pages whose preprocessed rasters are identical by their fingerprint
+  (denoising and binarization absorb re-encoding noise)
+Near-but-not-identical pages are never merged: a changed digit in an
+amount must be read, not copied. So two scans of the same page that differ
+even slightly after preprocessing (a second pass through the scanner, a
+shifted crop, a stamp) are both OCR'd; there is no perceptual hash.
+"""
+
+from typing import Dict, Any, Optional, List
+import hashlib
+import json
+import threading
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from . import __version__
+from .result_cache import ResultCache
+
+OCR_CACHE_NAMESPACE = "ocr_pages"
+
+# Cache of this process, by its options
+_caches: Dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_ocr_cache(options: Optional[Dict[str, Any]]) -> Optional[ResultCache]:
+    """
+    Return this process' OCR cache for a set of options, creating it on first use
+
+    Args:
+        options: ResultCache arguments (max_entries, max_bytes, ttl_seconds,
+                 disk_path, disk_max_entries); None = caching disabled
+
+    Returns:
+        Shared ResultCache, or None
+    """
+    if options is None:
+        return None
+    signature = json.dumps(options, sort_keys=True)
+    with _caches_lock:
+        cache = _caches.get(signature)
+        if cache is None:
+            cache = ResultCache(namespace=OCR_CACHE_NAMESPACE, **options)
+            _caches[signature] = cache
+        return cache
+
+
+def raster_key(raster: np.ndarray, engine: str, lang: str, dpi: Optional[int] = None) -> str:
+    """
+    Fingerprint of a preprocessed page raster and the OCR settings applied to it
+
+    Args:
+        raster: Preprocessed page (what the OCR engine receives)
+        engine: Engine backend ('tesserocr', 'pytesseract', 'easyocr')
+        lang: Language set
+        dpi: Resolution passed to the engine
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(json.dumps([raster.shape, str(raster.dtype), engine, lang, dpi, __version__]).encode('utf-8'))
+    digest.update(np.ascontiguousarray(raster).data)
+    return digest.hexdigest()
+
+
+def source_fingerprints(doc: "fitz.Document", pages: List[int]) -> Dict[int, str]:
+    """
+    Fingerprint pages from their PDF source, without rendering them
+
+    Two pages with the same content stream and resources, showing images
+    with the same pixels at the same places, look identical. The content
+    stream alone says little: scanners write every page as the same
+    "draw /Img0 full page" stream, each page's /Img0 being another image.
+
+    Returns:
+        {page number: hex digest}
+    """
+    fingerprints = {}
+    for page_num in pages:
+        page = doc[page_num]
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(json.dumps([tuple(page.rect), page.rotation]).encode('utf-8'))
+        digest.update(page.read_contents())
+        digest.update(_page_resources(doc, page).encode('utf-8'))
+        for info in page.get_image_info(hashes=True, xrefs=True):
+            digest.update(info.get('digest') or b'')
+            digest.update(json.dumps([round(v, 2) for v in info['bbox']]).encode('utf-8'))
+        fingerprints[page_num] = digest.hexdigest()
+    return fingerprints
+
+
+def _page_resources(doc: "fitz.Document", page: "fitz.Page") -> str:
+    """Source of a page's resource dictionary (fonts, images, forms it draws by name)"""
+    kind, value = doc.xref_get_key(page.xref, 'Resources')
+    if kind == 'xref':
+        return doc.xref_object(int(value.split()[0]), compressed=True)
+    return value
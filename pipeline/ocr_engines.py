@@ -0,0 +1,342 @@
+"""
+OCR Engines - Tesseract backends used by TextExtractor
+
+- tesserocr: binds libtesseract in-process. Initialized API handles (with
+  their traineddata loaded) are kept per thread and reused, and the raw
+  grayscale buffer is passed directly, so a page costs about its recognition
+  time.
+- pytesseract: runs the `tesseract` binary per call (writes a temp image,
+  reloads traineddata). Always available; used as fallback.
+
+EasyOCR readers (detection + recognition models, hundreds of MB) are pooled
+the same way: loaded once per process and language set, then shared.
+"""
+
+from typing import Dict, Any, Optional, Union, List, Sequence
+import importlib.util
+import threading
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+from .page_model import WORD_COLUMNS
+
+# tesserocr is optional (in-process Tesseract). It is imported on first use:
+# loading libtesseract reads OMP_THREAD_LIMIT, which page pool workers only
+# set in their initializer, after this module has been imported.
+TESSEROCR_AVAILABLE = importlib.util.find_spec('tesserocr') is not None
+
+# Try to import EasyOCR (optional, better OCR for Arabic/English documents)
+try:
+    import easyocr
+    EASYOCR_AVAILABLE = True
+except ImportError:
+    EASYOCR_AVAILABLE = False
+    easyocr = None
+
+ENGINE_NAMES = ('auto', 'tesserocr', 'pytesseract')
+
+# Engines of this process, by (backend, lang)
+_engines: Dict[tuple, Any] = {}
+_engines_lock = threading.Lock()
+
+
+def _to_gray_array(image: Union[np.ndarray, Image.Image]) -> np.ndarray:
+    """Return a C-contiguous 8-bit grayscale array"""
+    if isinstance(image, Image.Image):
+        image = np.asarray(image.convert('L'))
+    elif image.ndim == 3:
+        image = np.asarray(Image.fromarray(image).convert('L'))
+    if image.dtype != np.uint8:
+        image = image.astype(np.uint8)
+    return np.ascontiguousarray(image)
+
+
+class PytesseractEngine:
+    """Tesseract through the command line binary (one process per call)"""
+
+    name = 'pytesseract'
+
+    def __init__(self, lang: str):
+        self.lang = lang
+
+    def get_languages(self) -> list:
+        """Installed Tesseract languages"""
+        return pytesseract.get_languages(config='')
+
+    def image_to_string(self, image: Union[np.ndarray, Image.Image], dpi: Optional[int] = None) -> str:
+        """
+        OCR one image
+
+        Args:
+            image: Grayscale/RGB array or PIL image
+            dpi: Source resolution, if known
+
+        Returns:
+            Recognized text
+        """
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        config = f'--dpi {dpi}' if dpi else ''
+        return pytesseract.image_to_string(image, lang=self.lang, config=config)
+
+    def image_to_data(self, image: Union[np.ndarray, Image.Image], dpi: Optional[int] = None) -> Dict[str, list]:
+        """
+        OCR one image, keeping its words' boxes and confidences
+
+        Returns:
+            Word columns (see page_model.WORD_COLUMNS), lines and blocks
+            numbered in reading order across the page
+        """
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        config = f'--dpi {dpi}' if dpi else ''
+        raw = pytesseract.image_to_data(image, lang=self.lang, config=config, output_type=pytesseract.Output.DICT)
+        data = {column: [] for column in WORD_COLUMNS}
+        blocks: Dict[int, int] = {}
+        lines: Dict[tuple, int] = {}
+        for i, word in enumerate(raw['text']):
+            if raw['level'][i] != 5 or not word.strip():
+                continue
+            data['text'].append(word)
+            for column in ('left', 'top', 'width', 'height'):
+                data[column].append(int(raw[column][i]))
+            data['conf'].append(float(raw['conf'][i]))
+            data['block_num'].append(blocks.setdefault(raw['block_num'][i], len(blocks)))
+            line = (raw['block_num'][i], raw['par_num'][i], raw['line_num'][i])
+            data['line_num'].append(lines.setdefault(line, len(lines)))
+        return data
+
+
+class TesserocrEngine:
+    """
+    Tesseract through libtesseract, one initialized handle per thread
+
+    Handles are created on first use in each thread (page pool workers,
+    stage threads) and kept for the life of the process.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, lang: str):
+        """
+        Initialize engine (loads the language data once, in the calling thread)
+
+        Raises:
+            RuntimeError: If tesserocr is missing or the languages cannot be loaded
+        """
+        if not TESSEROCR_AVAILABLE:
+            raise RuntimeError("tesserocr not available")
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self._local = threading.local()
+        self._api()  # Fail now (e.g. missing traineddata) rather than on the first page
+
+    def _api(self):
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = self._tesserocr.PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+        return api
+
+    def get_languages(self) -> list:
+        """Installed Tesseract languages"""
+        return self._tesserocr.get_languages()[1]
+
+    def image_to_string(self, image: Union[np.ndarray, Image.Image], dpi: Optional[int] = None) -> str:
+        """
+        OCR one image
+
+        Args:
+            image: Grayscale/RGB array or PIL image (passed as a raw 8-bit buffer)
+            dpi: Source resolution, if known
+
+        Returns:
+            Recognized text
+        """
+        gray = _to_gray_array(image)
+        height, width = gray.shape
+        api = self._api()
+        api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+        if dpi:
+            api.SetSourceResolution(dpi)
+        try:
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+    def image_to_data(self, image: Union[np.ndarray, Image.Image], dpi: Optional[int] = None) -> Dict[str, list]:
+        """
+        OCR one image, keeping its words' boxes and confidences
+
+        Returns:
+            Word columns (see page_model.WORD_COLUMNS), lines and blocks
+            numbered in reading order across the page
+        """
+        tesserocr = self._tesserocr
+        gray = _to_gray_array(image)
+        height, width = gray.shape
+        api = self._api()
+        api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+        if dpi:
+            api.SetSourceResolution(dpi)
+        data = {column: [] for column in WORD_COLUMNS}
+        try:
+            api.Recognize()
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+            block = line = -1
+            for word_iterator in tesserocr.iterate_level(iterator, tesserocr.RIL.WORD):
+                if word_iterator.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block += 1
+                if word_iterator.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line += 1
+                word = word_iterator.GetUTF8Text(tesserocr.RIL.WORD)
+                box = word_iterator.BoundingBox(tesserocr.RIL.WORD)
+                if not word or not word.strip() or box is None:
+                    continue
+                x0, y0, x1, y1 = box
+                data['text'].append(word)
+                data['left'].append(x0)
+                data['top'].append(y0)
+                data['width'].append(x1 - x0)
+                data['height'].append(y1 - y0)
+                data['conf'].append(float(word_iterator.Confidence(tesserocr.RIL.WORD)))
+                data['block_num'].append(max(block, 0))
+                data['line_num'].append(max(line, 0))
+            return data
+        finally:
+            api.Clear()
+
+
+def get_engine(name: str = 'auto', lang: str = 'ita+eng'):
+    """
+    Return this process' OCR engine for a backend and language set
+
+    Args:
+        name: 'auto' (tesserocr if usable, else pytesseract), 'tesserocr' or 'pytesseract'
+        lang: Tesseract language string (e.g. 'ita+eng')
+
+    Returns:
+        Engine with image_to_string(image, dpi=None) and image_to_data(image, dpi=None)
+    """
+    backend = 'pytesseract' if name == 'pytesseract' else 'tesserocr'
+    if name not in ENGINE_NAMES:
+        print(f"⚠️  Unknown OCR engine '{name}', using auto")
+    key = (backend, lang)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            if backend == 'tesserocr':
+                try:
+                    engine = TesserocrEngine(lang)
+                except Exception as e:
+                    if name == 'tesserocr':
+                        print(f"⚠️  tesserocr unavailable ({e}), falling back to pytesseract. Install with: pip install tesserocr")
+                    engine = PytesseractEngine(lang)
+            else:
+                engine = PytesseractEngine(lang)
+            _engines[key] = engine
+        return engine
+
+
+class EasyOCRReader:
+    """
+    A loaded easyocr.Reader and the lock serializing its use
+
+    Inference already spreads over the torch threads, so documents of
+    different stage threads take turns instead of loading more copies of
+    the models.
+    """
+
+    def __init__(self, languages: Sequence[str], gpu: bool = False):
+        if not EASYOCR_AVAILABLE:
+            raise RuntimeError("EasyOCR not available. Install with: pip install easyocr")
+        self.languages = tuple(languages)
+        self.reader = easyocr.Reader(list(self.languages), gpu=gpu, verbose=False)
+        self._lock = threading.Lock()
+
+    def readtext(self, image: Union[str, np.ndarray], detail: bool = False) -> Union[str, list]:
+        """
+        OCR one image (path or array)
+
+        Args:
+            image: Image path or array
+            detail: Return the detections (box, text, confidence) instead of the text
+
+        Returns:
+            Recognized lines joined by newlines, or the detections
+        """
+        with self._lock:
+            if detail:
+                return self.reader.readtext(image, detail=1)
+            return '\n'.join(self.reader.readtext(image, detail=0))
+
+    def readtext_pages(
+        self,
+        pages: List[np.ndarray],
+        batch_size: int = 8,
+        detail: bool = False
+    ) -> List[Union[str, list]]:
+        """
+        OCR several page images with batched inference
+
+        Pages with the same dimensions (usually every page of a document)
+        go through detection together, and their text boxes through
+        recognition in batches of `batch_size`.
+
+        Args:
+            pages: Page images (grayscale or RGB arrays)
+            batch_size: Recognition batch size
+            detail: Return each page's detections (box, text, confidence) instead of its text
+
+        Returns:
+            Page texts (or detections) in input order
+        """
+        texts = [''] * len(pages)
+        level = 1 if detail else 0
+        by_shape: Dict[tuple, List[int]] = {}
+        for i, page in enumerate(pages):
+            by_shape.setdefault(page.shape, []).append(i)
+        with self._lock:
+            for indexes in by_shape.values():
+                if len(indexes) == 1:
+                    results = [self.reader.readtext(pages[indexes[0]], detail=level, batch_size=batch_size)]
+                else:
+                    results = self.reader.readtext_batched(
+                        [pages[i] for i in indexes], detail=level, batch_size=batch_size
+                    )
+                for i, lines in zip(indexes, results):
+                    texts[i] = lines if detail else '\n'.join(lines)
+        return texts
+
+
+# EasyOCR readers of this process, by (languages, gpu)
+_easyocr_readers: Dict[tuple, EasyOCRReader] = {}
+_easyocr_lock = threading.Lock()
+
+
+def get_easyocr_reader(languages: Sequence[str] = ('en', 'ar'), gpu: bool = False) -> EasyOCRReader:
+    """
+    Return this process' EasyOCR reader for a language set, loading it on first use
+
+    Args:
+        languages: EasyOCR language codes (order does not matter)
+        gpu: Run on GPU
+
+    Returns:
+        Shared EasyOCRReader
+
+    Raises:
+        RuntimeError: If EasyOCR is not installed
+    """
+    key = (tuple(sorted(languages)), gpu)
+    with _easyocr_lock:
+        reader = _easyocr_readers.get(key)
+        if reader is None:
+            reader = EasyOCRReader(languages, gpu=gpu)
+            _easyocr_readers[key] = reader
+        return reader
@@ -2,14 +2,16 @@
 Main orchestrator for the document processing pipeline
 """
 
-from typing import Union, Dict, Any, Optional
+from typing import Union, Dict, Any, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 import hashlib
 import json
+import time
 
 from .ocr import TextExtractor
 from .classifier import DocumentClassifier
-from .family_classifier import FamilyClassifier, DocumentFamily
+from .family_classifier import FamilyClassifier, DocumentFamily, DocumentSubtype
 from .policy_resolver import PolicyResolver, CertificationPolicy
 from .role_inference import RoleInferenceEngine, Role
 from .claim_extractor import ClaimExtractor
@@ -25,6 +27,17 @@ from .compliance_scorer import ComplianceScorer
 from .anomaly_detector import AnomalyDetector
 from .table_extractor import TableExtractor  # NEW: Professional table extraction
 from .document_parser import DocumentParser  # NEW: Intelligent document structure parsing
+from .metrics import StageTimer
+from .serialization import dumps_json
+
+
+class StageFailed(Exception):
+    """
+    Raised by a stage whose failure makes the rest of the document pointless
+    
+    _run_stage_graph stops at once: stages depending on it and stages not
+    started yet are skipped, stages already running are abandoned.
+    """
 
 
 class DocumentPipeline:
@@ -42,10 +55,58 @@ class DocumentPipeline:
     Key insight: CertiFi certifies POLICIES, not documents
     """
     
+    # Tasks whose answer depends on the certification decision (anomalies,
+    # hashes and certification flags are computed for them)
+    CERTIFICATION_TASKS = ['extract', 'claims', 'holder', 'compliance_score']
+    
+    # Default tasks if none (or none known) are requested
+    DEFAULT_TASKS = ['classify', 'extract', 'claims']
+    
+    # Stage graph, in execution order:
+    # - inputs: stages whose output this stage reads
+    # - tasks: requested tasks that consume this stage's output directly
+    # A stage runs only if a requested task needs it, directly or as an input
+    # of another stage that runs.
+    STAGE_GRAPH = {
+        'text_extraction': {'inputs': [], 'tasks': []},
+        'layout_analysis': {'inputs': ['text_extraction'], 'tasks': ['layout']},
+        'vision_analysis': {'inputs': [], 'tasks': ['vision']},
+        'family_classification': {'inputs': ['text_extraction'], 'tasks': ['classify']},
+        'claim_evaluation': {'inputs': ['family_classification'], 'tasks': []},
+        'policy_resolution': {'inputs': ['family_classification', 'claim_evaluation'], 'tasks': []},
+        'document_structure': {'inputs': ['policy_resolution'], 'tasks': ['structure']},
+        'table_extraction': {'inputs': ['policy_resolution'], 'tasks': ['tables']},
+        'role_inference': {'inputs': ['policy_resolution'], 'tasks': []},
+        'claim_extraction': {'inputs': ['role_inference', 'table_extraction'], 'tasks': ['claims']},
+        'information_extraction': {'inputs': ['policy_resolution'], 'tasks': ['extract']},
+        'decision': {'inputs': ['claim_evaluation', 'information_extraction'], 'tasks': CERTIFICATION_TASKS},
+        'holder_extraction': {'inputs': ['claim_extraction'], 'tasks': ['holder']},
+        'compliance_score': {'inputs': ['decision'], 'tasks': ['compliance_score']},
+        'anomaly_detection': {'inputs': ['decision', 'claim_extraction'], 'tasks': CERTIFICATION_TASKS},
+        'hashing': {'inputs': ['decision', 'claim_extraction'], 'tasks': CERTIFICATION_TASKS},
+    }
+    
+    # Expensive stages that also need the resolved family to call for them
+    # (PolicyResolver.stage_plan), unless requested explicitly ('structure', 'tables')
+    POLICY_GATED_STAGES = ['document_structure', 'table_extraction']
+    
+    # Pipeline stages in execution order (reported to progress callbacks)
+    STAGES = list(STAGE_GRAPH)
+    
     def __init__(
         self,
         use_llm: bool = False,
-        llm_provider: str = "openai"
+        llm_provider: str = "openai",
+        stage_concurrency: int = 4,
+        ocr_page_workers: int = 1,
+        ocr_engine: str = "auto",
+        use_easyocr: bool = False,
+        easyocr_languages: Optional[list] = None,
+        performance_profile: str = "balanced",
+        ocr_cache: Optional[Dict[str, Any]] = None,
+        classify_early_exit: Optional[float] = 0.85,
+        tesseract_lang: str = "ita+eng",
+        ocr_language_detection: Optional[bool] = None
     ):
         """
         Initialize pipeline
@@ -53,8 +114,34 @@ class DocumentPipeline:
         Args:
             use_llm: Whether to use LLM for classification/extraction
             llm_provider: LLM provider ('openai' or 'anthropic')
+            stage_concurrency: Independent stages (text, layout and vision; document
+                               structure and tables) run at once per document (1 = sequential)
+            ocr_page_workers: Pages of a scanned PDF OCR'd in parallel (1 = sequential)
+            ocr_engine: Tesseract backend ('auto', 'tesserocr' or 'pytesseract')
+            use_easyocr: OCR scanned documents with EasyOCR (Tesseract as fallback)
+            easyocr_languages: EasyOCR language codes (default English + Arabic)
+            performance_profile: OCR resolution policy ('fast', 'balanced' or 'accurate')
+            ocr_cache: Page OCR cache options (see TextExtractor); None = no cache
+            classify_early_exit: Family confidence at which classification-only requests
+                                 stop reading pages (the subtype must be known too);
+                                 None = always read the whole document
+            tesseract_lang: Tesseract languages documents may be in
+            ocr_language_detection: OCR each document with only the languages it shows
+                                    evidence of (None = the performance profile's setting)
         """
-        self.text_extractor = TextExtractor()
+        self.classify_early_exit = classify_early_exit
+        self.stage_concurrency = max(1, stage_concurrency)
+        self._stage_executor: Optional[ThreadPoolExecutor] = None  # Created on first use
+        self.text_extractor = TextExtractor(
+            page_workers=ocr_page_workers,
+            ocr_engine=ocr_engine,
+            use_easyocr=use_easyocr,
+            easyocr_languages=easyocr_languages or ('en', 'ar'),
+            performance_profile=performance_profile,
+            ocr_cache=ocr_cache,
+            tesseract_lang=tesseract_lang,
+            language_detection=ocr_language_detection
+        )
         self.layout_analyzer = LayoutAnalyzer()  # NEW: Layout analysis
         self.vision_analyzer = VisionAnalyzer()  # NEW: Vision analysis
         self.table_extractor = TableExtractor()  # NEW: Professional table extraction (Camelot)
@@ -72,12 +159,246 @@ class DocumentPipeline:
         self.compliance_scorer = ComplianceScorer()  # NEW: Compliance scoring
         self.anomaly_detector = AnomalyDetector()  # NEW: Anomaly detection
     
+    def close(self) -> None:
+        """Shut down the stage thread pool (waits for running stages)"""
+        if self._stage_executor is not None:
+            self._stage_executor.shutdown(wait=True, cancel_futures=True)
+            self._stage_executor = None
+    
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Load heavy dependencies ahead of the first document
+        
+        Touches spaCy, Tesseract languages, EasyOCR models (when enabled) and
+        Camelot so that the first request does not pay their initialization cost.
+        
+        Returns:
+            Status per component ('ready', 'unavailable' or an error message)
+        """
+        return {
+            'text_extractor': self.text_extractor.warm_up(),
+            'easyocr': self.text_extractor.warm_up_easyocr(),
+            'table_extractor': self.table_extractor.warm_up(),
+            'claim_extractor': self.claim_extractor.warm_up(),
+        }
+    
+    @classmethod
+    def plan_stages(cls, requested_tasks: Optional[list] = None) -> list:
+        """
+        Resolve the stages needed for a set of requested tasks
+        
+        Args:
+            requested_tasks: Tasks (classify, extract, claims, holder, compliance_score,
+                             layout, vision). None, or no known task, means DEFAULT_TASKS.
+            
+        Returns:
+            Stage names in execution order
+        """
+        tasks = {t.strip().lower() for t in (requested_tasks or []) if t and t.strip()}
+        needed = [name for name, spec in cls.STAGE_GRAPH.items() if tasks.intersection(spec['tasks'])]
+        if not needed:
+            return cls.plan_stages(cls.DEFAULT_TASKS)
+        
+        planned = set()
+        while needed:
+            name = needed.pop()
+            if name not in planned:
+                planned.add(name)
+                needed.extend(cls.STAGE_GRAPH[name]['inputs'])
+        return [name for name in cls.STAGES if name in planned]
+    
+    def _run_stage_graph(
+        self,
+        stages: Dict[str, Callable[[Dict[str, Any]], Any]],
+        stage_timer: StageTimer
+    ) -> Dict[str, Any]:
+        """
+        Run a group of stages, each as soon as its inputs (per STAGE_GRAPH) are done
+        
+        With stage_concurrency > 1 ready stages run concurrently on the stage
+        thread pool; otherwise they run one after another in STAGES order.
+        
+        A stage raising StageFailed ends the group at once: stages not started
+        are skipped and stages still running are abandoned (they must return
+        their output rather than write the result). Any other exception waits
+        for running stages first.
+        
+        Args:
+            stages: Stage name -> callable receiving the outputs of finished stages
+            stage_timer: Timer recording each stage's duration
+            
+        Returns:
+            Stage name -> return value
+            
+        Raises:
+            StageFailed: Re-raised from the failing stage
+        """
+        outputs: Dict[str, Any] = {}
+        order = [name for name in self.STAGES if name in stages]
+        stage_timer.close()  # The sequential stage before the group ends here
+        
+        if self.stage_concurrency <= 1 or len(order) <= 1:
+            for name in order:
+                stage_timer.notify(name)
+                outputs[name], seconds = _timed(stages[name], outputs)
+                stage_timer.record(name, seconds)
+            return outputs
+        
+        if self._stage_executor is None:
+            self._stage_executor = ThreadPoolExecutor(
+                max_workers=self.stage_concurrency, thread_name_prefix='pipeline-stage'
+            )
+        pending = list(order)
+        running = {}
+        abandon = False
+        try:
+            while pending or running:
+                ready = [
+                    name for name in pending
+                    if all(dep in outputs or dep not in stages for dep in self.STAGE_GRAPH[name]['inputs'])
+                ]
+                for name in ready:
+                    pending.remove(name)
+                    stage_timer.notify(name)
+                    running[self._stage_executor.submit(_timed, stages[name], dict(outputs))] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name], seconds = future.result()
+                    except StageFailed:
+                        abandon = True
+                        raise
+                    stage_timer.record(name, seconds)
+        finally:
+            if abandon:
+                for future in running:
+                    future.cancel()  # Only stops stages still queued on the pool
+            else:
+                # On failure, let stages already started finish before the result is returned
+                wait(running)
+        return outputs
+    
+    @classmethod
+    def describe_plan(cls, requested_tasks: Optional[list] = None) -> Dict[str, Any]:
+        """
+        Stage plan per document family (and subtype override) for a set of tasks
+        
+        Args:
+            requested_tasks: Tasks, as for process()
+            
+        Returns:
+            Requested tasks, task-driven stages, and the stages that run per family
+        """
+        if requested_tasks is None:
+            requested_tasks = list(cls.DEFAULT_TASKS)
+        plan = cls.plan_stages(requested_tasks)
+        resolver = PolicyResolver()
+        
+        def family_stages(structure_stages: list) -> list:
+            return [
+                name for name in plan
+                if name not in cls.POLICY_GATED_STAGES
+                or name in structure_stages
+                or cls._explicitly_requested(name, requested_tasks)
+            ]
+        
+        families = {}
+        for family in DocumentFamily:
+            if family == DocumentFamily.UNKNOWN:
+                continue
+            policy_config = PolicyResolver.FAMILY_POLICIES[family]
+            families[family.value] = {
+                'policy': policy_config['default_policy'].value,
+                'requires_extraction': policy_config['requires_extraction'],
+                'structure_stages': resolver.stage_plan(family)['structure_stages'],
+                'stages': family_stages(resolver.stage_plan(family)['structure_stages'])
+            }
+        subtypes = {
+            subtype.value: {
+                'structure_stages': stages,
+                'stages': family_stages(stages)
+            }
+            for subtype, stages in PolicyResolver.SUBTYPE_STRUCTURE_STAGES.items()
+        }
+        return {
+            'requested_tasks': list(requested_tasks),
+            'stages': plan,
+            'families': families,
+            'subtype_overrides': subtypes
+        }
+    
+    @classmethod
+    def _explicitly_requested(cls, stage: str, requested_tasks: list) -> bool:
+        """True if a requested task consumes the stage directly (not only through another stage)"""
+        tasks = {t.strip().lower() for t in requested_tasks if t}
+        return bool(tasks.intersection(cls.STAGE_GRAPH[stage]['tasks']))
+    
+    def _plan_complete(self, plan: list, stage: str) -> bool:
+        """True if no planned stage comes after `stage`"""
+        position = self.STAGES.index(stage)
+        return not any(self.STAGES.index(name) > position for name in plan)
+    
+    def _streams_classification(self, plan: list) -> bool:
+        """True if the text is only read to classify it, so reading may stop once classified"""
+        return (
+            self.classify_early_exit is not None
+            and 'text_extraction' in plan
+            and set(plan) <= {'text_extraction', 'family_classification'}
+        )
+    
+    def _extract_until_classified(
+        self,
+        file_path: Union[str, Path],
+        stats: Dict[str, Any]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Read a document page by page, classifying the text read so far after each page
+        
+        Stops at the first page where the family is known with at least
+        classify_early_exit confidence and the subtype is known, so a long
+        scanned annex is not OCR'd to the end only to learn it is a contract.
+        
+        Args:
+            file_path: Path to document file
+            stats: Text extraction stats (see TextExtractor.iter_pages), plus
+                   early_exit (reading stopped before the last page)
+            
+        Returns:
+            (preprocessed text read, classification of that text or None if no text)
+        """
+        page_texts = []
+        text = ''
+        classification = None
+        stats['early_exit'] = False
+        pages = self.text_extractor.iter_pages(file_path, stats=stats)
+        try:
+            for _, page_text in pages:
+                page_texts.append(page_text)
+                text = self.text_extractor.preprocessor.process("\n\n".join(page_texts))
+                if len(text.strip()) < 10:
+                    continue
+                classification = self.family_classifier.classify(text)
+                subtype = classification.get('subtype')
+                if (
+                    classification['family'] != DocumentFamily.UNKNOWN
+                    and classification['confidence'] >= self.classify_early_exit
+                    and subtype is not None and subtype != DocumentSubtype.UNKNOWN
+                ):
+                    stats['early_exit'] = True
+                    break
+        finally:
+            pages.close()  # Cancels the OCR of pages read ahead
+        return text, classification
+    
     def process(
         self,
         file_path: Union[str, Path],
         document_type: Optional[str] = None,
         certification_profile: Optional[CertificationProfile] = None,
-        requested_tasks: Optional[list] = None
+        requested_tasks: Optional[list] = None,
+        file_digest: Optional[str] = None,
+        progress_callback: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Process a document through the full pipeline
@@ -88,14 +409,20 @@ class DocumentPipeline:
             file_path: Path to document file
             document_type: Optional document type (if known, skips classification)
             certification_profile: Optional certification profile
-            requested_tasks: Optional list of tasks to perform (classify, extract, claims, holder, compliance_score)
+            requested_tasks: Optional list of tasks to perform (classify, extract, claims, holder,
+                             compliance_score, layout, vision); only the stages they need run
+                             (see STAGE_GRAPH and plan_stages)
+            file_digest: Optional hex SHA-256 of the file, if already computed (e.g. during upload)
+            progress_callback: Optional callable invoked with each stage name (see STAGES) as it starts
+                               (stages skipped for the requested tasks are not reported)
             
         Returns:
             Complete processing result with extracted data and metadata
         """
         # Default tasks if not specified
         if requested_tasks is None:
-            requested_tasks = ["classify", "extract", "claims"]
+            requested_tasks = list(self.DEFAULT_TASKS)
+        plan = self.plan_stages(requested_tasks)
         
         result = {
             'success': False,
@@ -104,35 +431,55 @@ class DocumentPipeline:
             'validation': None,
             'certification_ready': False,
             'human_review_required': True,
-            'metadata': {},
+            'metadata': {'stage_plan': plan},
             'errors': []
         }
         
+        stage_timer = StageTimer(progress_callback)
+        
         try:
-            # STEP 1: OCR - Extract text
-            text = self.text_extractor.extract(str(file_path))
-            if not text or len(text.strip()) < 10:
-                result['errors'].append("Failed to extract text or text too short")
-                return result
+            # STEPS 1-3 read the file independently of one another (only layout
+            # needs the text), so they run as a graph on the stage thread pool
+            # By-products of text extraction: the classification of the text while
+            # it was read (when only classifying) and the page models (for layout
+            # and the MRZ of ID documents)
+            extraction = {}
             
-            result['metadata']['text_length'] = len(text)
-            result['metadata']['text_preview'] = text[:200] + "..." if len(text) > 200 else text
+            def extract_text(outputs):
+                # STEP 1: OCR - Extract text
+                text_stats = {}
+                if self._streams_classification(plan):
+                    text, extraction['classification'] = self._extract_until_classified(file_path, text_stats)
+                elif 'layout_analysis' in plan or 'information_extraction' in plan:
+                    extraction['page_models'] = []
+                    text = self.text_extractor.extract(
+                        str(file_path), stats=text_stats, page_models=extraction['page_models']
+                    )
+                else:
+                    text = self.text_extractor.extract(str(file_path), stats=text_stats)
+                result['metadata']['text_extraction'] = text_stats
+                if not text or len(text.strip()) < 10:
+                    raise StageFailed("Failed to extract text or text too short")
+                return text
             
-            # STEP 2: Layout Analysis
-            if "classify" in requested_tasks or "extract" in requested_tasks:
-                layout_result = self.layout_analyzer.analyze(text, str(file_path))
-                result['metadata']['layout_analysis'] = layout_result
+            def analyze_layout(outputs):
+                # STEP 2: Layout Analysis (metadata only, nothing downstream reads it)
+                text = outputs.get('text_extraction')
+                if text and len(text.strip()) >= 10:
+                    result['metadata']['layout_analysis'] = self.layout_analyzer.analyze(
+                        text, str(file_path), page_models=extraction.get('page_models')
+                    )
             
-            # STEP 2.5: Document Structure Parsing (if available)
-            if "extract" in requested_tasks and self.document_parser.available:
+            def parse_structure(outputs):
+                # STEP 5.5a: Document Structure Parsing (if available)
                 try:
                     doc_structure = self.document_parser.parse(str(file_path))
                     result['metadata']['document_structure'] = doc_structure
                 except Exception as e:
                     result['metadata']['document_structure_error'] = str(e)
             
-            # STEP 2.6: Table Extraction (if available, for compensation tables)
-            if "extract" in requested_tasks and self.table_extractor.available:
+            def extract_tables(outputs):
+                # STEP 5.5b: Table Extraction (if available, for compensation tables)
                 try:
                     tables = self.table_extractor.extract_tables(str(file_path))
                     if tables:
@@ -152,13 +499,39 @@ class DocumentPipeline:
                 except Exception as e:
                     result['metadata']['table_extraction_error'] = str(e)
             
-            # STEP 3: Vision Analysis (if requested)
-            if "vision" in requested_tasks or "classify" in requested_tasks:
-                vision_result = self.vision_analyzer.analyze(str(file_path))
-                result['metadata']['vision_analysis'] = vision_result
+            def analyze_vision(outputs):
+                # STEP 3: Vision Analysis (if requested); returned, not stored, as it
+                # may be abandoned if text extraction fails meanwhile
+                return self.vision_analyzer.analyze(str(file_path))
+            
+            front_stages = {
+                'text_extraction': extract_text,
+                'layout_analysis': analyze_layout,
+                'vision_analysis': analyze_vision,
+            }
+            try:
+                outputs = self._run_stage_graph(
+                    {name: fn for name, fn in front_stages.items() if name in plan},
+                    stage_timer
+                )
+            except StageFailed as e:
+                result['errors'].append(str(e))
+                return result
+            if 'vision_analysis' in outputs:
+                result['metadata']['vision_analysis'] = outputs['vision_analysis']
+            
+            text = outputs.get('text_extraction')
+            if 'text_extraction' in plan:
+                result['metadata']['text_length'] = len(text)
+                result['metadata']['text_preview'] = text[:200] + "..." if len(text) > 200 else text
+            
+            if self._plan_complete(plan, 'vision_analysis'):
+                result['success'] = len(result['errors']) == 0
+                return result
             
             # STEP 4: Classify FAMILY (LEVEL 1 - KEY CLASSIFIER) + SUBTYPE (LEVEL 2)
-            family_result = self.family_classifier.classify(text)
+            stage_timer.enter('family_classification')
+            family_result = extraction.get('classification') or self.family_classifier.classify(text)
             document_family = family_result['family']
             document_subtype = family_result.get('subtype')  # NEW: Multi-level classification
             family_confidence = family_result['confidence']
@@ -177,7 +550,13 @@ class DocumentPipeline:
                 result['human_review_required'] = True
                 return result
             
+            # Classification-only requests stop here
+            if self._plan_complete(plan, 'family_classification'):
+                result['success'] = len(result['errors']) == 0
+                return result
+            
             # STEP 5: Evaluate CLAIMS FIRST (before policy resolution)
+            stage_timer.enter('claim_evaluation')
             # CRITICAL: Always evaluate claims, regardless of family classification
             # This allows us to override family classification if claims are strong
             claim_evaluation = self.claim_evaluator.evaluate(text, document_family.value)
@@ -214,6 +593,7 @@ class DocumentPipeline:
             is_semantic = document_family in [DocumentFamily.CONTRACT, DocumentFamily.CERTIFICATE, DocumentFamily.FINANCIAL, DocumentFamily.CORPORATE]
             
             # Resolve policy (with claim-based flag for semantic docs)
+            stage_timer.enter('policy_resolution')
             policy_decision = self.policy_resolver.resolve(
                 family=document_family,
                 family_confidence=family_confidence,
@@ -255,7 +635,31 @@ class DocumentPipeline:
                     result['errors'].append(f"Document family {document_family.value} not certifiable: {policy_decision.get('reason', 'unknown')}")
                     return result
             
+            # STEP 5.5: Structure stages (Unstructured, Camelot) - now that the family
+            # is known, only where a downstream consumer reads them
+            family_stage_plan = self.policy_resolver.stage_plan(document_family, result.get('document_subtype'))
+            result['metadata']['family_stage_plan'] = family_stage_plan
+            structure_stages = {
+                'document_structure': parse_structure if self.document_parser.available else None,
+                'table_extraction': extract_tables if self.table_extractor.available else None,
+            }
+            self._run_stage_graph(
+                {
+                    name: fn for name, fn in structure_stages.items()
+                    if fn is not None and name in plan and (
+                        name in family_stage_plan['structure_stages']
+                        or self._explicitly_requested(name, requested_tasks)
+                    )
+                },
+                stage_timer
+            )
+            
+            if self._plan_complete(plan, 'table_extraction'):
+                result['success'] = len(result['errors']) == 0
+                return result
+            
             # STEP 6: Infer ROLE (NEW - for claim-based certification)
+            stage_timer.enter('role_inference')
             role_result = self.role_inference.infer(text, document_family.value)
             result['inferred_role'] = role_result['role'].value
             result['metadata']['role_inference'] = {
@@ -266,6 +670,7 @@ class DocumentPipeline:
             }
             
             # STEP 7: Extract CLAIM (NEW - the certifiable statement)
+            stage_timer.enter('claim_extraction')
             # Use compensation table data if available (more accurate than text extraction)
             compensation_table_data = result.get('metadata', {}).get('compensation_table')
             # Pass document_subtype (e.g., "professional_services_agreement") for better extraction
@@ -281,6 +686,7 @@ class DocumentPipeline:
             result['metadata']['claim_statement'] = self.claim_extractor.format_claim(claim)
             
             # STEP 8: Extract information (ONLY if policy requires it)
+            stage_timer.enter('information_extraction')
             extracted_schema = None
             if policy_decision['requires_extraction']:
                 # Map family to document type for extraction
@@ -295,7 +701,9 @@ class DocumentPipeline:
                 
                 doc_type = family_to_type.get(document_family, 'unknown')
                 if doc_type != 'unknown':
-                    extracted_schema = self.extractor.extract(text, doc_type)
+                    extracted_schema = self.extractor.extract(
+                        text, doc_type, page_models=extraction.get('page_models')
+                    )
                     result['data'] = extracted_schema
                     trusted_source = getattr(extracted_schema, 'trusted_source', None)
                 else:
@@ -307,6 +715,7 @@ class DocumentPipeline:
                 result['metadata']['extraction_skipped'] = 'Policy does not require extraction'
             
             # STEP 9: Use DecisionEngine for final certification decision
+            stage_timer.enter('decision')
             # Decision is now based on CLAIM, not just document
             # CRITICAL: Always initialize decision to avoid UnboundLocalError
             decision = {
@@ -372,7 +781,8 @@ class DocumentPipeline:
                 result['certification_profile'] = policy_decision['policy'].value
             
             # STEP 10: Extract holder (if requested)
-            if "holder" in requested_tasks:
+            if 'holder_extraction' in plan:
+                stage_timer.enter('holder_extraction')
                 holder_info = self.holder_extractor.extract(
                     result.get('claim', {}),
                     result.get('inferred_role', 'unknown'),
@@ -382,15 +792,18 @@ class DocumentPipeline:
                     result['holder'] = holder_info
             
             # STEP 11: Calculate compliance score (if requested)
-            if "compliance_score" in requested_tasks:
+            if 'compliance_score' in plan:
+                stage_timer.enter('compliance_score')
                 compliance_score = self.compliance_scorer.calculate(result)
                 result['compliance_score'] = compliance_score
             
             # STEP 12: Detect anomalies (always included)
+            stage_timer.enter('anomaly_detection')
             anomalies = self.anomaly_detector.detect(result)
             result['anomalies'] = anomalies
             
             # STEP 13: Generate hash for CertiFi
+            stage_timer.enter('hashing')
             # CRITICAL: Hash is ALWAYS calculated if certifiable
             # Hash is the PROOF, certification is the DECISION to publish it
             if result['certification_ready']:
@@ -400,12 +813,9 @@ class DocumentPipeline:
                 if (policy_decision['policy'] == CertificationPolicy.HASH_ONLY or 
                     certification_method == 'claim_based'):
                     # For hash-only or claim-based policy, hash the entire file
+                    # (reuse the digest computed during upload when available)
                     try:
-                        with open(str(file_path), 'rb') as f:
-                            file_content = f.read()
-                        # Use binary hash for files (more reliable)
-                        import hashlib
-                        file_hash = hashlib.sha256(file_content).hexdigest()
+                        file_hash = file_digest or self._generate_file_hash(file_path)
                         result['metadata']['file_hash'] = file_hash
                         result['metadata']['canonical_hash'] = file_hash
                     except Exception as e:
@@ -458,6 +868,11 @@ class DocumentPipeline:
         except Exception as e:
             result['errors'].append(f"Pipeline error: {str(e)}")
             result['success'] = False
+        finally:
+            # Seconds spent in each stage that ran (also on early exits); stages
+            # run concurrently overlap, so wall-clock time is reported separately
+            result['metadata']['stage_timings'] = stage_timer.finish()
+            result['metadata']['pipeline_seconds'] = round(stage_timer.elapsed, 6)
         
         return result
     
@@ -465,6 +880,14 @@ class DocumentPipeline:
         """Generate SHA256 hash of text"""
         return hashlib.sha256(text.encode('utf-8')).hexdigest()
     
+    def _generate_file_hash(self, file_path: Union[str, Path]) -> str:
+        """Generate SHA256 hash of a file, reading it in chunks"""
+        sha256 = hashlib.sha256()
+        with open(str(file_path), 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+    
     def _generate_canonical_hash(self, schema: BaseDocumentSchema) -> str:
         """
         Generate canonical hash for CertiFi on-chain storage
@@ -487,20 +910,13 @@ class DocumentPipeline:
             result: Pipeline result dictionary
             
         Returns:
-            JSON string
+            JSON string (indented)
         """
-        def serialize(obj):
-            # Handle Pydantic models
-            if hasattr(obj, 'model_dump'):
-                return obj.model_dump()  # Pydantic v2
-            elif hasattr(obj, 'dict'):
-                return obj.dict()  # Pydantic v1
-            # Handle datetime
-            if hasattr(obj, 'isoformat'):
-                return obj.isoformat()
-            # Handle Decimal
-            if hasattr(obj, '__class__') and obj.__class__.__name__ == 'Decimal':
-                return float(obj)
-            return str(obj)
-        
-        return json.dumps(result, default=serialize, indent=2, ensure_ascii=False)
+        return dumps_json(result, indent=True).decode('utf-8')
+
+
+def _timed(stage: Callable[[Dict[str, Any]], Any], outputs: Dict[str, Any]) -> tuple:
+    """Run a stage callable, returning (value, seconds)"""
+    start = time.perf_counter()
+    value = stage(outputs)
+    return value, time.perf_counter() - start
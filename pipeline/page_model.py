@@ -0,0 +1,290 @@
+"""
+Page Model - Words of a page with their boxes, line/block ids and confidences
+
+Built in the same pass that produces the page text (Tesseract word data,
+EasyOCR detections or the PyMuPDF text layer), so later stages can reason
+about where text sits without OCR'ing or rasterizing the page again.
+
+Words are stored column-wise in numpy arrays (one row per word) rather than
+as a dict per word: a dense page of 500 words is a few arrays, cheap to keep,
+pickle, cache and slice.
+
+Coordinates are PDF points (unit 'pt', origin top-left) for PDF pages, OCR'd
+or not, and pixels (unit 'px') for image files. Confidences are 0-100;
+words of a native text layer have 100.
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+
+import fitz  # PyMuPDF
+import numpy as np
+
+# Word columns returned by the OCR engines' image_to_data
+WORD_COLUMNS = ('text', 'left', 'top', 'width', 'height', 'conf', 'block_num', 'line_num')
+
+# Words of a pdfplumber page whose tops differ by at most this (points) share a line
+LINE_TOLERANCE = 3.0
+
+
+class PageModel:
+    """Words of one page, column-wise"""
+
+    __slots__ = ('page', 'width', 'height', 'unit', 'source', 'words', 'boxes', 'confidences', 'line_ids', 'block_ids')
+
+    def __init__(
+        self,
+        page: int,
+        width: float,
+        height: float,
+        words: Sequence[str],
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        line_ids: np.ndarray,
+        block_ids: np.ndarray,
+        unit: str = 'pt',
+        source: str = 'text_layer'
+    ):
+        """
+        Initialize page model
+
+        Args:
+            page: Page number (0-based)
+            width: Page width (in `unit`)
+            height: Page height (in `unit`)
+            words: Word strings, in reading order
+            boxes: (n, 4) float32 x0, y0, x1, y1
+            confidences: (n,) float32, 0-100
+            line_ids: (n,) int32, lines numbered in reading order across the page
+            block_ids: (n,) int32, blocks numbered in reading order
+            unit: 'pt' (PDF points) or 'px' (image pixels)
+            source: 'text_layer', 'tesseract' or 'easyocr'
+        """
+        self.page = page
+        self.width = float(width)
+        self.height = float(height)
+        self.unit = unit
+        self.source = source
+        self.words = list(words)
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.confidences = np.asarray(confidences, dtype=np.float32)
+        self.line_ids = np.asarray(line_ids, dtype=np.int32)
+        self.block_ids = np.asarray(block_ids, dtype=np.int32)
+
+    @classmethod
+    def from_pymupdf(cls, page: "fitz.Page", textpage: Optional["fitz.TextPage"] = None) -> "PageModel":
+        """
+        Model of a page's native text layer (PyMuPDF words, in points)
+
+        Args:
+            page: PDF page
+            textpage: TextPage of the page already extracted (e.g. for its text
+                      blocks), reused instead of parsing the page again
+        """
+        entries = page.get_text('words', sort=False, textpage=textpage)
+        words = [entry[4] for entry in entries]
+        boxes = np.array([entry[:4] for entry in entries], dtype=np.float32).reshape(-1, 4)
+        block_nums = np.array([entry[5] for entry in entries], dtype=np.int64)
+        line_nums = np.array([entry[6] for entry in entries], dtype=np.int64)
+        return cls(
+            page.number, page.rect.width, page.rect.height, words, boxes,
+            np.full(len(words), 100.0, dtype=np.float32),
+            _sequential_ids(block_nums * 100000 + line_nums), _sequential_ids(block_nums),
+            unit='pt', source='text_layer'
+        )
+
+    @classmethod
+    def from_pdfplumber(cls, page: Any, page_num: int) -> "PageModel":
+        """
+        Model of a page's text layer as read by pdfplumber (words in reading order, in points)
+
+        pdfplumber has no line or block structure: words whose tops are within
+        LINE_TOLERANCE points share a line, and a gap above a line taller than
+        the previous line starts a new block.
+
+        Args:
+            page: pdfplumber page
+            page_num: Page number (0-based)
+        """
+        entries = page.extract_words()
+        boxes = np.array(
+            [[entry['x0'], entry['top'], entry['x1'], entry['bottom']] for entry in entries], dtype=np.float32
+        ).reshape(-1, 4)
+        line_ids = np.zeros(len(entries), dtype=np.int32)
+        block_ids = np.zeros(len(entries), dtype=np.int32)
+        line = block = 0
+        for i in range(1, len(entries)):
+            previous, current = boxes[i - 1], boxes[i]
+            if abs(current[1] - previous[1]) > LINE_TOLERANCE:
+                line += 1
+                if current[1] - previous[3] > previous[3] - previous[1]:
+                    block += 1
+            line_ids[i] = line
+            block_ids[i] = block
+        return cls(
+            page_num, page.width, page.height, [entry['text'] for entry in entries], boxes,
+            np.full(len(entries), 100.0, dtype=np.float32), line_ids, block_ids,
+            unit='pt', source='text_layer'
+        )
+
+    @classmethod
+    def from_ocr_words(
+        cls,
+        data: Dict[str, list],
+        page: int,
+        width: int,
+        height: int,
+        scale: float = 1.0,
+        unit: str = 'px',
+        source: str = 'tesseract'
+    ) -> "PageModel":
+        """
+        Model of an OCR'd page from engine word columns (see WORD_COLUMNS)
+
+        Args:
+            data: Word columns of the OCR'd raster
+            page: Page number (0-based)
+            width: Raster width (px)
+            height: Raster height (px)
+            scale: Factor bringing raster pixels to `unit` (72 / dpi for points)
+            unit: Unit of the model's coordinates
+            source: OCR engine
+        """
+        left = np.asarray(data['left'], dtype=np.float32)
+        top = np.asarray(data['top'], dtype=np.float32)
+        boxes = np.stack(
+            [left, top, left + np.asarray(data['width'], dtype=np.float32), top + np.asarray(data['height'], dtype=np.float32)],
+            axis=1
+        ).reshape(-1, 4) * scale
+        return cls(
+            page, width * scale, height * scale, data['text'], boxes,
+            np.clip(np.asarray(data['conf'], dtype=np.float32), 0, 100),
+            np.asarray(data['line_num'], dtype=np.int32), np.asarray(data['block_num'], dtype=np.int32),
+            unit=unit, source=source
+        )
+
+    @classmethod
+    def from_easyocr(
+        cls,
+        results: List[tuple],
+        page: int,
+        width: int,
+        height: int,
+        scale: float = 1.0,
+        unit: str = 'px'
+    ) -> "PageModel":
+        """
+        Model of a page OCR'd by EasyOCR (detail=1 results: quadrilateral, text, confidence 0-1)
+
+        EasyOCR detects text lines rather than words: each detection is one
+        entry with its own line, and detections are grouped in one block.
+        """
+        quads = np.array([result[0] for result in results], dtype=np.float32).reshape(-1, 4, 2)
+        boxes = np.concatenate([quads.min(axis=1), quads.max(axis=1)], axis=1) * scale
+        return cls(
+            page, width * scale, height * scale, [result[1] for result in results], boxes,
+            np.array([result[2] * 100 for result in results], dtype=np.float32),
+            np.arange(len(results), dtype=np.int32), np.zeros(len(results), dtype=np.int32),
+            unit=unit, source='easyocr'
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def text(self) -> str:
+        """Page text: words joined by spaces, lines by newlines, blocks by blank lines"""
+        parts = []
+        for i, word in enumerate(self.words):
+            if i:
+                if self.block_ids[i] != self.block_ids[i - 1]:
+                    parts.append('\n\n')
+                elif self.line_ids[i] != self.line_ids[i - 1]:
+                    parts.append('\n')
+                else:
+                    parts.append(' ')
+            parts.append(word)
+        return ''.join(parts)
+
+    def select(self, mask: np.ndarray) -> "PageModel":
+        """Model of the words where `mask` is True"""
+        indexes = np.flatnonzero(mask)
+        return PageModel(
+            self.page, self.width, self.height, [self.words[i] for i in indexes], self.boxes[indexes],
+            self.confidences[indexes], self.line_ids[indexes], self.block_ids[indexes],
+            unit=self.unit, source=self.source
+        )
+
+    def region(self, x0: float, y0: float, x1: float, y1: float) -> "PageModel":
+        """
+        Words whose center lies in a region given in page fractions (0-1)
+
+        e.g. region(0, 0.75, 1, 1) is the bottom quarter (MRZ, footers).
+        """
+        centers_x = (self.boxes[:, 0] + self.boxes[:, 2]) / 2 / (self.width or 1)
+        centers_y = (self.boxes[:, 1] + self.boxes[:, 3]) / 2 / (self.height or 1)
+        return self.select((centers_x >= x0) & (centers_x <= x1) & (centers_y >= y0) & (centers_y <= y1))
+
+    def mean_confidence(self) -> Optional[float]:
+        """Mean word confidence (0-100), None for an empty page"""
+        if not len(self.words):
+            return None
+        return round(float(self.confidences.mean()), 1)
+
+    def lines(self) -> List[Dict[str, Any]]:
+        """Lines in reading order: text, bbox, block and mean confidence"""
+        return [
+            {
+                'text': ' '.join(self.words[i] for i in indexes),
+                'bbox': _bbox(self.boxes[indexes]),
+                'block': int(self.block_ids[indexes[0]]),
+                'confidence': round(float(self.confidences[indexes].mean()), 1),
+            }
+            for indexes in _groups(self.line_ids)
+        ]
+
+    def blocks(self) -> List[Dict[str, Any]]:
+        """Blocks in reading order: bbox, line and word counts, mean confidence"""
+        return [
+            {
+                'block': int(self.block_ids[indexes[0]]),
+                'bbox': _bbox(self.boxes[indexes]),
+                'lines': int(len(np.unique(self.line_ids[indexes]))),
+                'words': int(len(indexes)),
+                'confidence': round(float(self.confidences[indexes].mean()), 1),
+            }
+            for indexes in _groups(self.block_ids)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly outline of the page (size, source, blocks)"""
+        return {
+            'page': self.page,
+            'width': round(self.width, 1),
+            'height': round(self.height, 1),
+            'unit': self.unit,
+            'source': self.source,
+            'words': len(self.words),
+            'mean_confidence': self.mean_confidence(),
+            'blocks': self.blocks(),
+        }
+
+
+def _sequential_ids(keys: np.ndarray) -> np.ndarray:
+    """Number runs of equal keys 0, 1, 2... in order of appearance"""
+    if not len(keys):
+        return np.zeros(0, dtype=np.int32)
+    changes = np.concatenate([[0], (keys[1:] != keys[:-1]).astype(np.int32)])
+    return np.cumsum(changes, dtype=np.int32)
+
+
+def _groups(ids: np.ndarray) -> List[np.ndarray]:
+    """Indexes of each id, ids in order of first appearance"""
+    unique, first = np.unique(ids, return_index=True)
+    return [np.flatnonzero(ids == unique[i]) for i in np.argsort(first)]
+
+
+def _bbox(boxes: np.ndarray) -> List[float]:
+    """Box enclosing boxes, rounded"""
+    return [
+        round(float(boxes[:, 0].min()), 1), round(float(boxes[:, 1].min()), 1),
+        round(float(boxes[:, 2].max()), 1), round(float(boxes[:, 3].max()), 1),
+    ]
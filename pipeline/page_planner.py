@@ -0,0 +1,121 @@
+"""
+Page Planner - Decides, page by page, how a PDF's text is obtained
+
+Each page is inspected cheaply with PyMuPDF (text layer size, area covered
+by images and, for pages without text, the pixel spread and share of dark
+pixels of a thumbnail):
+
+- text: the embedded text layer is used
+- ocr:  the page is rendered and OCR'd (scans, photos, signature pages)
+- skip: the page is blank (separator sheets, empty backs of scans)
+
+so mixed documents (a typed contract with scanned signature pages) only
+OCR the pages that need it.
+"""
+
+from typing import Dict, Any, List, Tuple, Optional
+import fitz  # PyMuPDF
+import numpy as np
+
+PAGE_ACTIONS = ('text', 'ocr', 'skip')
+
+
+class PagePlanner:
+    """Plans text extraction for each page of a PDF"""
+
+    # Decision thresholds
+    THRESHOLDS = {
+        'min_text_chars': 20,          # Text layer characters for a page to count as text
+        'sparse_text_chars': 200,      # Below this, a page mostly covered by images is a scan...
+        'scan_image_coverage': 0.5,    # ...with a stray text layer (stamp, page number, bad OCR)
+        'blank_pixel_std': 4.0,        # Blank page: thumbnail gray level std below this...
+        'blank_ink_ratio': 0.0002,     # ...and share of dark pixels (40+ levels under the background) below this
+        'thumbnail_zoom': 0.25,        # ~18 dpi thumbnails for the blank check
+    }
+
+    def __init__(self, thresholds: Optional[Dict[str, float]] = None):
+        """
+        Initialize planner
+
+        Args:
+            thresholds: Overrides of THRESHOLDS entries
+        """
+        self.thresholds = {**self.THRESHOLDS, **(thresholds or {})}
+
+    def plan(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Plan every page of a PDF
+
+        Args:
+            file_path: Path to PDF file
+
+        Returns:
+            One entry per page, in order: page (0-based), action ('text', 'ocr'
+            or 'skip'), reason, text_chars, image_coverage, pixel_std and
+            ink_ratio (None when the thumbnail was not needed)
+        """
+        doc = fitz.open(file_path)
+        try:
+            return [self.plan_page(page) for page in doc]
+        finally:
+            doc.close()
+
+    def plan_page(self, page: "fitz.Page") -> Dict[str, Any]:
+        """Inspect one page and choose its action"""
+        t = self.thresholds
+        text_chars = len(''.join(page.get_text().split()))
+        image_coverage = self._image_coverage(page)
+        entry = {
+            'page': page.number,
+            'action': 'text',
+            'reason': 'text_layer',
+            'text_chars': text_chars,
+            'image_coverage': round(image_coverage, 3),
+            'pixel_std': None,
+            'ink_ratio': None,
+        }
+
+        if text_chars >= t['min_text_chars']:
+            if text_chars < t['sparse_text_chars'] and image_coverage >= t['scan_image_coverage']:
+                entry.update(action='ocr', reason='scan_with_sparse_text')
+            return entry
+
+        # No usable text layer: OCR unless the page is blank. Small print
+        # barely moves the std of a thumbnail, so dark pixels are counted too.
+        pixel_std, ink_ratio = self._pixel_stats(page)
+        entry['pixel_std'] = round(pixel_std, 2)
+        entry['ink_ratio'] = round(ink_ratio, 5)
+        if pixel_std < t['blank_pixel_std'] and ink_ratio < t['blank_ink_ratio']:
+            entry.update(action='skip', reason='blank')
+        else:
+            entry.update(action='ocr', reason='no_text_layer')
+        return entry
+
+    @staticmethod
+    def _image_coverage(page: "fitz.Page") -> float:
+        """Fraction of the page area covered by images (overlapping images summed, capped at 1)"""
+        page_rect = page.rect
+        page_area = abs(page_rect)
+        if not page_area:
+            return 0.0
+        covered = 0.0
+        for info in page.get_image_info():
+            bbox = fitz.Rect(info['bbox']) & page_rect
+            if not bbox.is_empty:
+                covered += abs(bbox)
+        return min(1.0, covered / page_area)
+
+    def _pixel_stats(self, page: "fitz.Page") -> Tuple[float, float]:
+        """
+        Gray level std and share of dark pixels of a low resolution render
+
+        Returns:
+            (std, ink ratio): ink = pixels 40+ levels darker than the median (background)
+        """
+        zoom = self.thresholds['thumbnail_zoom']
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+        if not pix.width or not pix.height:
+            return 0.0, 0.0
+        samples = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        background = float(np.median(samples))
+        return float(samples.std()), float((samples < background - 40).mean())
@@ -0,0 +1,112 @@
+"""
+Pipeline Pool - Long-lived, pre-warmed DocumentPipeline instances
+
+Building a DocumentPipeline instantiates every stage (OCR, Camelot, Unstructured,
+NER, decision profiles...). The pool builds them once per process and leases
+them to requests, so that setup cost is paid at startup instead of per document.
+"""
+
+from typing import Dict, Any, Iterator, Iterable, Optional
+from contextlib import contextmanager
+import queue
+import threading
+import time
+
+from .orchestrator import DocumentPipeline
+
+
+class PipelinePool:
+    """
+    Process-wide pool of DocumentPipeline instances, keyed by variant
+
+    A variant is the `use_llm` flag: pipelines with and without LLM support
+    are built separately and never mixed. Each variant holds `size` instances,
+    so up to `size` documents of the same variant can be processed at once.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        llm_provider: str = "openai",
+        pipeline_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize pool (pipelines are built lazily or by warm_up)
+
+        Args:
+            size: Number of pipeline instances per variant
+            llm_provider: LLM provider passed to every pipeline
+            pipeline_options: Extra DocumentPipeline arguments (e.g. stage_concurrency)
+        """
+        self.size = max(1, size)
+        self.llm_provider = llm_provider
+        self.pipeline_options = dict(pipeline_options or {})
+        self._variants: Dict[bool, queue.Queue] = {}
+        self._lock = threading.Lock()
+
+    def _get_variant(self, use_llm: bool) -> queue.Queue:
+        """Return the queue of idle pipelines for a variant, building it on first use"""
+        with self._lock:
+            idle = self._variants.get(use_llm)
+            if idle is None:
+                idle = queue.Queue(maxsize=self.size)
+                for _ in range(self.size):
+                    idle.put(DocumentPipeline(
+                        use_llm=use_llm,
+                        llm_provider=self.llm_provider,
+                        **self.pipeline_options
+                    ))
+                self._variants[use_llm] = idle
+            return idle
+
+    @contextmanager
+    def lease(self, use_llm: bool = False) -> Iterator[DocumentPipeline]:
+        """
+        Borrow a pipeline for the duration of one document
+
+        Blocks until an instance of the requested variant is idle.
+
+        Args:
+            use_llm: Pipeline variant
+
+        Yields:
+            DocumentPipeline instance (returned to the pool on exit)
+        """
+        idle = self._get_variant(use_llm)
+        pipeline = idle.get()
+        try:
+            yield pipeline
+        finally:
+            idle.put(pipeline)
+
+    def close(self) -> None:
+        """Close the idle pipelines of every variant (their stage thread pools)"""
+        with self._lock:
+            variants, self._variants = self._variants, {}
+        for idle in variants.values():
+            while True:
+                try:
+                    idle.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def warm_up(self, variants: Iterable[bool] = (False,)) -> Dict[str, Any]:
+        """
+        Build the requested variants and load their heavy dependencies
+
+        Args:
+            variants: `use_llm` values to prepare
+
+        Returns:
+            Warm-up report per variant (duration and per-component status)
+        """
+        report = {}
+        for use_llm in variants:
+            start = time.perf_counter()
+            with self.lease(use_llm) as pipeline:
+                components = pipeline.warm_up()
+            report[f"use_llm={use_llm}"] = {
+                'seconds': round(time.perf_counter() - start, 3),
+                'components': components
+            }
+        return report
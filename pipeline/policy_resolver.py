@@ -6,7 +6,7 @@ This is the CORE business logic: CertiFi certifies POLICIES, not documents
 
 from typing import Dict, Any, Optional
 from enum import Enum
-from .family_classifier import DocumentFamily
+from .family_classifier import DocumentFamily, DocumentSubtype
 
 
 class CertificationPolicy(str, Enum):
@@ -35,52 +35,102 @@ class PolicyResolver:
             'certifiable': True,
             'requires_extraction': True,
             'trusted_sources': ['mrz', 'layout_rules'],
-            'min_confidence': 0.50  # Threshold for family classification (extraction will have stricter requirements)
+            'min_confidence': 0.50,  # Threshold for family classification (extraction will have stricter requirements)
+            'structure_stages': []
         },
         DocumentFamily.DRIVING_LICENSE: {
             'default_policy': CertificationPolicy.DRIVING_LICENSE_MINIMAL,
             'certifiable': True,
             'requires_extraction': True,
             'trusted_sources': ['layout_rules'],
-            'min_confidence': 0.50  # Threshold for family classification
+            'min_confidence': 0.50,  # Threshold for family classification
+            'structure_stages': []
         },
         DocumentFamily.CONTRACT: {
             'default_policy': CertificationPolicy.HASH_ONLY,
             'certifiable': True,
             'requires_extraction': False,  # Contracts: hash + signature verification
             'trusted_sources': ['file_integrity'],
-            'min_confidence': 0.60  # Lower threshold - hash is enough, less strict
+            'min_confidence': 0.60,  # Lower threshold - hash is enough, less strict
+            'structure_stages': ['table_extraction']  # Compensation tables (ClaimExtractor override)
         },
         DocumentFamily.CERTIFICATE: {
             'default_policy': CertificationPolicy.CERTIFICATE_MINIMAL,
             'certifiable': True,
             'requires_extraction': True,
             'trusted_sources': ['ocr', 'layout_rules'],
-            'min_confidence': 0.50  # Threshold for family classification
+            'min_confidence': 0.50,  # Threshold for family classification
+            'structure_stages': []
         },
         DocumentFamily.FINANCIAL: {
             'default_policy': CertificationPolicy.FINANCIAL_MINIMAL,
             'certifiable': True,
             'requires_extraction': True,
             'trusted_sources': ['ocr'],
-            'min_confidence': 0.50  # Threshold for family classification
+            'min_confidence': 0.50,  # Threshold for family classification
+            'structure_stages': []
         },
         DocumentFamily.CORPORATE: {
             'default_policy': CertificationPolicy.CORPORATE_MINIMAL,
             'certifiable': True,
             'requires_extraction': True,
             'trusted_sources': ['ocr'],
-            'min_confidence': 0.50  # Threshold for family classification
+            'min_confidence': 0.50,  # Threshold for family classification
+            'structure_stages': []
         },
         DocumentFamily.UNKNOWN: {
             'default_policy': CertificationPolicy.UNKNOWN,
             'certifiable': False,
             'requires_extraction': False,
             'trusted_sources': [],
-            'min_confidence': 0.0
+            'min_confidence': 0.0,
+            'structure_stages': []
         }
     }
     
+    # Expensive structure stages per subtype, when different from the family's
+    # 'structure_stages' (NDAs carry no compensation table)
+    SUBTYPE_STRUCTURE_STAGES = {
+        DocumentSubtype.NDA: [],
+    }
+    
+    def stage_plan(
+        self,
+        family: DocumentFamily,
+        subtype: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Structure stages (document structure, table extraction) worth running for a family
+        
+        They only run when a downstream consumer reads their output, e.g. the
+        ClaimExtractor compensation override for contracts.
+        
+        Args:
+            family: Document family
+            subtype: Optional document subtype value (e.g. 'nda')
+            
+        Returns:
+            Stage plan with family, subtype, structure_stages and source
+        """
+        policy_config = self.FAMILY_POLICIES.get(family, self.FAMILY_POLICIES[DocumentFamily.UNKNOWN])
+        stages = list(policy_config.get('structure_stages', []))
+        source = 'family'
+        
+        try:
+            subtype_key = DocumentSubtype(subtype) if subtype else None
+        except ValueError:
+            subtype_key = None
+        if subtype_key in self.SUBTYPE_STRUCTURE_STAGES:
+            stages = list(self.SUBTYPE_STRUCTURE_STAGES[subtype_key])
+            source = 'subtype'
+        
+        return {
+            'family': family.value,
+            'subtype': subtype,
+            'structure_stages': stages,
+            'source': source
+        }
+    
     def resolve(
         self,
         family: DocumentFamily,
@@ -4,15 +4,41 @@ Handles noise removal, date unification, OCR corrections
 """
 
 import re
-from typing import Optional
+from typing import Optional, Dict, Any
 import cv2
 import numpy as np
 from PIL import Image
 
 
+# Image denoising tiers, cheapest first
+DENOISE_TIERS = ('none', 'median', 'nlmeans')
+
+# Laplacian-like kernel of the noise estimate (responds to noise, not to
+# flat areas or linear gradients)
+_NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+
+
+def _isolated(mask: np.ndarray, window: int) -> np.ndarray:
+    """Pixels of either class of a binary mask with at most one other pixel of their class in a window around them"""
+    ones = mask.view(np.uint8)
+    count = cv2.boxFilter(ones, cv2.CV_16U, (window, window), normalize=False, borderType=cv2.BORDER_REPLICATE)
+    return np.where(mask, count <= 2, count >= window * window - 2)
+
+
 class DocumentPreprocessor:
     """Normalizes and cleans extracted text"""
     
+    # Image quality -> denoise tier
+    QUALITY_THRESHOLDS = {
+        'clean_noise_sigma': 1.0,      # Below (and no speckle): clean digital render, no denoising
+        'noisy_noise_sigma': 5.0,      # From here: full NL-means
+        'speckle_ratio': 0.001,        # Isolated dark/light specks above this share: at least a median filter
+        'speckle_window': 9,           # Specks have no other pixel of their class in this window (sampled pixels)
+        'low_contrast': 80,            # Ink/background separation of a faded scan...
+        'low_contrast_noise_sigma': 2.5,  # ...which gets NL-means from this noise level
+        'sample_step': 2,              # Estimate on every 2nd pixel (keeps noise, 1/4 of the work)
+    }
+    
     def __init__(self):
         self.date_patterns = [
             r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}',
@@ -96,6 +122,72 @@ class DocumentPreprocessor:
         # For now, we just ensure consistency
         return text
     
+    def estimate_image_quality(self, gray: np.ndarray) -> Dict[str, float]:
+        """
+        Cheap noise and contrast estimate of a grayscale image
+        
+        Computed on a decimated view of the image:
+        - noise_sigma: robust (median absolute) response to a Laplacian-like
+          kernel, so sparse text edges do not count as noise. Noise clipped
+          at pure white reads about half its true level, which the thresholds
+          account for.
+        - speckle_ratio: share of pixels a 3x3 median changes by more than 64
+          levels and that form a 1-2 pixel dark (or light) component with no
+          other ink (or background) around it: salt-and-pepper noise. Glyph
+          edges, dots and punctuation sit next to other ink and do not count.
+        - contrast: gap between the mean gray levels of the two Otsu classes
+          (ink and background); low on faded scans
+        
+        Returns:
+            {'noise_sigma', 'speckle_ratio', 'contrast'}
+        """
+        step = int(self.QUALITY_THRESHOLDS['sample_step'])
+        sample = np.ascontiguousarray(gray[::step, ::step])
+        if sample.shape[0] < 3 or sample.shape[1] < 3:
+            return {'noise_sigma': 0.0, 'speckle_ratio': 0.0, 'contrast': 0.0}
+        response = cv2.filter2D(sample.astype(np.float32), -1, _NOISE_KERNEL)[1:-1, 1:-1]
+        # sum(kernel^2) = 36: sigma = MAD / 0.6745 / 6
+        noise_sigma = float(np.median(np.abs(response))) / 0.6745 / 6.0
+        threshold, _ = cv2.threshold(sample, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        dark = sample <= threshold
+        speckle = (cv2.absdiff(sample, cv2.medianBlur(sample, 3)) > 64) & _isolated(
+            dark, int(self.QUALITY_THRESHOLDS['speckle_window'])
+        )
+        contrast = 0.0
+        if dark.any() and not dark.all():
+            contrast = float(sample[~dark].mean() - sample[dark].mean())
+        return {
+            'noise_sigma': round(noise_sigma, 2),
+            'speckle_ratio': round(float(speckle.mean()), 5),
+            'contrast': round(contrast, 1),
+        }
+    
+    def select_denoise_tier(self, gray: np.ndarray, max_tier: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Choose how hard to denoise an image before OCR
+        
+        Args:
+            gray: Grayscale image
+            max_tier: Most expensive tier allowed (e.g. 'median' for fast profiles)
+            
+        Returns:
+            {'tier': 'none' | 'median' | 'nlmeans', 'noise_sigma', 'speckle_ratio', 'contrast'}
+        """
+        t = self.QUALITY_THRESHOLDS
+        quality = self.estimate_image_quality(gray)
+        sigma = quality['noise_sigma']
+        if sigma >= t['noisy_noise_sigma'] or (
+            quality['contrast'] < t['low_contrast'] and sigma >= t['low_contrast_noise_sigma']
+        ):
+            tier = 'nlmeans'
+        elif sigma >= t['clean_noise_sigma'] or quality['speckle_ratio'] > t['speckle_ratio']:
+            tier = 'median'
+        else:
+            tier = 'none'
+        if max_tier in DENOISE_TIERS and DENOISE_TIERS.index(tier) > DENOISE_TIERS.index(max_tier):
+            tier = max_tier
+        return {'tier': tier, **quality}
+    
     def preprocess_image(self, image_path: str) -> Optional[np.ndarray]:
         """
         Preprocess image for better OCR results
@@ -107,40 +199,51 @@ class DocumentPreprocessor:
             Preprocessed image array
         """
         try:
-            img = cv2.imread(image_path)
-            if img is None:
+            # Decode straight to grayscale
+            gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
                 return None
             
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
-            # Denoise
-            denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-            
-            # Threshold
-            _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            return thresh
+            return self.preprocess_image_from_array(gray)
         except Exception as e:
             print(f"Error preprocessing image: {e}")
             return None
     
-    def preprocess_image_from_array(self, img_array: np.ndarray) -> Optional[np.ndarray]:
+    def preprocess_image_from_array(
+        self,
+        img_array: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        tier: Optional[str] = None
+    ) -> Optional[np.ndarray]:
         """
         Preprocess image array for better OCR results
         
         Args:
-            img_array: Image as numpy array
+            img_array: Grayscale image as numpy array (not modified)
+            out: Optional uint8 array of the same shape to write the result into
+                 (lets callers reuse one buffer across pages)
+            tier: Denoise tier ('none', 'median', 'nlmeans'); None = select_denoise_tier()
             
         Returns:
-            Preprocessed image array
+            Preprocessed image array (`out` when given)
         """
         try:
+            if tier is None:
+                tier = self.select_denoise_tier(img_array)['tier']
+            
             # Denoise
-            denoised = cv2.fastNlMeansDenoising(img_array, None, 10, 7, 21)
+            if tier == 'nlmeans':
+                denoised = cv2.fastNlMeansDenoising(img_array, out, 10, 7, 21)
+            elif tier == 'median':
+                denoised = cv2.medianBlur(img_array, 3, dst=out)
+            elif out is not None:
+                np.copyto(out, img_array)
+                denoised = out
+            else:
+                denoised = img_array.copy()
             
-            # Threshold
-            _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            # Threshold (in place)
+            _, thresh = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=denoised)
             
             return thresh
         except Exception as e:
@@ -0,0 +1,220 @@
+"""
+Result Cache - Content-addressed cache of pipeline results
+
+Documents are often submitted more than once (retries, re-checks, the same
+contract uploaded by both parties). Results are keyed by the file SHA-256,
+the requested tasks, the client ai_version, the pipeline version and the
+pipeline options that shape the output (OCR profile, languages, engine...),
+so a resubmission is answered without re-running OCR and table extraction,
+and a deploy with other settings never reads results it would not produce.
+
+Bump pipeline.__version__ whenever extraction output changes: the disk
+tier outlives deploys.
+
+Two tiers:
+- Memory: per-process LRU, bounded by entries and bytes
+- Disk (optional): SQLite file shared by every worker/process on the host
+"""
+
+from typing import Dict, Any, Optional, Iterable
+from collections import OrderedDict
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+
+from . import __version__
+
+
+class ResultCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache with TTL and size eviction
+
+    Values are stored pickled, so every hit returns an independent copy.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 24 * 3600,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 10000,
+        namespace: str = "results"
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum entries in the memory tier
+            max_bytes: Maximum total (pickled) size of the memory tier
+            ttl_seconds: Entry lifetime in both tiers (0 = no expiry)
+            disk_path: SQLite file for the shared disk tier (None = memory only)
+            disk_max_entries: Maximum entries in the disk tier
+            namespace: Table name, so several caches can share one file
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.namespace = namespace
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, blob)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.counters = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, timeout=5.0, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.namespace} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.namespace}_accessed ON {self.namespace} (accessed_at)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(
+        file_digest: str,
+        requested_tasks: Iterable[str],
+        ai_version: str,
+        pipeline_version: str = __version__,
+        pipeline_options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build the cache key for a document analysis
+
+        Tasks are normalized (trimmed, lowercased, deduplicated, sorted) so
+        'claims,classify' and 'classify, claims' share an entry.
+
+        Args:
+            pipeline_options: Output-shaping pipeline settings (performance
+                              profile, OCR languages and engine...); their hash
+                              is part of the key
+        """
+        tasks = sorted({t.strip().lower() for t in requested_tasks if t and t.strip()})
+        options_digest = hashlib.sha256(
+            json.dumps(pipeline_options or {}, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        material = json.dumps([file_digest, tasks, ai_version, pipeline_version, options_digest])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - stored_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value (memory first, then disk)
+
+        Returns:
+            Cached value, or None on miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, blob = entry
+                if not self._expired(stored_at, now):
+                    self._memory.move_to_end(key)
+                    self.counters['hits'] += 1
+                    self.counters['memory_hits'] += 1
+                    return pickle.loads(blob)
+                self._drop_memory(key)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    f"SELECT value, stored_at FROM {self.namespace} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    blob, stored_at = row
+                    if not self._expired(stored_at, now):
+                        self._db.execute(
+                            f"UPDATE {self.namespace} SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        self._store_memory(key, stored_at, blob)
+                        self.counters['hits'] += 1
+                        self.counters['disk_hits'] += 1
+                        return pickle.loads(blob)
+                    self._db.execute(f"DELETE FROM {self.namespace} WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.counters['misses'] += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, now, blob)
+            if self._db is not None:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.namespace} (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, sqlite3.Binary(blob), now, now)
+                )
+                self._evict_disk(now)
+                self._db.commit()
+            self.counters['stores'] += 1
+
+    def _store_memory(self, key: str, stored_at: float, blob: bytes) -> None:
+        """Insert into the memory tier and evict LRU entries beyond the limits"""
+        if len(blob) > self.max_bytes:
+            return
+        self._drop_memory(key)
+        self._memory[key] = (stored_at, blob)
+        self._memory_bytes += len(blob)
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            oldest = next(iter(self._memory))
+            self._drop_memory(oldest)
+            self.counters['evictions'] += 1
+
+    def _drop_memory(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[1])
+
+    def _evict_disk(self, now: float) -> None:
+        """Remove expired entries, then least recently used beyond disk_max_entries"""
+        if self.ttl_seconds > 0:
+            self._db.execute(
+                f"DELETE FROM {self.namespace} WHERE stored_at < ?", (now - self.ttl_seconds,)
+            )
+        count = self._db.execute(f"SELECT COUNT(*) FROM {self.namespace}").fetchone()[0]
+        excess = count - self.disk_max_entries
+        if excess > 0:
+            self._db.execute(
+                f"DELETE FROM {self.namespace} WHERE key IN "
+                f"(SELECT key FROM {self.namespace} ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,)
+            )
+            self.counters['evictions'] += excess
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus current tier sizes and hit ratio"""
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['misses']
+            return {
+                **self.counters,
+                'hit_ratio': self.counters['hits'] / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_enabled': self._db is not None,
+            }
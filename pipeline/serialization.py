@@ -0,0 +1,123 @@
+"""
+Serialization - Fast encoding of pipeline results and API payloads
+
+Results are plain dicts/lists holding a known, small set of non-JSON types
+(Pydantic schemas, enums, dates, Decimals, numpy scalars from tables). They
+are encoded with orjson when installed (falls back to the standard json
+module) and optionally as MessagePack, without re-validating them through
+Pydantic models.
+"""
+
+from typing import Any
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+import json
+
+# Try to import orjson (optional, much faster JSON encoder)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Try to import msgpack (optional, binary responses)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+def to_primitive(obj: Any) -> Any:
+    """
+    Convert one non-JSON value found in pipeline results
+
+    Called by the encoders only for values they do not handle natively.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()  # Pydantic v2
+    if hasattr(obj, 'dict') and hasattr(obj, '__fields__'):
+        return obj.dict()  # Pydantic v1
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()  # numpy arrays and scalars
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode to UTF-8 JSON
+
+    Args:
+        obj: Result or payload
+        indent: Pretty-print with 2-space indentation
+
+    Returns:
+        JSON bytes
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=to_primitive, option=option)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits: let the json module handle it
+    text = json.dumps(
+        obj,
+        default=to_primitive,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (',', ':')
+    )
+    return text.encode('utf-8')
+
+
+def dumps_msgpack(obj: Any) -> bytes:
+    """
+    Encode to MessagePack
+
+    Raises:
+        RuntimeError: If msgpack is not installed
+    """
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack not available. Install with: pip install msgpack")
+    return msgpack.packb(obj, default=to_primitive, use_bin_type=True)
+
+
+def wants_msgpack(accept: str) -> bool:
+    """True if an Accept header asks for MessagePack (and it can be produced)"""
+    if not MSGPACK_AVAILABLE or not accept:
+        return False
+    accepted = [part.split(';')[0].strip().lower() for part in accept.split(',')]
+    return any(media_type in MSGPACK_MEDIA_TYPES for media_type in accepted)
+
+
+def encode(obj: Any, accept: str = "") -> tuple:
+    """
+    Encode a payload in the format the client accepts
+
+    Args:
+        obj: Payload
+        accept: Request Accept header
+
+    Returns:
+        (body bytes, media type)
+    """
+    if wants_msgpack(accept):
+        return dumps_msgpack(obj), MSGPACK_MEDIA_TYPE
+    return dumps_json(obj), JSON_MEDIA_TYPE
@@ -42,6 +42,42 @@ class TableExtractor:
         if not PANDAS_AVAILABLE:
             print("⚠️  pandas not available. Install with: pip install pandas")
     
+    def warm_up(self) -> str:
+        """
+        Run Camelot once on a tiny generated PDF
+        
+        The first read_pdf call loads Ghostscript and OpenCV; doing it at
+        startup keeps that cost out of the first request.
+        
+        Returns:
+            'ready', 'unavailable' or an error message
+        """
+        if not self.available:
+            return 'unavailable'
+        
+        import os
+        import tempfile
+        
+        tmp_path = None
+        try:
+            import fitz  # PyMuPDF
+            doc = fitz.open()
+            page = doc.new_page(width=200, height=100)
+            page.draw_rect(fitz.Rect(20, 20, 180, 80))
+            page.draw_line(fitz.Point(100, 20), fitz.Point(100, 80))
+            page.insert_text(fitz.Point(30, 55), "fee")
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
+                tmp_path = tmp_file.name
+            doc.save(tmp_path)
+            doc.close()
+            camelot.read_pdf(tmp_path, pages='1', flavor='lattice')
+            return 'ready'
+        except Exception as e:
+            return f"warm-up failed: {e}"
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
     def extract_tables(
         self,
         file_path: str,
@@ -0,0 +1,58 @@
+"""Shared fixtures: small PDFs built on the fly"""
+
+import os
+import shutil
+import tempfile
+
+# api.py reads its configuration at import: keep tests off the real job
+# directory and run pipelines in-process
+os.environ.setdefault('JOB_DIR', tempfile.mkdtemp(prefix='certifi-test-jobs-'))
+os.environ.setdefault('PIPELINE_WORKERS', '0')
+
+import cv2
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+
+requires_tesseract = pytest.mark.skipif(shutil.which('tesseract') is None, reason="tesseract not installed")
+
+
+def scan_png(seed: int, width: int = 600, height: int = 800) -> bytes:
+    """PNG of a 'scanned' page: random numbers on white"""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width), 255, np.uint8)
+    for _ in range(40):
+        x, y = int(rng.integers(10, width - 60)), int(rng.integers(20, height - 10))
+        cv2.putText(image, str(rng.integers(0, 99999)), (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 0, 1)
+    return cv2.imencode('.png', image)[1].tobytes()
+
+
+@pytest.fixture
+def make_scanned_pdf(tmp_path):
+    """Build a PDF with one full-page scan per seed (equal seeds = identical scans)"""
+    def make(seeds, name='scans.pdf'):
+        doc = fitz.open()
+        for seed in seeds:
+            page = doc.new_page(width=450, height=600)
+            page.insert_image(page.rect, stream=scan_png(seed))
+        path = tmp_path / name
+        doc.save(path)
+        doc.close()
+        return str(path)
+    return make
+
+
+@pytest.fixture
+def make_text_pdf(tmp_path):
+    """Build a PDF with a text layer: one list of lines per page"""
+    def make(pages, name='text.pdf'):
+        doc = fitz.open()
+        for lines in pages:
+            page = doc.new_page()
+            for i, line in enumerate(lines):
+                page.insert_text((72, 72 + 16 * i), line, fontsize=11)
+        path = tmp_path / name
+        doc.save(path)
+        doc.close()
+        return str(path)
+    return make
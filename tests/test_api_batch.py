@@ -0,0 +1,49 @@
+import io
+import json
+import zipfile
+
+from fastapi.testclient import TestClient
+
+import api
+
+
+def _batch(monkeypatch, files, hashes):
+    async def fake_analysis(tmp_path, digest, tasks, ai_version, wait=False, progress_callback=None):
+        return {}, "miss"
+
+    monkeypatch.setattr(api, "_run_analysis", fake_analysis)
+    monkeypatch.setattr(api, "_build_response_data", lambda result, tasks: {})
+    response = TestClient(api.app).post(
+        "/analyze/batch",
+        files=[("files", file) for file in files],
+        data={"hashes": hashes},
+    )
+    assert response.status_code == 200
+    return sorted((json.loads(line) for line in response.text.splitlines()), key=lambda line: line["index"])
+
+
+def test_failure_lines_report_submitted_index_and_message(monkeypatch):
+    lines = _batch(
+        monkeypatch,
+        [("a.pdf", b"a"), ("b.pdf", b"b"), ("c.pdf", b"c")],
+        ["", "sha256:" + "0" * 64, ""],
+    )
+    assert [(line["index"], line["document_id"], line["status"]) for line in lines] == [
+        (0, "a.pdf", "ok"), (1, "b.pdf", "error"), (2, "c.pdf", "ok"),
+    ]
+    assert lines[1]["error"] == "File hash mismatch"
+
+
+def test_zip_members_take_consecutive_indexes(monkeypatch):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("one.pdf", b"1")
+        zf.writestr("two.pdf", b"2")
+    lines = _batch(
+        monkeypatch,
+        [("bad.pdf", b"x"), ("pack.zip", archive.getvalue()), ("last.pdf", b"z")],
+        ["sha256:" + "0" * 64, "", ""],
+    )
+    assert [(line["index"], line["document_id"]) for line in lines] == [
+        (0, "bad.pdf"), (1, "pack.zip/one.pdf"), (2, "pack.zip/two.pdf"), (3, "last.pdf"),
+    ]
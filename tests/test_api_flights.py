@@ -0,0 +1,41 @@
+import asyncio
+import os
+
+import api
+
+
+def test_flight_survives_cancelled_initiator(monkeypatch, tmp_path):
+    seen = []
+
+    async def fake_run(file_path, **kwargs):
+        await asyncio.sleep(0.2)
+        seen.append(os.path.exists(file_path))
+        return {"errors": [], "metadata": {}}
+
+    monkeypatch.setattr(api.executor, "run", fake_run)
+    monkeypatch.setattr(api, "result_cache", None)
+
+    async def scenario():
+        upload = tmp_path / "upload.pdf"
+        upload.write_bytes(b"%PDF")
+        first = asyncio.create_task(api._run_analysis(str(upload), "d" * 64, ["classify"], "v1"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(api._run_analysis(str(upload), "d" * 64, ["classify"], "v1"))
+        await asyncio.sleep(0.01)
+        # The initiating client disconnects: its handler deletes the upload
+        first.cancel()
+        os.unlink(upload)
+        return await second
+
+    result, cache_status = asyncio.run(scenario())
+    assert cache_status == "coalesced"
+    assert seen == [True]
+    assert list(tmp_path.iterdir()) == []  # The flight's own link is removed too
+
+
+def test_extraction_and_io_failures_are_not_cached():
+    assert api._is_cacheable({"errors": []})
+    assert api._is_cacheable({"errors": ["Could not classify document family"]})
+    assert not api._is_cacheable({"errors": ["Failed to extract text or text too short"]})
+    assert not api._is_cacheable({"errors": ["Pipeline error: boom"]})
+    assert not api._is_cacheable({"errors": ["Failed to generate file hash: No such file"]})
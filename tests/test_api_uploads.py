@@ -0,0 +1,47 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from api import UploadSizeLimit
+
+
+def _client(limit: int) -> TestClient:
+    app = FastAPI()
+    seen = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        seen.append(len(await file.read()))
+        return {"size": seen[-1]}
+
+    app.add_middleware(UploadSizeLimit, limits={"/upload": limit})
+    client = TestClient(app)
+    client.seen = seen
+    return client
+
+
+def test_small_upload_passes():
+    client = _client(10_000)
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * 1000)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 1000}
+
+
+def test_declared_oversized_upload_is_refused_unread():
+    client = _client(10_000)
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * 50_000)})
+    assert response.status_code == 413
+    assert client.seen == []
+
+
+def test_chunked_oversized_upload_is_cut_off():
+    client = _client(10_000)
+
+    def body():  # A generator: sent chunked, without Content-Length
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.pdf"\r\n\r\n'
+        for _ in range(100):
+            yield b"x" * 1000
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert client.seen == []
@@ -0,0 +1,66 @@
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from pipeline.callbacks import CallbackRefused, callback_url_error, post_callback
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/hook',
+    'http://localhost:8080/hook',
+    'http://169.254.169.254/latest/meta-data/',
+    'http://10.0.0.5/hook',
+    'http://[::1]/hook',
+    'http://[::ffff:192.168.1.1]/hook',
+])
+def test_private_targets_are_rejected(url):
+    assert 'private' in callback_url_error(url)
+
+
+@pytest.mark.parametrize('url', ['ftp://example.com/x', 'file:///etc/passwd', 'http:///nohost'])
+def test_non_http_urls_are_rejected(url):
+    assert callback_url_error(url) == "callback_url must be an http(s) URL"
+
+
+def test_allowlist():
+    allowed = ['.example.com', 'hooks.partner.io']
+    assert 'not allowed' in callback_url_error('https://evil.io/x', allowed)
+    assert 'not allowed' in callback_url_error('https://example.com.evil.io/x', allowed)
+    assert callback_url_error('https://127.0.0.1/x', ['127.0.0.1'], allow_private=True) is None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/hook')
+        else:
+            self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = HTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_delivery_refuses_private_peer(local_server):
+    with pytest.raises(CallbackRefused):
+        post_callback(f"{local_server}/hook", b'{}', timeout=5)
+
+
+def test_delivery_does_not_follow_redirects(local_server):
+    assert post_callback(f"{local_server}/hook", b'{}', timeout=5, allow_private=True) == 204
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post_callback(f"{local_server}/redirect", b'{}', timeout=5, allow_private=True)
+    assert error.value.code == 302
@@ -0,0 +1,76 @@
+import types
+
+import numpy as np
+import pytest
+
+import pipeline.ocr as ocr
+import pipeline.ocr_engines as ocr_engines
+from pipeline.ocr import TextExtractor
+from pipeline.ocr_engines import EasyOCRReader, get_easyocr_reader
+
+
+@pytest.fixture
+def fake_easyocr(monkeypatch):
+    """easyocr stand-in recording the readers loaded and the calls they get"""
+    loaded = []
+
+    class Reader:
+        def __init__(self, languages, gpu=False, verbose=True):
+            self.calls = []
+            loaded.append((tuple(languages), gpu))
+
+        def readtext(self, image, detail=1, batch_size=1):
+            self.calls.append(('readtext', 1))
+            return [f"page {image[0, 0]}"]
+
+        def readtext_batched(self, images, detail=1, batch_size=1):
+            self.calls.append(('readtext_batched', len(images)))
+            return [[f"page {image[0, 0]}"] for image in images]
+
+    monkeypatch.setattr(ocr_engines, 'EASYOCR_AVAILABLE', True)
+    monkeypatch.setattr(ocr_engines, 'easyocr', types.SimpleNamespace(Reader=Reader))
+    monkeypatch.setattr(ocr_engines, '_easyocr_readers', {})
+    return loaded
+
+
+def test_readers_are_cached_per_language_set(fake_easyocr):
+    reader = get_easyocr_reader(('en', 'ar'))
+    assert get_easyocr_reader(['ar', 'en']) is reader
+    assert get_easyocr_reader(('en',)) is not reader
+    assert get_easyocr_reader(('en', 'ar'), gpu=True) is not reader
+    assert fake_easyocr == [(('en', 'ar'), False), (('en',), False), (('en', 'ar'), True)]
+
+
+def test_pages_of_the_same_shape_are_recognized_together(fake_easyocr):
+    reader = EasyOCRReader(('en',))
+    pages = [np.full((20, 30), value, np.uint8) for value in (1, 2, 3)] + [np.full((40, 30), 4, np.uint8)]
+    assert reader.readtext_pages(pages) == ['page 1', 'page 2', 'page 3', 'page 4']
+    assert reader.reader.calls == [('readtext_batched', 3), ('readtext', 1)]
+
+
+class _BatchRecordingReader:
+    def __init__(self):
+        self.batches = []
+
+    def readtext_pages(self, pages, batch_size=8, detail=False):
+        self.batches.append(len(pages))
+        return [f"text {len(self.batches)}.{i}" for i in range(len(pages))]
+
+
+def test_pages_are_ocrd_in_batches(make_scanned_pdf, monkeypatch):
+    reader = _BatchRecordingReader()
+    monkeypatch.setattr(ocr, 'get_easyocr_reader', lambda languages: reader)
+    pages = list(range(ocr.EASYOCR_PAGE_BATCH + 2))
+    path = make_scanned_pdf(pages)
+    texts = TextExtractor(language_detection=False)._easyocr_pages(path, pages, {'fallbacks': []})
+    assert reader.batches == [ocr.EASYOCR_PAGE_BATCH, 2]
+    assert texts[0] == 'text 1.0' and texts[-1] == 'text 2.1'
+
+
+def test_duplicate_pages_are_left_out_of_the_batch(make_scanned_pdf, monkeypatch):
+    reader = _BatchRecordingReader()
+    monkeypatch.setattr(ocr, 'get_easyocr_reader', lambda languages: reader)
+    path = make_scanned_pdf([1, 2, 1])
+    texts = TextExtractor(language_detection=False)._easyocr_pages(path, [0, 1, 2], {'fallbacks': []})
+    assert reader.batches == [2]
+    assert texts[2] == texts[0]
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pipeline import executor as executor_module
+from pipeline.executor import PipelineExecutor
+
+# Fork so the patched warm-up reaches the worker processes
+fork_executor = pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs the fork start method")
+
+
+def _start(monkeypatch, warm_up, timeout=30.0):
+    monkeypatch.setattr(executor_module.PipelinePool, 'warm_up', warm_up)
+    executor = PipelineExecutor(workers=1, start_method='fork', startup_timeout=timeout)
+    try:
+        return executor.start([False])
+    finally:
+        executor.shutdown()
+
+
+def _failing_warm_up(self, variants):
+    raise ValueError("spaCy model missing")
+
+
+def _dying_warm_up(self, variants):
+    os._exit(1)
+
+
+def _hanging_warm_up(self, variants):
+    time.sleep(60)
+
+
+@fork_executor
+def test_start_reports_ready_workers(monkeypatch):
+    report = _start(monkeypatch, lambda self, variants: None)
+    assert report['mode'] == 'process'
+    assert report['workers'] == 1
+
+
+@fork_executor
+def test_start_surfaces_warm_up_error(monkeypatch):
+    with pytest.raises(RuntimeError, match="spaCy model missing"):
+        _start(monkeypatch, _failing_warm_up)
+
+
+@fork_executor
+def test_start_fails_when_worker_dies(monkeypatch):
+    with pytest.raises(RuntimeError, match="died during warm-up"):
+        _start(monkeypatch, _dying_warm_up)
+
+
+@fork_executor
+def test_start_times_out(monkeypatch):
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError, match="not warm after"):
+        _start(monkeypatch, _hanging_warm_up, timeout=1.0)
+    assert time.perf_counter() - started < 30
+
+
+def test_cancelled_waiter_does_not_swallow_the_freed_slot():
+    executor = PipelineExecutor(workers=0, queue_size=0)
+
+    async def scenario():
+        executor.in_flight = executor.capacity
+        first = asyncio.create_task(executor._admit(wait=True))
+        second = asyncio.create_task(executor._admit(wait=True))
+        await asyncio.sleep(0.01)
+        await executor._release()
+        first.cancel()  # Woken for the slot, but cancelled before taking it
+        await asyncio.wait_for(second, 1)
+        return first.cancelled()
+
+    assert asyncio.run(scenario())
+    assert executor.in_flight == executor.capacity
+
+
+def test_cancelled_queued_requests_leave_room_for_the_others(monkeypatch):
+    release = threading.Event()
+
+    def fake_run_pipeline(file_path, *args):
+        if file_path == 'blocking.pdf':
+            release.wait(5)
+        return {'file': file_path}
+
+    monkeypatch.setattr(executor_module, 'run_pipeline', fake_run_pipeline)
+    executor = PipelineExecutor(workers=0, queue_size=0)
+    executor._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def scenario():
+        running = asyncio.create_task(executor.run('blocking.pdf'))
+        await asyncio.sleep(0.01)
+        queued = [asyncio.create_task(executor.run(f'{n}.pdf', wait=True)) for n in range(4)]
+        await asyncio.sleep(0.01)
+        for task in queued[:3]:
+            task.cancel()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(running, queued[3]), 5)
+
+    try:
+        assert asyncio.run(scenario()) == [{'file': 'blocking.pdf'}, {'file': '3.pdf'}]
+    finally:
+        executor._executor.shutdown()
+    assert executor.in_flight == 0
@@ -0,0 +1,99 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+import api
+from config import Config
+from pipeline.job_store import JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'jobs.db'))
+
+
+def _finished_job(store, callback_url='https://hooks.example.com/done'):
+    job_id = store.create('doc', '/tmp/doc.pdf', 'd' * 64, ['classify'], 'v1', callback_url=callback_url)
+    store.finish(job_id, {'document_family': 'contract'})
+    return job_id
+
+
+def test_undelivered_callbacks_are_pending(store):
+    pending = _finished_job(store)
+    retrying = _finished_job(store)
+    store.set_callback_status(retrying, 'retrying: timed out', 1)
+    delivered = _finished_job(store)
+    store.set_callback_status(delivered, 'delivered (204)', 1)
+    failed = _finished_job(store)
+    store.set_callback_status(failed, 'failed: timed out', 3)
+    _finished_job(store, callback_url=None)
+    store.create('doc', '/tmp/doc.pdf', 'd' * 64, ['classify'], 'v1', callback_url='https://hooks.example.com/q')
+    assert sorted(store.pending_callbacks()) == sorted([pending, retrying])
+    assert store.get(retrying)['callback_attempts'] == 1
+
+
+def test_job_files_without_callback_attempts_are_migrated(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, document_id TEXT, "
+        "file_path TEXT, file_digest TEXT, requested_tasks TEXT, ai_version TEXT, "
+        "callback_url TEXT, callback_status TEXT, stage TEXT, progress REAL DEFAULT 0, "
+        "result TEXT, error TEXT, owner_pid INTEGER, "
+        "created_at REAL, started_at REAL, finished_at REAL, updated_at REAL)"
+    )
+    db.execute("INSERT INTO jobs (id, status, callback_status) VALUES ('old', 'done', 'pending')")
+    db.commit()
+    db.close()
+    store = JobStore(path)
+    assert store.get('old')['callback_attempts'] == 0
+    assert store.pending_callbacks() == ['old']
+
+
+@pytest.fixture
+def delivery(store, monkeypatch):
+    """Run _deliver_callback against `store`, recording posts and backoff sleeps"""
+    posts, sleeps = [], []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(api, 'job_store', store)
+    monkeypatch.setattr(Config, 'CALLBACK_RETRIES', 3)
+    monkeypatch.setattr(api.asyncio, 'sleep', fake_sleep)
+
+    def deliver(job_id, responses):
+        def fake_post(url, payload, timeout, allow_private):
+            response = responses[len(posts)]
+            posts.append(url)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        monkeypatch.setattr(api, 'post_callback', fake_post)
+        asyncio.run(api._deliver_callback(job_id))
+        return posts, sleeps
+
+    return deliver
+
+
+def test_interrupted_delivery_resumes_with_its_backoff(store, delivery):
+    job_id = _finished_job(store)
+    store.set_callback_status(job_id, 'retrying: connection refused', 1)  # Then the server restarted
+    posts, sleeps = delivery(job_id, [TimeoutError('timed out'), 204])
+    assert (len(posts), sleeps) == (2, [1, 2])
+    job = store.get(job_id)
+    assert (job['callback_status'], job['callback_attempts']) == ('delivered (204)', 3)
+    assert store.pending_callbacks() == []
+
+
+def test_delivery_gives_up_after_the_last_retry(store, delivery):
+    job_id = _finished_job(store)
+    posts, sleeps = delivery(job_id, [ConnectionError('refused')] * 3)
+    assert (len(posts), sleeps) == (3, [1, 2])
+    job = store.get(job_id)
+    assert (job['callback_status'], job['callback_attempts']) == ('failed: refused', 3)
+    assert store.pending_callbacks() == []
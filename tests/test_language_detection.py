@@ -0,0 +1,73 @@
+import pipeline.ocr as ocr
+from pipeline.language_detection import select_languages
+from pipeline.ocr import TextExtractor
+
+ITALIAN = "Il contratto della società è stato firmato dal presidente e dal consiglio di amministrazione " * 3
+ENGLISH = "The agreement of the parties is signed by the board and the chairman of the company for the year " * 3
+ARABIC = "هذه الشهادة صادرة من وزارة التربية والتعليم في دولة الإمارات العربية المتحدة " * 3
+
+
+def test_latin_languages_by_function_words():
+    assert select_languages(ITALIAN, ['ita', 'eng']) == ['ita']
+    assert select_languages(ENGLISH, ['ita', 'eng']) == ['eng']
+    assert select_languages(ITALIAN + ENGLISH, ['ita', 'eng']) == ['ita', 'eng']
+
+
+def test_arabic_script():
+    assert select_languages(ARABIC, ['en', 'ar']) == ['ar']
+    assert select_languages(ARABIC + ENGLISH, ['en', 'ar']) == ['en', 'ar']
+
+
+def test_short_sample_is_inconclusive():
+    assert select_languages("Fattura 12", ['ita', 'eng']) is None
+
+
+def test_tesseract_languages_are_narrowed():
+    extractor = TextExtractor(tesseract_lang='ita+eng', language_detection=True)
+    stats = {}
+    languages = extractor._document_languages(False, stats, text=ENGLISH)
+    assert languages['tesseract'] == 'eng'
+    assert stats['ocr_language_source'] == 'text_layer'
+
+
+class _FakeReader:
+    def __init__(self, languages):
+        self.languages = tuple(languages)
+
+    def readtext(self, image, detail=False):
+        return ''
+
+
+def test_easyocr_languages_are_narrowed_to_warmed_readers(monkeypatch):
+    built = {}
+    monkeypatch.setattr(ocr, 'EASYOCR_AVAILABLE', True)
+    monkeypatch.setattr(ocr, 'get_easyocr_reader', lambda languages: built.setdefault(tuple(languages), _FakeReader(languages)))
+    extractor = TextExtractor(use_easyocr=True, easyocr_languages=('en', 'ar'), language_detection=True)
+    assert extractor.warm_up_easyocr() == 'ready'
+    assert set(built) == {('en', 'ar'), ('en',)}
+
+    stats = {}
+    languages = extractor._document_languages(True, stats, text=ENGLISH)
+    assert languages['easyocr'] == ('en',)
+    assert (stats['ocr_languages'], stats['ocr_language_source']) == ('en', 'text_layer')
+    # English is kept next to Arabic
+    assert extractor._document_languages(True, {}, text=ARABIC)['easyocr'] == ('en', 'ar')
+    assert set(built) == {('en', 'ar'), ('en',)}  # No reader built after warm-up
+
+
+def test_page_workers_load_every_selectable_language(monkeypatch):
+    loaded = []
+
+    class Engine:
+        def __init__(self, lang):
+            self.lang = lang
+
+        def image_to_string(self, image, dpi=None):
+            loaded.append(self.lang)
+            return ''
+
+    monkeypatch.setattr(ocr, 'get_engine', lambda name, lang: Engine(lang))
+    monkeypatch.delenv('OMP_THREAD_LIMIT', raising=False)  # Set by the worker initializer
+    extractor = TextExtractor(tesseract_lang='ita+eng', language_detection=True)
+    ocr._init_page_worker(*extractor._page_pool_warm())
+    assert loaded == ['ita+eng', 'ita', 'eng']
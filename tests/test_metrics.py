@@ -0,0 +1,95 @@
+import hashlib
+import math
+
+from fastapi.testclient import TestClient
+
+import api
+from pipeline.metrics import MetricsRegistry, _format_value
+
+
+def test_format_value():
+    assert [_format_value(v) for v in (3, 2.0, 0.25, math.inf, -math.inf)] == ['3', '2', '0.25', '+Inf', '-Inf']
+
+
+def test_counter_and_gauge_exposition():
+    registry = MetricsRegistry()
+    counter = registry.counter('jobs_total', 'Jobs done', ['status'])
+    counter.inc(status='ok')
+    counter.inc(2, status='failed')
+    gauge = registry.gauge('queue_depth', 'Queued jobs')
+    gauge.set(5)
+    gauge.dec()
+    registry.gauge('workers', 'Workers by pool', ['pool'], callback=lambda: {'page': 4, 'stage': 2})
+    assert registry.render() == (
+        '# HELP jobs_total Jobs done\n'
+        '# TYPE jobs_total counter\n'
+        'jobs_total{status="failed"} 2\n'
+        'jobs_total{status="ok"} 1\n'
+        '# HELP queue_depth Queued jobs\n'
+        '# TYPE queue_depth gauge\n'
+        'queue_depth 4\n'
+        '# HELP workers Workers by pool\n'
+        '# TYPE workers gauge\n'
+        'workers{pool="page"} 4\n'
+        'workers{pool="stage"} 2\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('stage_seconds', 'Stage time', ['stage'], buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(seconds, stage='ocr')
+    assert histogram.render()[2:] == [
+        'stage_seconds_bucket{stage="ocr",le="0.1"} 1',
+        'stage_seconds_bucket{stage="ocr",le="1"} 3',
+        'stage_seconds_bucket{stage="ocr",le="+Inf"} 4',
+        'stage_seconds_sum{stage="ocr"} 4.25',
+        'stage_seconds_count{stage="ocr"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter('errors_total', 'Errors', ['message']).inc(message='bad "path"\\C:\nline')
+    assert 'errors_total{message="bad \\"path\\"\\\\C:\\nline"} 1' in registry.render()
+
+
+def test_failing_callback_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.gauge('broken', 'Broken collector', callback=lambda: 1 / 0)
+    registry.gauge('ok', 'Working collector', callback=lambda: 1)
+    assert registry.render().endswith('# TYPE ok gauge\nok 1\n')
+
+
+def test_analyze_records_stage_and_fallback_metrics(monkeypatch):
+    async def fake_run(file_path, **kwargs):
+        return {
+            "success": True,
+            "errors": [],
+            "metadata": {
+                "stage_timings": {"text_extraction": 0.2, "family_classification": 0.01},
+                "pipeline_seconds": 0.21,
+                "text_extraction": {"method": "pymupdf", "fallbacks": ["pymupdf->pdfplumber"]},
+            },
+        }
+
+    monkeypatch.setattr(api.executor, "run", fake_run)
+    monkeypatch.setattr(api, "result_cache", None)
+    content = b"%PDF metrics"
+    client = TestClient(api.app)
+    response = client.post(
+        "/analyze",
+        data={
+            "document_id": "doc",
+            "hash": "sha256:" + hashlib.sha256(content).hexdigest(),
+            "requested_tasks": "classify",
+        },
+        files={"file": ("doc.pdf", content)},
+    )
+    assert response.status_code == 200
+    exposition = client.get("/metrics").text
+    assert 'certifi_stage_duration_seconds_count{stage="text_extraction"}' in exposition
+    assert 'certifi_stage_duration_seconds_bucket{stage="family_classification",le="+Inf"}' in exposition
+    assert 'certifi_text_extraction_fallbacks_total{fallback="pymupdf->pdfplumber"}' in exposition
+    assert 'certifi_text_extraction_total{method="pymupdf",ocr_engine="none"}' in exposition
@@ -0,0 +1,36 @@
+import fitz  # PyMuPDF
+
+from pipeline.mrz_parser import MRZParser
+from pipeline.page_model import PageModel
+
+MRZ = [
+    "P<ITAROSSI<<MARIO<<<<<<<<<<<<<<<<<<<<<<<<<<<",
+    "YA12345674ITA8001014M3001012<<<<<<<<<<<<<<02",
+]
+# Body line that looks like an MRZ line (reference code)
+BODY = "PRATICA<<N<<2024<<000123<<UFFICIO<<ANAGRAFE"
+
+
+def _page_model(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((40, 100), BODY, fontname='cour', fontsize=9)
+    for i, line in enumerate(MRZ):
+        page.insert_text((40, 730 + 14 * i), line, fontname='cour', fontsize=9)
+    path = tmp_path / 'passport.pdf'
+    doc.save(path)
+    return PageModel.from_pymupdf(fitz.open(path)[0])
+
+
+def test_mrz_is_read_from_the_bottom_of_the_page(tmp_path):
+    result = MRZParser().parse_page_models([_page_model(tmp_path)])
+    assert result['found'] and result['format'] == 'TD3'
+    assert result['raw_mrz'] == '\n'.join(MRZ)
+    # Read from the whole text, the body line is taken for an MRZ line
+    assert MRZParser().parse('\n'.join([BODY] + MRZ))['raw_mrz'] != '\n'.join(MRZ)
+
+
+def test_page_without_mrz_is_not_found(tmp_path):
+    doc = fitz.open()
+    doc.new_page().insert_text((40, 730), "Pagina 1 di 1", fontsize=9)
+    assert not MRZParser().parse_page_models([PageModel.from_pymupdf(doc[0])])['found']
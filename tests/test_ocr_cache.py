@@ -0,0 +1,73 @@
+import fitz  # PyMuPDF
+import numpy as np
+
+import pipeline.ocr as ocr
+from pipeline.ocr import TextExtractor, _duplicate_pages
+from pipeline.ocr_cache import raster_key, source_fingerprints
+
+from conftest import requires_tesseract
+
+
+def test_distinct_scans_have_distinct_fingerprints(make_scanned_pdf):
+    doc = fitz.open(make_scanned_pdf([1, 2]))
+    # Same content stream, only the image behind the name differs
+    assert doc[0].read_contents() == doc[1].read_contents()
+    fingerprints = source_fingerprints(doc, [0, 1])
+    assert fingerprints[0] != fingerprints[1]
+    assert _duplicate_pages(doc, [0, 1]) == {0: 0, 1: 1}
+
+
+def test_repeated_scan_is_a_duplicate(make_scanned_pdf):
+    doc = fitz.open(make_scanned_pdf([1, 2, 1]))
+    assert _duplicate_pages(doc, [0, 1, 2]) == {0: 0, 1: 1, 2: 0}
+
+
+def test_raster_key_depends_on_pixels_and_settings():
+    raster = np.zeros((20, 30), np.uint8)
+    changed = raster.copy()
+    changed[5, 5] = 1
+    key = raster_key(raster, 'pytesseract', 'eng', 150)
+    assert key == raster_key(raster.copy(), 'pytesseract', 'eng', 150)
+    assert key != raster_key(changed, 'pytesseract', 'eng', 150)
+    assert key != raster_key(raster, 'pytesseract', 'ita+eng', 150)
+    assert key != raster_key(raster, 'pytesseract', 'eng', 300)
+
+
+@requires_tesseract
+def test_distinct_scans_are_all_ocrd(make_scanned_pdf):
+    path = make_scanned_pdf([1, 2])
+    stats = {}
+    TextExtractor(language_detection=False).extract(path, stats)
+    assert stats['ocr_duplicate_pages'] == 0
+
+    stats = {}
+    list(TextExtractor(language_detection=False).iter_pages(path, stats))
+    assert stats['ocr_duplicate_pages'] == 0
+
+
+class _CountingEngine:
+    name = 'fake'
+
+    def __init__(self):
+        self.calls = 0
+
+    def image_to_string(self, image, dpi=None):
+        self.calls += 1
+        return f"page text {self.calls}"
+
+
+def test_cached_page_is_not_ocrd_again(make_scanned_pdf, monkeypatch, tmp_path):
+    engine = _CountingEngine()
+    monkeypatch.setattr(ocr, 'get_engine', lambda name, lang: engine)
+    options = {'max_entries': 16, 'max_bytes': 1 << 20, 'ttl_seconds': 60, 'disk_path': str(tmp_path / 'ocr.db')}
+    extractor = TextExtractor(language_detection=False, ocr_cache=options)
+
+    stats = {}
+    first = extractor._ocr_pdf_pages(make_scanned_pdf([1, 2], name='a.pdf'), None, stats=stats)
+    assert stats['ocr_cache'] == {'hits': 0, 'misses': 2}
+    # Another document sharing the first scan
+    stats = {}
+    second = extractor._ocr_pdf_pages(make_scanned_pdf([1, 3], name='b.pdf'), None, stats=stats)
+    assert stats['ocr_cache'] == {'hits': 1, 'misses': 1}
+    assert second[0] == first[0]
+    assert engine.calls == 3
@@ -0,0 +1,96 @@
+import sys
+import threading
+import types
+
+import cv2
+import numpy as np
+import pytest
+
+import pipeline.ocr_engines as ocr_engines
+from pipeline.ocr_engines import PytesseractEngine, TesserocrEngine, get_engine
+
+
+@pytest.fixture(autouse=True)
+def engines(monkeypatch):
+    monkeypatch.setattr(ocr_engines, '_engines', {})
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    """tesserocr stand-in counting the API handles created"""
+    handles = []
+
+    class PyTessBaseAPI:
+        def __init__(self, lang):
+            self.lang = lang
+            handles.append(self)
+
+        def SetImageBytes(self, data, width, height, bytes_per_pixel, bytes_per_line):
+            pass
+
+        def GetUTF8Text(self):
+            return 'testo'
+
+        def Clear(self):
+            pass
+
+    module = types.ModuleType('tesserocr')
+    module.PyTessBaseAPI = PyTessBaseAPI
+    monkeypatch.setitem(sys.modules, 'tesserocr', module)
+    monkeypatch.setattr(ocr_engines, 'TESSEROCR_AVAILABLE', True)
+    return handles
+
+
+def test_pytesseract_is_selected_by_name():
+    engine = get_engine('pytesseract', 'eng')
+    assert isinstance(engine, PytesseractEngine) and engine.lang == 'eng'
+
+
+@pytest.mark.parametrize('name', ['auto', 'tesserocr'])
+def test_falls_back_to_pytesseract_without_tesserocr(monkeypatch, capsys, name):
+    monkeypatch.setattr(ocr_engines, 'TESSEROCR_AVAILABLE', False)
+    engine = get_engine(name, 'ita+eng')
+    assert isinstance(engine, PytesseractEngine)
+    assert get_engine(name, 'ita+eng') is engine
+    # Only an explicit request for tesserocr warns about the fallback
+    assert ('falling back to pytesseract' in capsys.readouterr().out) == (name == 'tesserocr')
+
+
+def test_unknown_engine_name_uses_auto(monkeypatch, capsys):
+    monkeypatch.setattr(ocr_engines, 'TESSEROCR_AVAILABLE', False)
+    assert isinstance(get_engine('paddle', 'eng'), PytesseractEngine)
+    assert "Unknown OCR engine 'paddle'" in capsys.readouterr().out
+
+
+def test_auto_selects_tesserocr_when_available(fake_tesserocr):
+    engine = get_engine('auto', 'eng')
+    assert isinstance(engine, TesserocrEngine)
+    assert get_engine('tesserocr', 'eng') is engine
+    assert get_engine('auto', 'ita') is not engine
+
+
+def test_tesserocr_handle_is_reused_per_thread(fake_tesserocr):
+    engine = get_engine('tesserocr', 'eng')
+    page = np.full((40, 120), 255, np.uint8)
+    assert [engine.image_to_string(page) for _ in range(3)] == ['testo'] * 3
+    assert len(fake_tesserocr) == 1  # Created by the constructor, reused by each call
+
+    thread_handles = []
+    threads = [threading.Thread(target=lambda: thread_handles.append(engine._api())) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fake_tesserocr) == 3 and len({id(handle) for handle in thread_handles}) == 2
+    assert engine._api() is fake_tesserocr[0]
+
+
+def test_real_tesserocr_reads_a_page():
+    pytest.importorskip('tesserocr')
+    engine = get_engine('auto', 'eng')
+    assert isinstance(engine, TesserocrEngine)
+    page = np.full((120, 600), 255, np.uint8)
+    cv2.putText(page, 'INVOICE 2024', (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 3)
+    assert 'INVOICE' in engine.image_to_string(page, dpi=300)
+    data = engine.image_to_data(page, dpi=300)
+    assert 'INVOICE' in data['text'] and set(data['line_num']) == {0}
@@ -0,0 +1,38 @@
+import fitz  # PyMuPDF
+
+import pipeline.ocr as ocr
+from pipeline.ocr import TextExtractor, _embedded_page_image
+
+
+def _fake_ocr_page(file_path, page_num, *args, **kwargs):
+    if page_num == 1:
+        raise RuntimeError("engine crashed")
+    return {
+        'text': f'page {page_num}', 'key': f'key:{page_num}', 'cache': None,
+        'source': 'render', 'pixels': 1000,
+    }
+
+
+def test_failed_page_keeps_other_pages(make_scanned_pdf, monkeypatch):
+    monkeypatch.setattr(ocr, '_ocr_page', _fake_ocr_page)
+    extractor = TextExtractor(ocr_engine='pytesseract', language_detection=False)
+    stats = {}
+    texts = extractor._ocr_pdf_pages(make_scanned_pdf([1, 2, 3]), None, stats=stats)
+    assert texts == ['page 0', '', 'page 2']
+    assert stats['ocr_failed_pages'] == 1
+    assert stats['ocr_page_sources'] == {'render': 2}
+
+
+def test_plain_scan_is_decoded_directly(make_scanned_pdf):
+    doc = fitz.open(make_scanned_pdf([1]))
+    gray, dpi = _embedded_page_image(doc, doc[0])
+    assert gray.shape == (800, 600)
+    assert dpi == 96
+
+
+def test_scan_with_overlay_is_rendered(make_scanned_pdf):
+    doc = fitz.open(make_scanned_pdf([1, 2]))
+    doc[0].insert_text((72, 72), "Filled in: 12345", fontsize=11)
+    doc[1].draw_rect(fitz.Rect(50, 50, 150, 100), color=(1, 0, 0))
+    assert _embedded_page_image(doc, doc[0]) is None
+    assert _embedded_page_image(doc, doc[1]) is None
@@ -0,0 +1,72 @@
+import pickle
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from pipeline.page_model import PageModel
+
+OCR_WORDS = {
+    'text': ['FATTURA', 'N.', '12', 'Totale', 'EUR', '100,00'],
+    'left': [100, 300, 360, 100, 300, 400],
+    'top': [100, 100, 100, 1500, 1500, 1500],
+    'width': [180, 40, 40, 120, 60, 100],
+    'height': [30, 30, 30, 30, 30, 30],
+    'conf': [95, 90, -1, 80, 70, 60],
+    'block_num': [0, 0, 0, 1, 1, 1],
+    'line_num': [0, 0, 0, 1, 1, 1],
+}
+
+
+def _ocr_model():
+    # 1275 x 1650 px raster of a letter page at 150 dpi
+    return PageModel.from_ocr_words(OCR_WORDS, 0, 1275, 1650, scale=72 / 150, unit='pt')
+
+
+def test_ocr_words_are_scaled_to_points():
+    model = _ocr_model()
+    assert len(model) == 6
+    assert (model.width, model.height) == (612, 792)
+    assert np.allclose(model.boxes[0], [48, 48, 134.4, 62.4])
+    assert model.confidences[2] == 0  # Tesseract's -1 clipped
+
+
+def test_text_lines_and_blocks():
+    model = _ocr_model()
+    assert model.text() == "FATTURA N. 12\n\nTotale EUR 100,00"
+    assert [line['text'] for line in model.lines()] == ["FATTURA N. 12", "Totale EUR 100,00"]
+    blocks = model.blocks()
+    assert [(block['lines'], block['words']) for block in blocks] == [(1, 3), (1, 3)]
+    assert blocks[1]['confidence'] == 70.0
+
+
+def test_region_selects_by_word_center():
+    bottom = _ocr_model().region(0, 0.75, 1, 1)
+    assert bottom.words == ['Totale', 'EUR', '100,00']
+    assert bottom.mean_confidence() == 70.0
+    assert len(_ocr_model().region(0.9, 0, 1, 0.1)) == 0
+
+
+def test_text_layer_model(make_text_pdf):
+    doc = fitz.open(make_text_pdf([["Fattura n. 12", "Totale EUR 100,00"]]))
+    model = PageModel.from_pymupdf(doc[0])
+    assert model.source == 'text_layer' and model.unit == 'pt'
+    assert [line['text'] for line in model.lines()] == ["Fattura n. 12", "Totale EUR 100,00"]
+    assert model.mean_confidence() == 100.0
+
+
+def test_easyocr_detections_are_lines():
+    results = [
+        ([[10, 10], [200, 12], [200, 40], [10, 38]], "CERTIFICATE", 0.9),
+        ([[10, 60], [150, 60], [150, 90], [10, 90]], "OF COMPLETION", 0.5),
+    ]
+    model = PageModel.from_easyocr(results, 0, 400, 300)
+    assert np.allclose(model.boxes[0], [10, 10, 200, 40])
+    assert model.text() == "CERTIFICATE\nOF COMPLETION"
+    assert model.mean_confidence() == 70.0
+
+
+def test_model_pickles():
+    model = _ocr_model()
+    copy = pickle.loads(pickle.dumps(model))
+    assert copy.words == model.words and np.array_equal(copy.boxes, model.boxes)
+    assert copy.summary() == model.summary()
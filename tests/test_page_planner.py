@@ -0,0 +1,47 @@
+import fitz  # PyMuPDF
+
+from pipeline.page_planner import PagePlanner
+
+from conftest import scan_png
+
+LINES = ["Contratto di fornitura tra le parti indicate di seguito, valido per l'anno in corso."] * 5
+
+
+def _mixed_pdf(tmp_path):
+    """Text page, scanned page, blank page, scan with a page number stamped on it"""
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, line in enumerate(LINES):
+        page.insert_text((72, 72 + 16 * i), line, fontsize=11)
+    doc.new_page().insert_image(fitz.Rect(0, 0, 595, 842), stream=scan_png(1))
+    doc.new_page()
+    page = doc.new_page()
+    page.insert_image(fitz.Rect(0, 0, 595, 842), stream=scan_png(2))
+    page.insert_text((280, 820), "Pagina 4 di 4 - Rif. 2024/0001", fontsize=9)
+    path = tmp_path / 'mixed.pdf'
+    doc.save(path)
+    return str(path)
+
+
+def test_each_page_gets_its_action(tmp_path):
+    plan = PagePlanner().plan(_mixed_pdf(tmp_path))
+    assert [(entry['action'], entry['reason']) for entry in plan] == [
+        ('text', 'text_layer'),
+        ('ocr', 'no_text_layer'),
+        ('skip', 'blank'),
+        ('ocr', 'scan_with_sparse_text'),
+    ]
+    assert plan[0]['pixel_std'] is None  # Text pages are not rendered
+    assert plan[1]['image_coverage'] > 0.9
+
+
+def test_small_print_is_not_blank():
+    doc = fitz.open()
+    doc.new_page().draw_rect(fitz.Rect(300, 400, 340, 404), color=(0, 0, 0), fill=(0, 0, 0))
+    entry = PagePlanner().plan_page(doc[0])
+    assert entry['action'] == 'ocr'
+
+
+def test_thresholds_can_be_overridden(tmp_path):
+    plan = PagePlanner({'min_text_chars': 10_000}).plan(_mixed_pdf(tmp_path))
+    assert plan[0]['action'] == 'ocr'
@@ -0,0 +1,33 @@
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+
+from pipeline.ocr import _pixmap_array, _work_buffer
+from pipeline.preprocessing import DocumentPreprocessor
+
+
+def test_pixmap_array_is_a_view(make_text_pdf):
+    doc = fitz.open(make_text_pdf([["Fattura n. 12 del 01/02/2024"]]))
+    pix = doc[0].get_pixmap(colorspace=fitz.csGRAY, alpha=False)
+    gray = _pixmap_array(pix)
+    assert gray.shape == (pix.height, pix.width)
+    assert not gray.flags.owndata and not gray.flags.writeable
+    assert gray.tobytes() == pix.samples
+
+
+def test_work_buffer_is_reused_per_page_size():
+    buffer = _work_buffer((100, 80))
+    assert _work_buffer((100, 80)) is buffer
+    assert _work_buffer((120, 80)).shape == (120, 80)
+
+
+@pytest.mark.parametrize('tier', ['none', 'median', 'nlmeans'])
+def test_preprocessing_writes_into_the_buffer(tier):
+    gray = np.full((60, 80), 230, np.uint8)
+    gray[20:40, 10:70] = 20
+    source = gray.copy()
+    out = np.empty_like(gray)
+    result = DocumentPreprocessor().preprocess_image_from_array(gray, out=out, tier=tier)
+    assert result is out
+    assert np.array_equal(gray, source)  # Input left untouched
+    assert set(np.unique(out)) == {0, 255}
@@ -0,0 +1,56 @@
+import pytest
+
+from pipeline.family_classifier import DocumentFamily, DocumentSubtype
+from pipeline.ocr import TextExtractor
+from pipeline.orchestrator import DocumentPipeline
+
+PAGES = [
+    ["Contratto di prestazione d'opera tra le parti sottoscritte", "Articolo 1 - Oggetto del contratto"],
+    ["Articolo 2 - Durata e compenso pattuito tra le parti"],
+    ["Articolo 3 - Recesso e foro competente per le controversie"],
+]
+
+
+@pytest.fixture
+def pipeline():
+    # Reading page by page never uses the stage thread pool
+    return DocumentPipeline(stage_concurrency=1, classify_early_exit=0.85)
+
+
+def test_pages_stream_in_order(make_text_pdf):
+    path = make_text_pdf(PAGES)
+    extractor = TextExtractor()
+    stats = {}
+    pages = list(extractor.iter_pages(path, stats))
+    assert [page_num for page_num, _ in pages] == [0, 1, 2]
+    assert stats['pages_read'] == 3
+    streamed = extractor.preprocessor.process("\n\n".join(text for _, text in pages))
+    assert streamed == extractor.extract(path)
+
+
+def test_classify_only_stops_once_confident(pipeline, make_text_pdf, monkeypatch):
+    calls = []
+
+    def classify(text):
+        calls.append(text)
+        return {
+            'family': DocumentFamily.CONTRACT, 'subtype': DocumentSubtype.ENGAGEMENT_LETTER,
+            'confidence': 0.9, 'source': 'test',
+        }
+
+    monkeypatch.setattr(pipeline.family_classifier, 'classify', classify)
+    stats = {}
+    text, classification = pipeline._extract_until_classified(make_text_pdf(PAGES), stats)
+    assert stats['early_exit'] and stats['pages_read'] == 1
+    assert len(calls) == 1 and 'Articolo 2' not in text
+    assert classification['family'] == DocumentFamily.CONTRACT
+
+
+def test_unsure_classification_reads_every_page(pipeline, make_text_pdf, monkeypatch):
+    monkeypatch.setattr(pipeline.family_classifier, 'classify', lambda text: {
+        'family': DocumentFamily.CONTRACT, 'subtype': None, 'confidence': 0.95, 'source': 'test',
+    })
+    stats = {}
+    text, _ = pipeline._extract_until_classified(make_text_pdf(PAGES), stats)
+    assert not stats['early_exit'] and stats['pages_read'] == 3
+    assert 'Articolo 3' in text
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+import pipeline.pipeline_pool as pipeline_pool
+from pipeline.orchestrator import DocumentPipeline
+from pipeline.pipeline_pool import PipelinePool
+
+
+class _Component:
+    def __init__(self, calls, name):
+        self.calls = calls
+        self.name = name
+
+    def warm_up(self):
+        self.calls.append(self.name)
+        return 'ready'
+
+    def warm_up_easyocr(self):
+        self.calls.append(f"{self.name}.easyocr")
+        return 'unavailable'
+
+
+class _StubPipeline:
+    """Pipeline without stages: records how it was built and warmed"""
+
+    built = []
+    warm_up = DocumentPipeline.warm_up  # The real warm-up, over the stub components
+
+    def __init__(self, use_llm=False, llm_provider='openai', **options):
+        self.use_llm = use_llm
+        self.options = options
+        self.warmed = []
+        self.text_extractor = _Component(self.warmed, 'text_extractor')
+        self.table_extractor = _Component(self.warmed, 'table_extractor')
+        self.claim_extractor = _Component(self.warmed, 'claim_extractor')
+        self.closed = False
+        self.built.append(self)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def stub_pipelines(monkeypatch):
+    monkeypatch.setattr(_StubPipeline, 'built', [])
+    monkeypatch.setattr(pipeline_pool, 'DocumentPipeline', _StubPipeline)
+
+
+def test_requests_lease_the_same_warmed_instance():
+    pool = PipelinePool(size=1, pipeline_options={'stage_concurrency': 2})
+    pool.warm_up()
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert first is second and len(_StubPipeline.built) == 1
+    assert first.options == {'stage_concurrency': 2}
+
+
+def test_instances_are_kept_per_llm_variant():
+    pool = PipelinePool(size=2)
+    with pool.lease(use_llm=False) as plain, pool.lease(use_llm=True) as llm:
+        assert (plain.use_llm, llm.use_llm) == (False, True)
+    assert sorted(pipeline.use_llm for pipeline in _StubPipeline.built) == [False, False, True, True]
+    with pool.lease(use_llm=True) as again:
+        assert again.use_llm
+    assert len(_StubPipeline.built) == 4
+
+
+def test_lease_waits_for_an_idle_instance():
+    pool = PipelinePool(size=1)
+    leased = []
+    with pool.lease() as pipeline:
+        thread = threading.Thread(target=lambda: leased.append(pool.lease().__enter__()))
+        thread.start()
+        thread.join(0.2)
+        assert leased == []
+    thread.join(5)
+    assert leased == [pipeline]
+
+
+def test_warm_up_warms_every_component_of_each_variant():
+    report = PipelinePool(size=1).warm_up([False, True])
+    assert set(report) == {'use_llm=False', 'use_llm=True'}
+    assert report['use_llm=True']['components'] == {
+        'text_extractor': 'ready', 'easyocr': 'unavailable', 'table_extractor': 'ready', 'claim_extractor': 'ready',
+    }
+    for pipeline in _StubPipeline.built:
+        assert pipeline.warmed == ['text_extractor', 'text_extractor.easyocr', 'table_extractor', 'claim_extractor']
+
+
+def test_close_closes_idle_instances():
+    pool = PipelinePool(size=2)
+    pool.warm_up()
+    pool.close()
+    assert [pipeline.closed for pipeline in _StubPipeline.built] == [True, True]
@@ -0,0 +1,32 @@
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+
+from pipeline.preprocessing import DocumentPreprocessor
+
+
+def _render(path, dpi):
+    doc = fitz.open(path)
+    pix = doc[0].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+    return np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.width).copy()
+
+
+@pytest.fixture
+def text_page(make_text_pdf):
+    return make_text_pdf([["Invoice no. 12345, total: 1.234,56 EUR; date 01/02/2024 - i.j,;:"] * 40])
+
+
+@pytest.mark.parametrize('dpi', [100, 150, 200, 300])
+def test_clean_render_is_not_denoised(text_page, dpi):
+    quality = DocumentPreprocessor().select_denoise_tier(_render(text_page, dpi))
+    assert quality['tier'] == 'none'
+    assert quality['speckle_ratio'] < DocumentPreprocessor.QUALITY_THRESHOLDS['speckle_ratio']
+
+
+@pytest.mark.parametrize('dpi', [150, 300])
+def test_salt_and_pepper_gets_median(text_page, dpi):
+    gray = _render(text_page, dpi)
+    noise = np.random.default_rng(0).random(gray.shape)
+    gray[noise < 0.0025] = 0
+    gray[noise > 0.9975] = 255
+    assert DocumentPreprocessor().select_denoise_tier(gray)['tier'] == 'median'
@@ -0,0 +1,56 @@
+import fitz  # PyMuPDF
+import numpy as np
+import pytest
+
+from pipeline.ocr import _page_raster
+from pipeline.profiles import estimate_glyph_height, get_profile, image_scale, render_zoom
+
+import cv2
+
+
+def test_unknown_profile_falls_back_to_default():
+    assert get_profile('turbo')['name'] == 'balanced'
+    assert get_profile(None)['name'] == 'balanced'
+    assert get_profile('fast')['target_dpi'] == 120
+
+
+def test_render_zoom_targets_dpi_within_pixel_cap():
+    a4 = (595, 842)
+    assert render_zoom(*a4, get_profile('balanced')) == pytest.approx(150 / 72)
+    # A3 at 300 dpi would be ~17 MP: capped at 12 MP
+    zoom = render_zoom(842, 1191, get_profile('accurate'))
+    assert 842 * 1191 * zoom * zoom == pytest.approx(12_000_000, rel=1e-6)
+
+
+def test_image_scale():
+    balanced = get_profile('balanced')
+    assert image_scale(2480, 3508, balanced, dpi=300) == pytest.approx(0.5)
+    assert image_scale(1240, 1754, balanced, dpi=150) == 1.0
+    assert image_scale(1240, 1754, balanced, dpi=140) == 1.0  # Within the deadband
+    assert image_scale(800, 600, balanced, glyph_height=8) == 1.5  # max_upscale
+    # 12 MP phone photo with unknown dpi: pixel cap
+    scale = image_scale(4000, 3000, balanced)
+    assert 4000 * 3000 * scale * scale == pytest.approx(5_000_000, rel=1e-6)
+
+
+def test_glyph_height_of_printed_text():
+    image = np.full((600, 800), 255, np.uint8)
+    for row in range(10):
+        cv2.putText(image, "INVOICE 12345 TOTAL", (20, 50 + row * 50), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    height = estimate_glyph_height(image)
+    assert 18 <= height <= 26
+    assert estimate_glyph_height(np.full((100, 100), 255, np.uint8)) is None
+
+
+def test_page_raster_follows_the_profile(make_scanned_pdf, make_text_pdf):
+    doc = fitz.open(make_text_pdf([["Fattura n. 12 del 01/02/2024"]]))
+    gray, dpi, source = _page_raster(doc, 0, get_profile('fast'))
+    assert (source, dpi) == ('render', 120)
+    assert gray.shape[1] == round(doc[0].rect.width * 120 / 72)
+
+    # 600 px wide image on a 450 pt page: embedded at 96 dpi
+    doc = fitz.open(make_scanned_pdf([1]))
+    gray, dpi, source = _page_raster(doc, 0, get_profile('fast'))
+    assert (source, dpi, gray.shape) == ('embedded_image', 96, (800, 600))  # Never upscaled
+    gray, dpi, source = _page_raster(doc, 0, get_profile('balanced'))
+    assert (source, dpi, gray.shape) == ('embedded_image', 144, (1200, 900))  # Upscale capped at 1.5x
@@ -0,0 +1,20 @@
+from pipeline.result_cache import ResultCache
+
+
+def test_key_normalizes_tasks():
+    assert ResultCache.make_key('d', ['claims', 'classify'], 'v1') == ResultCache.make_key('d', [' Classify', 'claims'], 'v1')
+
+
+def test_key_depends_on_version_and_options():
+    key = ResultCache.make_key('d', ['classify'], 'v1', pipeline_options={'performance_profile': 'fast'})
+    assert key != ResultCache.make_key('d', ['classify'], 'v1', pipeline_version='0.0.0', pipeline_options={'performance_profile': 'fast'})
+    assert key != ResultCache.make_key('d', ['classify'], 'v1', pipeline_options={'performance_profile': 'accurate'})
+    assert key != ResultCache.make_key('d', ['classify'], 'v1', pipeline_options={'performance_profile': 'fast', 'tesseract_lang': 'eng'})
+
+
+def test_disk_tier_is_shared(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    ResultCache(disk_path=path).set('k', {'text': 'a'})
+    other = ResultCache(disk_path=path)
+    assert other.get('k') == {'text': 'a'}
+    assert other.counters['disk_hits'] == 1
@@ -0,0 +1,102 @@
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+import pipeline.serialization as serialization
+from pipeline.family_classifier import DocumentFamily
+from pipeline.serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, dumps_json, encode
+
+RESULT = {
+    "document_family": "contract",
+    "document_subtype": "professional_services_agreement",
+    "holder": {"type": "relationship", "ref": "abc", "confidence": np.float64(0.8)},
+    "claim": {
+        "role": "contractor",
+        "amount": Decimal("5000.50"),
+        "currency": "EUR",
+        "subject": "Consulenza",
+        "entity": "Alfa S.r.l.",
+        "start_date": date(2026, 1, 1),
+        "end_date": None,
+        "secondary_amount": np.float32(5400.0),
+        "secondary_currency": "USD",
+    },
+    "compliance_score": np.float64(0.75),
+    "anomalies": ["amount_outlier"],
+}
+TASKS = ["classify", "claims", "holder", "compliance_score"]
+
+
+def _expected(data):
+    return api.AnalyzeResponse(**data).model_dump(mode="json")
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def json_encoder(request, monkeypatch):
+    if request.param and not serialization.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", request.param)
+
+
+def test_response_data_round_trips_through_json(json_encoder):
+    data = api._build_response_data(RESULT, TASKS)
+    assert json.loads(dumps_json(data)) == _expected(data)
+
+
+def test_enums_datetimes_and_numpy_values_encode_like_pydantic(json_encoder):
+    data = dict(
+        api._build_response_data(RESULT, TASKS),
+        family=DocumentFamily.CONTRACT,
+        analyzed_at=datetime(2026, 3, 4, 5, 6, 7),
+    )
+    assert json.loads(dumps_json(data)) == _expected(data)
+    assert json.loads(dumps_json({"scores": np.array([0.5, 1.0]), "pages": np.int64(3)})) == {
+        "scores": [0.5, 1.0], "pages": 3,
+    }
+
+
+def test_response_data_round_trips_through_msgpack():
+    msgpack = pytest.importorskip("msgpack")
+    data = dict(api._build_response_data(RESULT, TASKS), family=DocumentFamily.CONTRACT)
+    body, media_type = encode(data, "application/msgpack")
+    assert media_type == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(body, raw=False) == _expected(data)
+
+
+@pytest.mark.parametrize("accept", ["", "*/*", "text/html", "application/xml;q=0.9"])
+def test_unsupported_accept_falls_back_to_json(accept):
+    body, media_type = encode({"document_family": "contract"}, accept)
+    assert (media_type, json.loads(body)) == (JSON_MEDIA_TYPE, {"document_family": "contract"})
+
+
+def test_msgpack_request_falls_back_to_json_without_msgpack(monkeypatch):
+    monkeypatch.setattr(serialization, "MSGPACK_AVAILABLE", False)
+    assert encode({}, "application/msgpack")[1] == JSON_MEDIA_TYPE
+
+
+def test_analyze_answers_json_to_unsupported_accept(monkeypatch):
+    async def fake_run(file_path, **kwargs):
+        return dict(RESULT, errors=[], metadata={})
+
+    monkeypatch.setattr(api.executor, "run", fake_run)
+    monkeypatch.setattr(api, "result_cache", None)
+    content = b"%PDF serialization"
+    response = TestClient(api.app).post(
+        "/analyze",
+        data={
+            "document_id": "doc",
+            "hash": "sha256:" + hashlib.sha256(content).hexdigest(),
+            "requested_tasks": ",".join(TASKS),
+        },
+        files={"file": ("doc.pdf", content)},
+        headers={"Accept": "application/xml"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == JSON_MEDIA_TYPE
+    assert response.json() == _expected(api._build_response_data(RESULT, TASKS))
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import fitz  # PyMuPDF
+import pytest
+
+from pipeline.family_classifier import DocumentFamily
+from pipeline.metrics import StageTimer
+from pipeline.orchestrator import DocumentPipeline, StageFailed
+from pipeline.policy_resolver import PolicyResolver
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = DocumentPipeline(stage_concurrency=4)
+    yield pipeline
+    pipeline.close()
+
+
+def _failing_text(outputs):
+    time.sleep(0.05)
+    raise StageFailed("Failed to extract text or text too short")
+
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_failed_stage_skips_dependents(pipeline, concurrency):
+    pipeline.stage_concurrency = concurrency
+    ran = []
+    stages = {
+        'text_extraction': _failing_text,
+        'layout_analysis': lambda outputs: ran.append('layout_analysis'),
+    }
+    with pytest.raises(StageFailed):
+        pipeline._run_stage_graph(stages, StageTimer())
+    assert ran == []
+
+
+def test_failed_stage_does_not_wait_for_running_stages(pipeline):
+    release = threading.Event()
+    stages = {
+        'text_extraction': _failing_text,
+        'vision_analysis': lambda outputs: release.wait(10),
+    }
+    started = time.perf_counter()
+    with pytest.raises(StageFailed):
+        pipeline._run_stage_graph(stages, StageTimer())
+    assert time.perf_counter() - started < 5
+    release.set()
+
+
+def test_blank_document_stops_after_text_extraction(pipeline, tmp_path):
+    path = tmp_path / 'blank.pdf'
+    doc = fitz.open()
+    doc.new_page()
+    doc.save(path)
+    result = pipeline.process(str(path), requested_tasks=['classify', 'layout', 'vision'])
+    assert result['errors'] == ["Failed to extract text or text too short"]
+    assert 'layout_analysis' not in result['metadata']
+    assert 'vision_analysis' not in result['metadata']
+
+
+def test_close_shuts_down_stage_pool(pipeline):
+    pipeline._run_stage_graph(
+        {'text_extraction': lambda outputs: 'text', 'vision_analysis': lambda outputs: {}},
+        StageTimer()
+    )
+    executor = pipeline._stage_executor
+    assert executor is not None
+    pipeline.close()
+    assert pipeline._stage_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+def test_classify_plans_only_text_and_family():
+    assert DocumentPipeline.plan_stages(['classify']) == ['text_extraction', 'family_classification']
+
+
+def test_classify_only_request_skips_downstream_components(pipeline, make_text_pdf, monkeypatch):
+    path = make_text_pdf([[
+        "REPUBBLICA ITALIANA", "CARTA D'IDENTITA", "Cognome: ROSSI", "Nome: MARIO",
+        "Nato il 01/01/1980 a ROMA", "Cittadinanza: ITALIANA", "Scadenza 01/01/2030",
+    ]])
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("stage outside the classify plan ran")
+
+    monkeypatch.setattr(pipeline.claim_evaluator, 'evaluate', unexpected)
+    monkeypatch.setattr(pipeline.policy_resolver, 'resolve', unexpected)
+    monkeypatch.setattr(pipeline.role_inference, 'infer', unexpected)
+    monkeypatch.setattr(pipeline.claim_extractor, 'extract', unexpected)
+    monkeypatch.setattr(pipeline.extractor, 'extract', unexpected)
+    result = pipeline.process(path, requested_tasks=['classify'])
+    assert result['success'] and result['errors'] == []
+    assert result['document_family'] not in (None, 'unknown')
+    assert 'claim' not in result and 'inferred_role' not in result
+
+
+def test_contracts_get_table_extraction():
+    assert PolicyResolver().stage_plan(DocumentFamily.CONTRACT)['structure_stages'] == ['table_extraction']
+    families = DocumentPipeline.describe_plan(['claims'])['families']
+    assert 'table_extraction' in families['contract']['stages']
+    assert 'table_extraction' not in families['identity']['stages']
+
+
+def test_nda_subtype_overrides_contract_structure_stages():
+    plan = PolicyResolver().stage_plan(DocumentFamily.CONTRACT, 'nda')
+    assert (plan['structure_stages'], plan['source']) == ([], 'subtype')
+    assert 'table_extraction' not in DocumentPipeline.describe_plan(['claims'])['subtype_overrides']['nda']['stages']
+
+
+@pytest.mark.parametrize('task, stage', [('tables', 'table_extraction'), ('structure', 'document_structure')])
+def test_explicit_task_overrides_policy_gate(task, stage):
+    plan = DocumentPipeline.describe_plan(['claims', task])
+    assert stage in plan['subtype_overrides']['nda']['stages']
+    assert all(stage in family['stages'] for family in plan['families'].values())
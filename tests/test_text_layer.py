@@ -0,0 +1,67 @@
+import fitz  # PyMuPDF
+import pytest
+
+import pipeline.ocr as ocr
+from pipeline.ocr import TextExtractor, _degraded_text
+
+
+def _block(y, text, x=72):
+    return (x, y, x + 300, y + 12, text, 0, 0)
+
+
+def test_clean_blocks_are_not_degraded():
+    blocks = [_block(72 + 20 * i, f"Articolo {i} del contratto") for i in range(6)]
+    assert _degraded_text(blocks, '\n'.join(b[4] for b in blocks)) is None
+
+
+@pytest.mark.parametrize('blocks, reason', [
+    ([_block(72, '   ')], 'empty'),
+    ([_block(72, 'Fattura ��� n. 12')], 'unmapped_glyphs'),
+    ([_block(72 + 12 * i, 'F') for i in range(30)], 'fragmented'),
+    ([_block(600 - 40 * i, f"Articolo {i} del contratto") for i in range(6)], 'reading_order'),
+])
+def test_degraded_text(blocks, reason):
+    assert _degraded_text(blocks, '\n'.join(b[4] for b in blocks)) == reason
+
+
+def test_columns_side_by_side_are_in_order():
+    # Left column then right column: jumping back up into another column is normal
+    blocks = [_block(72 + 20 * i, "left") for i in range(4)] + [_block(72 + 20 * i, "right", x=400) for i in range(4)]
+    assert _degraded_text(blocks, '\n'.join(b[4] for b in blocks)) is None
+
+
+def test_out_of_order_page_is_read_by_pdfplumber(tmp_path):
+    doc = fitz.open()
+    page = doc.new_page()
+    for i in range(6):  # Drawn bottom-up
+        page.insert_text((72, 600 - 60 * i), f"Articolo {5 - i} del contratto di fornitura", fontsize=11)
+    path = tmp_path / 'scrambled.pdf'
+    doc.save(path)
+    stats, models = {'fallbacks': []}, {}
+    texts = TextExtractor()._text_layer_pages(str(path), None, stats, models)
+    assert stats['fallbacks'] == ['pymupdf->pdfplumber'] and stats['pdfplumber_pages'] == 1
+    assert texts[0].index('Articolo 0') < texts[0].index('Articolo 5')
+    # The page model comes from the same pdfplumber read, so it agrees with the text
+    lines = [line['text'] for line in models[0].lines()]
+    assert len(lines) == 6 and lines[0].startswith('Articolo 0') and lines[-1].startswith('Articolo 5')
+
+
+@pytest.fixture
+def page_pool():
+    yield
+    if ocr._page_pool is not None:
+        ocr._page_pool.shutdown(wait=True)
+        ocr._page_pool = None
+
+
+def test_long_pdf_is_read_in_parallel_ranges(make_text_pdf, page_pool):
+    path = make_text_pdf([[f"Pagina {n} del contratto di fornitura"] for n in range(ocr.TEXT_LAYER_RANGE_PAGES + 8)])
+    sequential, parallel = {'fallbacks': []}, {'fallbacks': []}
+    sequential_models, parallel_models = {}, {}
+    expected = TextExtractor(page_workers=1)._text_layer_pages(path, None, sequential, sequential_models)
+    texts = TextExtractor(page_workers=2)._text_layer_pages(path, None, parallel, parallel_models)
+    assert (sequential['text_layer_workers'], parallel['text_layer_workers']) == (1, 2)
+    assert texts == expected
+    assert sorted(parallel_models) == sorted(texts)
+    assert [model.words for model in parallel_models.values()] == [model.words for model in sequential_models.values()]
+    assert texts[ocr.TEXT_LAYER_RANGE_PAGES + 7].strip() == f"Pagina {ocr.TEXT_LAYER_RANGE_PAGES + 7} del contratto di fornitura"